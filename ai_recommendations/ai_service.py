@@ -1,110 +1,451 @@
-import random
-from datetime import datetime, timedelta
-from typing import Dict, List
-from gardens.models import Plant, Garden
-from django.contrib.auth import get_user_model
-
-User = get_user_model()
-
-class AIRecommendationService:
-    """
-    Servicio simulado de IA para generar recomendaciones
-    En producción se conectaría a modelos ML reales
-    """
-    
-    def __init__(self):
-        self.confidence_threshold = 0.7
-    
-    def generate_plant_recommendations(self, user: User, garden: Garden) -> List[Dict]:
-        """
-        Genera recomendaciones de plantas basado en perfil de usuario y jardín
-        """
-        recommendations = []
-        
-        # Filtrar plantas por experiencia del usuario
-        difficulty_map = {
-            'beginner': ['easy'],
-            'intermediate': ['easy', 'medium'],
-            'advanced': ['easy', 'medium', 'hard']
-        }
-        
-        suitable_difficulties = difficulty_map.get(user.experience_level, ['easy'])
-        suitable_plants = Plant.objects.filter(difficulty__in=suitable_difficulties)
-        
-        # Filtrar por espacio disponible
-        if garden.size_m2:
-            suitable_plants = suitable_plants.filter(space_required__lte=garden.size_m2)
-        
-        # Generar recomendaciones con scores
-        for plant in suitable_plants[:5]:  # Top 5 recomendaciones
-            confidence = self._calculate_confidence(user, garden, plant)
-            
-            if confidence >= self.confidence_threshold:
-                recommendations.append({
-                    'plant_id': plant.id,
-                    'plant_name': plant.name,
-                    'confidence_score': round(confidence, 2),
-                    'reasons': self._generate_reasons(user, garden, plant),
-                    'estimated_harvest_date': self._calculate_harvest_date(plant),
-                })
-        
-        return sorted(recommendations, key=lambda x: x['confidence_score'], reverse=True)
-    
-    def _calculate_confidence(self, user: User, garden: Garden, plant: Plant) -> float:
-        """
-        Calcula score de confianza basado en múltiples factores
-        """
-        confidence = 0.5  # Base confidence
-        
-        # Factor experiencia
-        experience_boost = {
-            'beginner': 0.1,
-            'intermediate': 0.2,
-            'advanced': 0.3
-        }
-        confidence += experience_boost.get(user.experience_level, 0.1)
-        
-        # Factor dificultad de planta
-        if plant.difficulty == 'easy':
-            confidence += 0.2
-        elif plant.difficulty == 'medium':
-            confidence += 0.1
-        
-        # Factor espacio
-        if garden.size_m2 and plant.space_required <= garden.size_m2 * 0.5:
-            confidence += 0.15
-        
-        # Factor exposición solar
-        if garden.sun_exposure == 'full_sun':
-            confidence += 0.1
-        
-        # Añadir algo de randomness para simular ML
-        confidence += random.uniform(-0.1, 0.1)
-        
-        return min(confidence, 1.0)
-    
-    def _generate_reasons(self, user: User, garden: Garden, plant: Plant) -> List[str]:
-        """
-        Genera razones para la recomendación
-        """
-        reasons = []
-        
-        if plant.difficulty == 'easy' and user.experience_level == 'beginner':
-            reasons.append("Ideal para principiantes")
-        
-        if plant.space_required <= garden.size_m2:
-            reasons.append(f"Se adapta al espacio disponible ({garden.size_m2}m²)")
-        
-        if garden.has_irrigation and plant.water_frequency <= 3:
-            reasons.append("Compatible con tu sistema de riego")
-        
-        reasons.append(f"Cosecha en {plant.harvest_time_days} días")
-        
-        return reasons
-    
-    def _calculate_harvest_date(self, plant: Plant) -> str:
-        """
-        Calcula fecha estimada de cosecha
-        """
-        harvest_date = datetime.now() + timedelta(days=plant.harvest_time_days)
-        return harvest_date.strftime("%Y-%m-%d")
\ No newline at end of file
+from collections import namedtuple
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+from functools import cached_property
+from typing import Dict, List
+import numpy as np
+from gardens.models import Garden
+from django.contrib.auth import get_user_model
+from gardens.catalog import get_catalog_version
+from gardens.snapshot import DIFFICULTY_CODES, SEASON_CODES, PlantSnapshot, get_plant_snapshot
+from . import cache as recommendation_cache
+from .learning import EXPERIENCE_LEVELS, MAX_ADJUSTMENT, get_weights
+from .models import AIRecommendation
+
+User = get_user_model()
+
+# Fila individual del catálogo, con los mismos atributos que usa Plant
+PlantFeatures = namedtuple('PlantFeatures', [
+    'id', 'name', 'difficulty', 'space_required', 'water_frequency',
+    'planting_season', 'harvest_time_days',
+])
+
+
+class PlantFeatureMatrix:
+    """
+    Matriz de características del catálogo de plantas.
+    Cada columna es un arreglo NumPy para puntuar todo el catálogo en lote.
+    """
+
+    def __init__(self, ids, names, difficulty, space_required, water_frequency,
+                 planting_season, harvest_time_days):
+        # asarray no copia si el tipo ya coincide: las columnas del snapshot siguen mapeadas
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.names = names
+        self.difficulty = np.asarray(difficulty, dtype=np.int8)
+        self.space_required = np.asarray(space_required, dtype=np.float64)
+        self.water_frequency = np.asarray(water_frequency, dtype=np.int32)
+        self.planting_season = np.asarray(planting_season, dtype=np.int8)
+        self.harvest_time_days = np.asarray(harvest_time_days, dtype=np.int32)
+
+    @classmethod
+    def from_snapshot(cls, snapshot: PlantSnapshot):
+        """
+        Columnas tomadas directamente del snapshot mapeado en memoria
+        """
+        records = snapshot.records
+        return cls(
+            records['id'],
+            snapshot.names,
+            records['difficulty'],
+            records['space_required'],
+            records['water_frequency'],
+            records['planting_season'],
+            records['harvest_time_days'],
+        )
+
+    @classmethod
+    def from_queryset(cls, queryset=None):
+        """
+        Construye la matriz leyendo solo las columnas necesarias (sin description)
+        """
+        return cls.from_snapshot(PlantSnapshot.from_queryset(None, queryset))
+
+    def __len__(self):
+        return len(self.ids)
+
+    def row(self, index: int) -> PlantFeatures:
+        """
+        Devuelve una fila del catálogo con los códigos originales de Plant
+        """
+        return PlantFeatures(
+            id=int(self.ids[index]),
+            name=self.names[index],
+            difficulty=DIFFICULTY_CODES[self.difficulty[index]],
+            space_required=float(self.space_required[index]),
+            water_frequency=int(self.water_frequency[index]),
+            planting_season=SEASON_CODES[self.planting_season[index]],
+            harvest_time_days=int(self.harvest_time_days[index]),
+        )
+
+
+class PlantRecommendation(Mapping):
+    """
+    Resultado de una recomendación. Se comporta como un dict de solo lectura;
+    las razones y la fecha de cosecha se calculan recién al leerlas, es decir,
+    solo para lo que efectivamente se renderiza o serializa.
+    """
+
+    FIELDS = ('plant_id', 'plant_name', 'plant_difficulty', 'space_required',
+              'water_frequency', 'confidence_score')
+    EXPLANATION_FIELDS = ('reasons', 'estimated_harvest_date')
+    KEYS = FIELDS + EXPLANATION_FIELDS
+
+    def __init__(self, plant: PlantFeatures, confidence_score: float, experience_level: str = None,
+                 garden_size: float = None, has_irrigation: bool = False, reasons: List[str] = None):
+        self.plant = plant
+        self.confidence_score = confidence_score
+        # Solo los atributos del perfil que usan las razones (caben en la caché sin modelos)
+        self.experience_level = experience_level
+        self.garden_size = garden_size
+        self.has_irrigation = has_irrigation
+        if reasons is not None:
+            self.__dict__['reasons'] = reasons
+
+    @property
+    def plant_id(self) -> int:
+        return self.plant.id
+
+    @property
+    def plant_name(self) -> str:
+        return self.plant.name
+
+    @property
+    def plant_difficulty(self) -> str:
+        return self.plant.difficulty
+
+    @property
+    def space_required(self) -> float:
+        return self.plant.space_required
+
+    @property
+    def water_frequency(self) -> int:
+        return self.plant.water_frequency
+
+    @cached_property
+    def reasons(self) -> List[str]:
+        """
+        Genera razones para la recomendación
+        """
+        plant = self.plant
+        reasons = []
+
+        if plant.difficulty == 'easy' and self.experience_level == 'beginner':
+            reasons.append("Ideal para principiantes")
+
+        if self.garden_size is not None and plant.space_required <= self.garden_size:
+            reasons.append(f"Se adapta al espacio disponible ({self.garden_size}m²)")
+
+        if self.has_irrigation and plant.water_frequency <= 3:
+            reasons.append("Compatible con tu sistema de riego")
+
+        reasons.append(f"Cosecha en {plant.harvest_time_days} días")
+
+        return reasons
+
+    @property
+    def estimated_harvest_date(self) -> str:
+        """
+        Calcula fecha estimada de cosecha
+        """
+        harvest_date = datetime.now() + timedelta(days=self.plant.harvest_time_days)
+        return harvest_date.strftime("%Y-%m-%d")
+
+    def __getitem__(self, key):
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __repr__(self):
+        return f'<PlantRecommendation {self.plant_name} ({self.confidence_score})>'
+
+    def to_dict(self, explain: bool = True) -> Dict:
+        """
+        Dict serializable; con explain=False se omiten las explicaciones sin calcularlas
+        """
+        keys = self.KEYS if explain else self.FIELDS
+        return {key: getattr(self, key) for key in keys}
+
+
+_catalog_matrix = None
+_catalog_matrix_version = None
+
+
+def get_catalog_matrix(catalog_version: int = None) -> PlantFeatureMatrix:
+    """
+    Matriz del catálogo compartida por el proceso, reconstruida cuando cambia
+    la versión del catálogo
+    """
+    global _catalog_matrix, _catalog_matrix_version
+    if catalog_version is None:
+        catalog_version = get_catalog_version()
+    if _catalog_matrix is None or _catalog_matrix_version != catalog_version:
+        _catalog_matrix = PlantFeatureMatrix.from_snapshot(get_plant_snapshot(catalog_version))
+        _catalog_matrix_version = catalog_version
+    return _catalog_matrix
+
+
+def invalidate_catalog_matrix():
+    """
+    Descarta la matriz en memoria; se reconstruye en el siguiente uso
+    """
+    global _catalog_matrix, _catalog_matrix_version
+    _catalog_matrix = None
+    _catalog_matrix_version = None
+
+
+class AIRecommendationService:
+    """
+    Servicio simulado de IA para generar recomendaciones
+    En producción se conectaría a modelos ML reales
+    """
+
+    # Dificultad máxima permitida según experiencia (índice en DIFFICULTY_CODES)
+    MAX_DIFFICULTY = {
+        'beginner': 0,
+        'intermediate': 1,
+        'advanced': 2,
+    }
+
+    EXPERIENCE_BOOST = {
+        'beginner': 0.1,
+        'intermediate': 0.2,
+        'advanced': 0.3,
+    }
+
+    # Bonificación por dificultad de planta: easy, medium, hard
+    DIFFICULTY_BOOST = np.array([0.2, 0.1, 0.0])
+
+    def __init__(self):
+        self.confidence_threshold = 0.7
+
+    def generate_plant_recommendations(self, user: User, garden: Garden, limit: int = 5,
+                                       use_cache: bool = True) -> List[PlantRecommendation]:
+        """
+        Genera recomendaciones de plantas basado en perfil de usuario y jardín.
+        Puntúa todo el catálogo en una sola operación y devuelve el top `limit`.
+        """
+        return self.generate_batch_recommendations(user, [garden], limit, use_cache)[0]
+
+    def generate_batch_recommendations(self, user: User, gardens: List[Garden], limit: int = 5,
+                                       use_cache: bool = True,
+                                       catalog_version: int = None) -> List[List[PlantRecommendation]]:
+        """
+        Genera recomendaciones para varios jardines del mismo usuario.
+        El catálogo se carga una vez y los jardines sin caché se puntúan juntos.
+        Devuelve una lista de recomendaciones por jardín, en el mismo orden.
+        `catalog_version` fija la versión para una serie de llamadas (por
+        defecto se lee la actual).
+        """
+        if catalog_version is None:
+            catalog_version = self.catalog_version()
+        fingerprints = [recommendation_cache.profile_fingerprint(user, garden) for garden in gardens]
+        keys = [self.cache_key(fingerprint, catalog_version, limit) for fingerprint in fingerprints]
+
+        cached = recommendation_cache.get_many_results(keys) if use_cache else {}
+
+        # Jardines con atributos idénticos comparten clave: puntuar cada clave una sola vez
+        pending = {}
+        for index, key in enumerate(keys):
+            if key not in cached and key not in pending:
+                pending[key] = index
+
+        if pending:
+            indexes = list(pending.values())
+            ranked = self._rank(
+                user,
+                [gardens[i] for i in indexes],
+                [fingerprints[i] for i in indexes],
+                catalog_version,
+                limit,
+            )
+            for key, recommendations in zip(pending, ranked):
+                cached[key] = recommendations
+
+        if use_cache:
+            for key, garden in zip(keys, gardens):
+                recommendation_cache.store_results(key, cached[key], user, garden)
+
+        return [cached[key] for key in keys]
+
+    def catalog_version(self) -> int:
+        """
+        Versión del catálogo con la que se puntúa y se arma la clave de caché
+        """
+        return get_catalog_version()
+
+    def cache_key(self, fingerprint: str, catalog_version: int, limit: int) -> str:
+        """
+        Clave de caché: perfil + versión del catálogo + versión de los pesos aprendidos
+        """
+        model_version = f'{catalog_version}.{get_weights().version}'
+        return recommendation_cache.result_key(fingerprint, model_version, limit)
+
+    # Límite de celdas (jardines x plantas) puntuadas por operación, para acotar memoria
+    MAX_SCORE_CELLS = 2_000_000
+
+    def _rank(self, user: User, gardens: List[Garden], fingerprints: List[str],
+              catalog_version: int, limit: int) -> List[List[PlantRecommendation]]:
+        """
+        Puntúa el catálogo completo para cada jardín y arma el top `limit` de cada uno
+        """
+        features = get_catalog_matrix(catalog_version)
+        if not len(features) or limit <= 0:
+            return [[] for _ in gardens]
+
+        results = []
+        step = max(1, self.MAX_SCORE_CELLS // len(features))
+        for start in range(0, len(gardens), step):
+            chunk = gardens[start:start + step]
+            mask = self._filter_candidates(user, chunk, features)
+            confidence = self._calculate_confidence(
+                user, chunk, features, fingerprints[start:start + step]
+            )
+
+            # Descartar por umbral antes de ordenar
+            passing = mask & (confidence >= self.confidence_threshold)
+
+            for row, garden in enumerate(chunk):
+                candidates = np.flatnonzero(passing[row])
+                scores = confidence[row, candidates]
+
+                recommendations = [
+                    PlantRecommendation(
+                        features.row(candidates[position]),
+                        round(float(scores[position]), 2),
+                        user.experience_level,
+                        garden.size_m2,
+                        garden.has_irrigation,
+                    )
+                    for position in self._top_k(scores, limit)
+                ]
+                results.append(recommendations)
+
+        return results
+
+    def get_precomputed_recommendations(self, garden: Garden, limit: int = 5) -> List[PlantRecommendation]:
+        """
+        Recomendaciones precalculadas (comando precompute_recommendations) para un jardín
+        """
+        rows = (
+            AIRecommendation.objects
+            .filter(garden=garden, plant__isnull=False, status='pending')
+            .select_related('plant')
+            .order_by('-confidence_score', 'id')[:limit]
+        )
+        return [
+            PlantRecommendation(
+                PlantFeatures(*(getattr(row.plant, field) for field in PlantFeatures._fields)),
+                row.confidence_score,
+                reasons=row.description.splitlines(),
+            )
+            for row in rows
+        ]
+
+    def _garden_columns(self, gardens: List[Garden]):
+        """
+        Atributos de los jardines como columnas (G x 1) para combinarlos con el catálogo (1 x N)
+        """
+        sizes = np.array([garden.size_m2 or 0.0 for garden in gardens], dtype=np.float64)[:, None]
+        full_sun = np.array([garden.sun_exposure == 'full_sun' for garden in gardens])[:, None]
+        irrigation = np.array([bool(garden.has_irrigation) for garden in gardens])[:, None]
+        return sizes, full_sun, irrigation
+
+    def _filter_candidates(self, user: User, gardens: List[Garden], features: PlantFeatureMatrix) -> np.ndarray:
+        """
+        Máscara (jardines x plantas) de plantas aptas por experiencia y espacio disponible
+        """
+        max_difficulty = self.MAX_DIFFICULTY.get(user.experience_level, 0)
+        sizes, _, _ = self._garden_columns(gardens)
+
+        # Sin tamaño registrado no se filtra por espacio
+        fits = (sizes <= 0) | (features.space_required[None, :] <= sizes)
+        return (features.difficulty <= max_difficulty)[None, :] & fits
+
+    def _calculate_confidence(self, user: User, gardens: List[Garden], features: PlantFeatureMatrix,
+                              fingerprints: List[str]) -> np.ndarray:
+        """
+        Calcula el score de confianza de todo el catálogo para cada jardín (jardines x plantas)
+        en una operación vectorizada
+        """
+        sizes, full_sun, irrigation = self._garden_columns(gardens)
+
+        # Base + factor experiencia + factor dificultad de planta
+        base = 0.5 + self.EXPERIENCE_BOOST.get(user.experience_level, 0.1)
+        confidence = base + self.DIFFICULTY_BOOST[features.difficulty][None, :]
+
+        # Factor espacio
+        space_fit = (sizes > 0) & (features.space_required[None, :] <= sizes * 0.5)
+        confidence = confidence + 0.15 * space_fit
+
+        # Factor exposición solar
+        confidence = confidence + 0.1 * full_sun
+
+        # Ajuste aprendido del feedback de los usuarios (learning.FEATURE_NAMES)
+        confidence = confidence + self._feedback_adjustment(
+            user, features, space_fit, full_sun, irrigation
+        )
+
+        # Añadir algo de variación para simular ML, determinista según las entradas
+        confidence = confidence + np.vstack([
+            self._jitter(fingerprint, features.ids) for fingerprint in fingerprints
+        ])
+
+        return np.minimum(confidence, 1.0)
+
+    def _feedback_adjustment(self, user: User, features: PlantFeatureMatrix, space_fit: np.ndarray,
+                             full_sun: np.ndarray, irrigation: np.ndarray) -> np.ndarray:
+        """
+        Producto de los pesos aprendidos con las características de cada par jardín-planta,
+        sin materializar la matriz de características
+        """
+        w = get_weights().weights
+        if not w.any():
+            return np.zeros(space_fit.shape)
+
+        plant_terms = (
+            w[1 + features.difficulty.astype(np.intp)]
+            + w[7] * features.harvest_time_days / 365.0
+        )
+        adjustment = (
+            w[0]
+            + plant_terms[None, :]
+            + w[4] * space_fit
+            + w[5] * full_sun
+            + w[6] * (irrigation & (features.water_frequency <= 3)[None, :])
+        )
+        if user.experience_level in EXPERIENCE_LEVELS:
+            adjustment = adjustment + w[8 + EXPERIENCE_LEVELS.index(user.experience_level)]
+
+        return np.clip(adjustment, -MAX_ADJUSTMENT, MAX_ADJUSTMENT)
+
+    def _jitter(self, fingerprint: str, plant_ids: np.ndarray) -> np.ndarray:
+        """
+        Variación en [-0.1, 0.1) derivada de la huella del perfil y el id de cada planta.
+        Mismas entradas, mismo resultado: la caché y el cálculo en frío coinciden.
+        """
+        seed = np.uint64(int(fingerprint[:16], 16))
+        with np.errstate(over='ignore'):
+            # splitmix64 sobre (seed + plant_id)
+            x = plant_ids.astype(np.uint64) + seed
+            x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            x = x ^ (x >> np.uint64(31))
+        unit = (x >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+        return unit * 0.2 - 0.1
+
+    def _top_k(self, confidence: np.ndarray, limit: int) -> np.ndarray:
+        """
+        Posiciones de los `limit` scores más altos, ordenadas de mayor a menor
+        """
+        if limit < len(confidence):
+            top = np.argpartition(-confidence, limit - 1)[:limit]
+        else:
+            top = np.arange(len(confidence))
+        return top[np.argsort(-confidence[top], kind='stable')]
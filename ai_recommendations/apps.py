@@ -1,6 +1,13 @@
-from django.apps import AppConfig
-
-
-class AiRecommendationsConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'ai_recommendations'
+from django.apps import AppConfig
+
+
+class AiRecommendationsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'ai_recommendations'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .learning import get_weights
+
+        # Cargar el snapshot de pesos al iniciar cada worker
+        get_weights()
@@ -0,0 +1,303 @@
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+import numpy as np
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test.utils import override_settings
+from gardens import snapshot as plant_snapshot
+from gardens.models import Garden
+from .ai_service import AIRecommendationService, invalidate_catalog_matrix
+from .learning import EXPERIENCE_LEVELS, FEATURE_NAMES, FeedbackWeights, reset_loaded_weights
+
+User = get_user_model()
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+
+SOIL_CODES = [code for code, _ in Garden.SOIL_TYPES]
+EXPOSURE_CODES = [code for code, _ in Garden.EXPOSURE_TYPES]
+
+# Cachés aisladas: el benchmark no toca los resultados reales
+BENCHMARK_CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'benchmark-default',
+    },
+    'recommendations': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'benchmark-recommendations',
+        'TIMEOUT': 3600,
+        'OPTIONS': {
+            'MAX_ENTRIES': 100_000,
+        },
+    },
+}
+
+
+def synthetic_snapshot(version: int, size: int, rng: np.random.Generator) -> plant_snapshot.PlantSnapshot:
+    """
+    Catálogo sintético de `size` plantas con distribuciones parecidas al catálogo real
+    """
+    records = np.zeros(size, dtype=plant_snapshot.RECORD_DTYPE)
+    records['id'] = np.arange(1, size + 1)
+    records['difficulty'] = rng.choice(len(plant_snapshot.DIFFICULTY_CODES), size, p=[0.5, 0.35, 0.15])
+    records['space_required'] = np.round(rng.lognormal(mean=-0.5, sigma=0.8, size=size), 2)
+    records['water_frequency'] = rng.integers(1, 8, size)
+    records['planting_season'] = rng.integers(0, len(plant_snapshot.SEASON_CODES), size)
+    records['harvest_time_days'] = rng.integers(30, 366, size)
+
+    names = [f'Planta {i}'.encode('utf-8') for i in range(1, size + 1)]
+    offsets = np.zeros(size + 1, dtype='<i8')
+    offsets[1:] = np.cumsum([len(name) for name in names])
+    blob = np.frombuffer(b''.join(names), dtype=np.uint8)
+    return plant_snapshot.PlantSnapshot(version, records, offsets, blob)
+
+
+def synthetic_users(count: int, gardens_per_user: int, rng: np.random.Generator):
+    """
+    Usuarios y jardines en memoria (sin guardar): el servicio solo lee sus atributos
+    """
+    population = []
+    for i in range(count):
+        user = User(username=f'bench{i}', experience_level=EXPERIENCE_LEVELS[i % len(EXPERIENCE_LEVELS)])
+        gardens = [
+            Garden(
+                owner=user,
+                name=f'Jardín {i}-{j}',
+                location='Santiago',
+                size_m2=float(np.round(rng.uniform(0.5, 50.0), 1)),
+                soil_type=SOIL_CODES[rng.integers(len(SOIL_CODES))],
+                sun_exposure=EXPOSURE_CODES[rng.integers(len(EXPOSURE_CODES))],
+                has_irrigation=bool(rng.integers(2)),
+            )
+            for j in range(gardens_per_user)
+        ]
+        population.append((user, gardens))
+    return population
+
+
+def summarize(scenario: str, catalog_size: int, latencies, items: int, elapsed: float,
+              peak_memory: int) -> dict:
+    latencies_ms = np.asarray(latencies) * 1000
+    return {
+        'scenario': scenario,
+        'catalog_size': catalog_size,
+        'calls': len(latencies_ms),
+        'items': items,
+        'p50_ms': round(float(np.percentile(latencies_ms, 50)), 3),
+        'p99_ms': round(float(np.percentile(latencies_ms, 99)), 3),
+        'mean_ms': round(float(latencies_ms.mean()), 3),
+        'throughput_per_s': round(items / elapsed, 2) if elapsed else None,
+        'peak_memory_bytes': peak_memory,
+    }
+
+
+def measure_peak_memory(operation) -> int:
+    """
+    Pico de memoria asignada (incluye NumPy) durante una ejecución de `operation`.
+    Se mide aparte para no cargar el costo de tracemalloc en las latencias.
+    """
+    tracemalloc.start()
+    try:
+        operation()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+class SyntheticCatalogService(AIRecommendationService):
+    """
+    Servicio fijado a la versión del catálogo sintético, sin tocar la versión
+    real guardada en la BD
+    """
+
+    def __init__(self, version: int):
+        super().__init__()
+        self.version = version
+
+    def catalog_version(self) -> int:
+        return self.version
+
+
+class RecommendationBenchmark:
+    """
+    Mide latencia (p50/p99), throughput y pico de memoria del recomendador
+    sobre catálogos sintéticos de distintos tamaños
+    """
+
+    def __init__(self, sizes=DEFAULT_SIZES, iterations: int = 50, users: int = 100,
+                 gardens_per_user: int = 5, limit: int = 5, explain: bool = True,
+                 seed: int = 42, progress=None):
+        self.sizes = sizes
+        self.iterations = iterations
+        self.users = users
+        self.gardens_per_user = gardens_per_user
+        self.limit = limit
+        self.explain = explain
+        self.seed = seed
+        self.progress = progress or (lambda message: None)
+
+    def run(self) -> dict:
+        results = []
+        with tempfile.TemporaryDirectory() as directory:
+            overrides = override_settings(
+                CACHES=BENCHMARK_CACHES,
+                PLANT_SNAPSHOT_DIR=directory,
+                AI_WEIGHTS_PATH=os.path.join(directory, 'weights.bin'),
+            )
+            with overrides:
+                rng = np.random.default_rng(self.seed)
+                # Pesos aprendidos no nulos, para ejercitar también el ajuste por feedback
+                FeedbackWeights(rng.normal(0, 0.02, len(FEATURE_NAMES)), updates=1).save(
+                    settings.AI_WEIGHTS_PATH
+                )
+                reset_loaded_weights()
+                try:
+                    for size in self.sizes:
+                        results.extend(self.run_size(size, directory))
+                finally:
+                    invalidate_catalog_matrix()
+                    plant_snapshot.release_plant_snapshot()
+                    reset_loaded_weights()
+
+        return {'meta': self.metadata(), 'results': results}
+
+    def run_size(self, size: int, directory: str) -> list:
+        rng = np.random.default_rng(self.seed + size)
+        version = time.time_ns()
+        snapshot = synthetic_snapshot(version, size, rng)
+        snapshot.save(directory)
+        invalidate_catalog_matrix()
+
+        service = SyntheticCatalogService(version)
+        population = synthetic_users(self.users, self.gardens_per_user, rng)
+        gardens = [(user, garden) for user, user_gardens in population for garden in user_gardens]
+
+        # Calentamiento: abre el snapshot y arma la matriz antes de medir
+        service.generate_plant_recommendations(*gardens[0], limit=self.limit, use_cache=False)
+
+        self.progress(f'{size} plantas')
+        return [
+            self.single(service, size, gardens),
+            self.single_cached(service, size, gardens),
+            self.batch(service, size, population),
+            self.bulk(service, size, population),
+        ]
+
+    def serialize(self, recommendations):
+        return [recommendation.to_dict(self.explain) for recommendation in recommendations]
+
+    def single(self, service, size, gardens) -> dict:
+        """
+        Un jardín por llamada, sin caché
+        """
+        calls = [gardens[i % len(gardens)] for i in range(self.iterations)]
+        latencies = []
+        started = time.perf_counter()
+        for user, garden in calls:
+            start = time.perf_counter()
+            self.serialize(service.generate_plant_recommendations(user, garden, self.limit, use_cache=False))
+            latencies.append(time.perf_counter() - start)
+        elapsed = time.perf_counter() - started
+
+        peak = measure_peak_memory(lambda: self.serialize(
+            service.generate_plant_recommendations(*calls[0], self.limit, use_cache=False)
+        ))
+        return summarize('single', size, latencies, len(calls), elapsed, peak)
+
+    def single_cached(self, service, size, gardens) -> dict:
+        """
+        Un jardín por llamada, con la caché ya poblada
+        """
+        calls = [gardens[i % len(gardens)] for i in range(self.iterations)]
+        for user, garden in calls:
+            service.generate_plant_recommendations(user, garden, self.limit)
+
+        latencies = []
+        started = time.perf_counter()
+        for user, garden in calls:
+            start = time.perf_counter()
+            self.serialize(service.generate_plant_recommendations(user, garden, self.limit))
+            latencies.append(time.perf_counter() - start)
+        elapsed = time.perf_counter() - started
+
+        peak = measure_peak_memory(lambda: self.serialize(
+            service.generate_plant_recommendations(*calls[0], self.limit)
+        ))
+        return summarize('single_cached', size, latencies, len(calls), elapsed, peak)
+
+    def batch(self, service, size, population) -> dict:
+        """
+        Todos los jardines de un usuario por llamada, sin caché
+        """
+        calls = [population[i % len(population)] for i in range(self.iterations)]
+        latencies = []
+        items = 0
+        started = time.perf_counter()
+        for user, gardens in calls:
+            start = time.perf_counter()
+            for recommendations in service.generate_batch_recommendations(user, gardens, self.limit, use_cache=False):
+                self.serialize(recommendations)
+            latencies.append(time.perf_counter() - start)
+            items += len(gardens)
+        elapsed = time.perf_counter() - started
+
+        peak = measure_peak_memory(lambda: service.generate_batch_recommendations(
+            *calls[0], self.limit, use_cache=False
+        ))
+        return summarize('batch', size, latencies, items, elapsed, peak)
+
+    def bulk(self, service, size, population) -> dict:
+        """
+        Toda la población, usuario por usuario, como precompute_recommendations con un proceso
+        """
+        def run_all(latencies):
+            items = 0
+            for user, gardens in population:
+                start = time.perf_counter()
+                for recommendations in service.generate_batch_recommendations(user, gardens, self.limit, use_cache=False):
+                    self.serialize(recommendations)
+                latencies.append(time.perf_counter() - start)
+                items += len(gardens)
+            return items
+
+        latencies = []
+        started = time.perf_counter()
+        items = run_all(latencies)
+        elapsed = time.perf_counter() - started
+
+        peak = measure_peak_memory(lambda: run_all([]))
+        return summarize('bulk', size, latencies, items, elapsed, peak)
+
+    def metadata(self) -> dict:
+        return {
+            'commit': git_commit(),
+            'generated_at': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'iterations': self.iterations,
+            'users': self.users,
+            'gardens_per_user': self.gardens_per_user,
+            'limit': self.limit,
+            'explain': self.explain,
+            'seed': self.seed,
+        }
+
+
+def git_commit():
+    """
+    Commit actual, para comparar resultados entre versiones (None fuera de un repositorio)
+    """
+    try:
+        output = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
@@ -0,0 +1,76 @@
+import hashlib
+from django.core.cache import caches
+
+# Alias en settings.CACHES: LocMemCache con TIMEOUT (TTL) y MAX_ENTRIES (LRU)
+CACHE_ALIAS = 'recommendations'
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def profile_fingerprint(user, garden) -> str:
+    """
+    Huella de los atributos de usuario y jardín que determinan el resultado.
+    Jardines con los mismos atributos comparten entradas de caché.
+    """
+    parts = (
+        user.experience_level,
+        garden.size_m2,
+        garden.soil_type,
+        garden.sun_exposure,
+        garden.has_irrigation,
+    )
+    return hashlib.sha1(repr(parts).encode()).hexdigest()
+
+
+def result_key(fingerprint: str, catalog_version: int, limit: int) -> str:
+    return f'rec:{fingerprint}:{catalog_version}:{limit}'
+
+
+def _garden_pointer(garden_id) -> str:
+    return f'rec:garden:{garden_id}'
+
+
+def _user_pointer(user_id) -> str:
+    return f'rec:user:{user_id}'
+
+
+def get_many_results(keys) -> dict:
+    return get_cache().get_many(keys)
+
+
+def store_results(key, results, user, garden):
+    """
+    Guarda el resultado y recuerda qué entrada usa cada jardín y usuario,
+    para poder invalidar solo esas claves
+    """
+    cache = get_cache()
+    cache.set(key, results)
+
+    if garden.pk is not None:
+        cache.set(_garden_pointer(garden.pk), key)
+
+    if user.pk is not None:
+        user_keys = cache.get(_user_pointer(user.pk)) or []
+        if key not in user_keys:
+            cache.set(_user_pointer(user.pk), user_keys[-19:] + [key])
+
+
+def invalidate_garden(garden_id):
+    """
+    Elimina la entrada que usaba el jardín
+    """
+    cache = get_cache()
+    pointer = _garden_pointer(garden_id)
+    key = cache.get(pointer)
+    cache.delete_many([k for k in (key, pointer) if k])
+
+
+def invalidate_user(user_id):
+    """
+    Elimina las entradas usadas por los jardines del usuario
+    """
+    cache = get_cache()
+    pointer = _user_pointer(user_id)
+    cache.delete_many((cache.get(pointer) or []) + [pointer])
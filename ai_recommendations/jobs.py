@@ -0,0 +1,82 @@
+import logging
+import uuid
+from datetime import timedelta
+from django.utils import timezone
+from .ai_service import AIRecommendationService
+from .models import RecommendationJob
+
+logger = logging.getLogger(__name__)
+
+
+def enqueue_job(user, garden) -> RecommendationJob:
+    """
+    Encola un trabajo para el jardín; si ya hay uno pendiente se reutiliza
+    """
+    job = (
+        RecommendationJob.objects
+        .filter(user=user, garden=garden, status__in=['queued', 'running'])
+        .order_by('-created_at')
+        .first()
+    )
+    if job is None:
+        job = RecommendationJob.objects.create(user=user, garden=garden)
+    return job
+
+
+def claim_jobs(batch_size: int) -> list:
+    """
+    Reserva hasta `batch_size` trabajos en cola para este worker.
+    El UPDATE condicionado a status='queued' evita que dos workers tomen el mismo
+    trabajo sin depender de SELECT ... FOR UPDATE (no disponible en SQLite).
+    """
+    ids = list(
+        RecommendationJob.objects
+        .filter(status='queued')
+        .order_by('created_at', 'id')
+        .values_list('id', flat=True)[:batch_size]
+    )
+    if not ids:
+        return []
+
+    token = uuid.uuid4().hex
+    RecommendationJob.objects.filter(id__in=ids, status='queued').update(
+        status='running', worker_token=token, started_at=timezone.now()
+    )
+    return list(
+        RecommendationJob.objects
+        .filter(worker_token=token, status='running')
+        .select_related('user', 'garden')
+        .order_by('created_at', 'id')
+    )
+
+
+def run_jobs(jobs, service: AIRecommendationService = None) -> int:
+    """
+    Ejecuta los trabajos reservados y guarda su resultado
+    """
+    service = service or AIRecommendationService()
+    completed = 0
+
+    for job in jobs:
+        try:
+            recommendations = service.generate_plant_recommendations(job.user, job.garden)
+            job.result = [recommendation.to_dict() for recommendation in recommendations]
+            job.status = 'done'
+            completed += 1
+        except Exception as e:
+            logger.error(f"Error en trabajo de recomendaciones {job.id}: {str(e)}")
+            job.error = str(e)
+            job.status = 'failed'
+        job.finished_at = timezone.now()
+
+    RecommendationJob.objects.bulk_update(jobs, ['result', 'status', 'error', 'finished_at'])
+    return completed
+
+
+def requeue_stale_jobs(older_than: timedelta) -> int:
+    """
+    Devuelve a la cola los trabajos de workers que murieron a mitad de ejecución
+    """
+    return RecommendationJob.objects.filter(
+        status='running', started_at__lt=timezone.now() - older_than
+    ).update(status='queued', worker_token='', started_at=None)
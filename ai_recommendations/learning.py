@@ -0,0 +1,212 @@
+import logging
+import os
+import struct
+import time
+import numpy as np
+from django.conf import settings
+from .models import UserFeedback
+
+logger = logging.getLogger(__name__)
+
+# Orden de los pesos en el archivo binario y en el ajuste del score
+FEATURE_NAMES = (
+    'bias',
+    'difficulty_easy',
+    'difficulty_medium',
+    'difficulty_hard',
+    'space_fit',
+    'full_sun',
+    'irrigation_match',
+    'harvest_years',
+    'experience_beginner',
+    'experience_intermediate',
+    'experience_advanced',
+)
+EXPERIENCE_LEVELS = ('beginner', 'intermediate', 'advanced')
+DIFFICULTY_LEVELS = ('easy', 'medium', 'hard')
+
+# Ajuste máximo (en valor absoluto) que el aprendizaje puede sumar al score
+MAX_ADJUSTMENT = 0.15
+
+# magic, versión de formato, n° de pesos, high-water-mark (id), n° de actualizaciones
+_HEADER = struct.Struct('<4sHHqQ')
+_MAGIC = b'HTWL'
+_FORMAT_VERSION = 2
+# La versión 1 guardaba además created_at del último feedback (µs) antes del id
+_HEADER_V1 = struct.Struct('<4sHHqqQ')
+
+
+class FeedbackWeights:
+    """
+    Pesos por característica aprendidos de UserFeedback, con su high-water-mark
+    """
+
+    def __init__(self, weights=None, hwm_id=0, updates=0):
+        if weights is None:
+            weights = np.zeros(len(FEATURE_NAMES))
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.hwm_id = hwm_id
+        self.updates = updates
+
+    @property
+    def version(self) -> int:
+        return self.updates
+
+    def advance(self, feedback_id):
+        self.hwm_id = max(self.hwm_id, feedback_id)
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(
+            _MAGIC, _FORMAT_VERSION, len(self.weights), self.hwm_id, self.updates
+        )
+        return header + self.weights.astype('<f8').tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes):
+        magic, version, count = struct.unpack_from('<4sHH', data)
+        if version == 1:
+            # Se conserva el id del último feedback incorporado como cursor
+            header = _HEADER_V1
+            _, _, _, _, hwm_id, updates = header.unpack_from(data)
+        else:
+            header = _HEADER
+            _, _, _, hwm_id, updates = header.unpack_from(data)
+        if magic != _MAGIC or version not in (1, _FORMAT_VERSION) or count != len(FEATURE_NAMES):
+            raise ValueError('Formato de pesos no reconocido')
+        weights = np.frombuffer(data, dtype='<f8', count=count, offset=header.size)
+        return cls(weights.copy(), hwm_id, updates)
+
+    def save(self, path):
+        """
+        Escribe el snapshot de forma atómica (archivo temporal + rename)
+        """
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(self.to_bytes())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path, 'rb') as f:
+                return cls.from_bytes(f.read())
+        except FileNotFoundError:
+            return cls()
+
+
+def feature_vector(experience_level, garden, plant) -> np.ndarray:
+    """
+    Características de un par jardín-planta, en el orden de FEATURE_NAMES
+    """
+    x = np.zeros(len(FEATURE_NAMES))
+    x[0] = 1.0
+    if plant.difficulty in DIFFICULTY_LEVELS:
+        x[1 + DIFFICULTY_LEVELS.index(plant.difficulty)] = 1.0
+    x[4] = float(bool(garden.size_m2) and plant.space_required <= garden.size_m2 * 0.5)
+    x[5] = float(garden.sun_exposure == 'full_sun')
+    x[6] = float(garden.has_irrigation and plant.water_frequency <= 3)
+    x[7] = plant.harvest_time_days / 365.0
+    if experience_level in EXPERIENCE_LEVELS:
+        x[8 + EXPERIENCE_LEVELS.index(experience_level)] = 1.0
+    return x
+
+
+def rating_target(rating: int) -> float:
+    """
+    Lleva la calificación 1-5 al rango de ajuste [-MAX_ADJUSTMENT, MAX_ADJUSTMENT]
+    """
+    return (rating - 3) / 2 * MAX_ADJUSTMENT
+
+
+class OnlineLearner:
+    """
+    Descenso de gradiente estocástico sobre el error cuadrático del ajuste.
+    Cada calificación cuesta O(n° de características): nunca se reentrena desde cero.
+    """
+
+    def __init__(self, learning_rate: float = 0.05):
+        self.learning_rate = learning_rate
+
+    def update(self, state: FeedbackWeights, feedback_rows) -> int:
+        processed = 0
+        for feedback in feedback_rows:
+            recommendation = feedback.recommendation
+            if recommendation.garden_id and recommendation.plant_id:
+                x = feature_vector(
+                    feedback.user.experience_level, recommendation.garden, recommendation.plant
+                )
+                error = rating_target(feedback.rating) - float(x @ state.weights)
+                state.weights += self.learning_rate * error * x
+                state.updates += 1
+            state.advance(feedback.id)
+            processed += 1
+        return processed
+
+
+def new_feedback(state: FeedbackWeights):
+    """
+    Feedback posterior al high-water-mark, en orden de llegada. El cursor es solo
+    el id: created_at se fija antes del INSERT, así que una fila que confirma
+    tarde puede quedar con una fecha anterior a otra ya procesada; el id
+    autoincremental lo asigna SQLite al escribir, con las escrituras en serie.
+    """
+    return (
+        UserFeedback.objects
+        .filter(id__gt=state.hwm_id)
+        .select_related('user', 'recommendation__garden', 'recommendation__plant')
+        .order_by('id')
+        .iterator(chunk_size=1000)
+    )
+
+
+def refresh_weights(path=None, learner: OnlineLearner = None):
+    """
+    Incorpora el feedback nuevo al snapshot de pesos y lo vuelve a escribir
+    """
+    path = path or settings.AI_WEIGHTS_PATH
+    state = FeedbackWeights.load(path)
+    processed = (learner or OnlineLearner()).update(state, new_feedback(state))
+    if processed:
+        state.save(path)
+    return state, processed
+
+
+_loaded_weights = None
+_loaded_mtime = None
+_last_check = 0.0
+RELOAD_CHECK_SECONDS = 60
+
+
+def get_weights() -> FeedbackWeights:
+    """
+    Pesos compartidos por el proceso; se cargan al iniciar y se recargan si el
+    snapshot cambia (revisando el archivo como máximo una vez por minuto)
+    """
+    global _loaded_weights, _loaded_mtime, _last_check
+    now = time.monotonic()
+    if _loaded_weights is not None and now - _last_check < RELOAD_CHECK_SECONDS:
+        return _loaded_weights
+
+    _last_check = now
+    path = settings.AI_WEIGHTS_PATH
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+
+    if _loaded_weights is None or mtime != _loaded_mtime:
+        try:
+            _loaded_weights = FeedbackWeights.load(path)
+        except (ValueError, struct.error) as e:
+            logger.error(f"Snapshot de pesos inválido en {path}: {e}")
+            _loaded_weights = FeedbackWeights()
+        _loaded_mtime = mtime
+    return _loaded_weights
+
+
+def reset_loaded_weights():
+    global _loaded_weights, _loaded_mtime, _last_check
+    _loaded_weights = None
+    _loaded_mtime = None
+    _last_check = 0.0
@@ -0,0 +1,79 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from ai_recommendations.benchmark import DEFAULT_SIZES, RecommendationBenchmark
+
+
+class Command(BaseCommand):
+    help = 'Mide latencia, throughput y memoria del recomendador con catálogos sintéticos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+            help='Tamaños de catálogo separados por coma'
+        )
+        parser.add_argument(
+            '--iterations', type=int, default=50,
+            help='Llamadas medidas por escenario single/batch'
+        )
+        parser.add_argument(
+            '--users', type=int, default=100,
+            help='Usuarios sintéticos (escenario bulk)'
+        )
+        parser.add_argument(
+            '--gardens-per-user', type=int, default=5,
+            help='Jardines por usuario sintético'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=5,
+            help='Recomendaciones por jardín'
+        )
+        parser.add_argument(
+            '--no-explain', action='store_true',
+            help='Serializar sin razones ni fecha de cosecha (como ?explain=false)'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=42,
+            help='Semilla de los datos sintéticos'
+        )
+        parser.add_argument(
+            '--output', default=None,
+            help='Archivo JSON de resultados (por defecto se escribe en stdout)'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            sizes = [int(size) for size in options['sizes'].split(',') if size.strip()]
+        except ValueError:
+            raise CommandError('--sizes debe ser una lista de enteros separados por coma')
+        if not sizes or min(sizes) <= 0:
+            raise CommandError('--sizes debe contener tamaños positivos')
+        if min(options['iterations'], options['users'], options['gardens_per_user']) <= 0:
+            raise CommandError('--iterations, --users y --gardens-per-user deben ser positivos')
+
+        output = options['output']
+        benchmark = RecommendationBenchmark(
+            sizes=sizes,
+            iterations=options['iterations'],
+            users=options['users'],
+            gardens_per_user=options['gardens_per_user'],
+            limit=options['limit'],
+            explain=not options['no_explain'],
+            seed=options['seed'],
+            progress=(lambda message: self.stderr.write(f'Midiendo catálogo de {message}...')),
+        )
+        report = benchmark.run()
+
+        if output is None:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+        for row in report['results']:
+            self.stdout.write(
+                f"{row['catalog_size']:>9} {row['scenario']:<14} "
+                f"p50 {row['p50_ms']:>9.3f} ms  p99 {row['p99_ms']:>9.3f} ms  "
+                f"{row['throughput_per_s']:>10} jardines/s  pico {row['peak_memory_bytes'] / 2**20:.1f} MiB"
+            )
+        self.stdout.write(self.style.SUCCESS(f'Resultados guardados en {output}'))
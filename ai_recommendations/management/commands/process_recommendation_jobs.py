@@ -0,0 +1,58 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand
+from ai_recommendations.ai_service import AIRecommendationService
+from ai_recommendations.jobs import claim_jobs, run_jobs, requeue_stale_jobs
+
+
+class Command(BaseCommand):
+    help = 'Procesa en lotes los trabajos de recomendaciones encolados'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=50,
+            help='Trabajos reservados por lote'
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=2.0,
+            help='Segundos de espera cuando la cola está vacía'
+        )
+        parser.add_argument(
+            '--stale-minutes', type=int, default=10,
+            help='Reencolar trabajos en proceso por más de estos minutos'
+        )
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Vaciar la cola y terminar en lugar de seguir esperando'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options['batch_size'])
+        stale_after = timedelta(minutes=options['stale_minutes'])
+        service = AIRecommendationService()
+        processed = 0
+
+        # Los trabajos de un worker hermano que murió se recuperan mientras este
+        # sigue corriendo, revisando cada mitad del plazo de abandono
+        requeue_every = stale_after.total_seconds() / 2
+        next_requeue = time.monotonic()
+
+        while True:
+            if time.monotonic() >= next_requeue:
+                requeued = requeue_stale_jobs(stale_after)
+                if requeued:
+                    self.stdout.write(f'{requeued} trabajo(s) reencolados')
+                next_requeue = time.monotonic() + requeue_every
+
+            jobs = claim_jobs(batch_size)
+            if jobs:
+                completed = run_jobs(jobs, service)
+                processed += len(jobs)
+                self.stdout.write(f'Lote procesado: {completed}/{len(jobs)} completados')
+                continue
+
+            if options['once']:
+                break
+            time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f'{processed} trabajo(s) procesados'))
@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from ai_recommendations.learning import OnlineLearner, refresh_weights
+
+
+class Command(BaseCommand):
+    help = 'Incorpora el feedback nuevo de usuarios a los pesos del recomendador'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--path', default=None,
+            help=f'Archivo de pesos (por defecto {settings.AI_WEIGHTS_PATH})'
+        )
+        parser.add_argument(
+            '--learning-rate', type=float, default=0.05,
+            help='Tasa de aprendizaje del descenso de gradiente'
+        )
+
+    def handle(self, *args, **options):
+        learner = OnlineLearner(learning_rate=options['learning_rate'])
+        state, processed = refresh_weights(options['path'], learner)
+
+        if not processed:
+            self.stdout.write('Sin feedback nuevo')
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{processed} calificación(es) incorporadas; último feedback #{state.hwm_id}'
+            )
+        )
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:32
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gardens', '0001_initial'),
+        ('ai_recommendations', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='airecommendation',
+            name='garden',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='gardens.garden'),
+        ),
+        migrations.AddField(
+            model_name='airecommendation',
+            name='plant',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, to='gardens.plant'),
+        ),
+        migrations.AddIndex(
+            model_name='airecommendation',
+            index=models.Index(fields=['garden', 'status'], name='ai_recommen_garden__eb3881_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from gardens.models import Garden
+from . import cache as recommendation_cache
+
+User = get_user_model()
+
+
+@receiver([post_save, post_delete], sender=Garden)
+def garden_changed(sender, instance, **kwargs):
+    """
+    Invalida solo la entrada de caché que usaba el jardín modificado
+    """
+    recommendation_cache.invalidate_garden(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, **kwargs):
+    """
+    Invalida las entradas de caché usadas por el usuario modificado
+    """
+    recommendation_cache.invalidate_user(instance.pk)
@@ -1,3 +1,549 @@
-from django.test import TestCase
-
-# Create your tests here.
+import json
+import os
+import struct
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+import numpy as np
+from django.core.cache import cache, caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from django.contrib.auth import get_user_model
+from gardens.catalog import bump_catalog_version, get_catalog_version
+from gardens.management.commands.precompute_recommendations import score_owner_shard
+from gardens.models import Garden, Plant
+from . import cache as recommendation_cache
+from .ai_service import AIRecommendationService, PlantFeatureMatrix, PlantRecommendation, invalidate_catalog_matrix
+from .learning import FeedbackWeights, FEATURE_NAMES, refresh_weights, reset_loaded_weights
+from .models import AIRecommendation, RecommendationJob, UserFeedback
+
+User = get_user_model()
+
+
+def create_plant(name, difficulty='easy', space_required=1.0, **extra):
+    data = {
+        'name': name,
+        'description': f'Descripción de {name}',
+        'difficulty': difficulty,
+        'planting_season': 'spring',
+        'harvest_time_days': 60,
+        'space_required': space_required,
+        'water_frequency': 2,
+    }
+    data.update(extra)
+    return Plant.objects.create(**data)
+
+
+def reset_catalog(test):
+    """
+    Catálogo limpio para cada test: el rollback de la BD no dispara las señales
+    de Plant, así que se avanza la versión y el snapshot va a un directorio temporal
+    """
+    tmp = tempfile.TemporaryDirectory()
+    test.addCleanup(tmp.cleanup)
+    override = override_settings(PLANT_SNAPSHOT_DIR=tmp.name)
+    override.enable()
+    test.addCleanup(override.disable)
+    bump_catalog_version()
+    invalidate_catalog_matrix()
+
+
+def no_jitter(fingerprint, plant_ids):
+    return np.zeros(len(plant_ids))
+
+
+@override_settings(AI_WEIGHTS_PATH=os.path.join(tempfile.gettempdir(), 'hortechia-no-weights.bin'))
+class RecommendationEngineTest(TestCase):
+    """Tests del motor vectorizado de recomendaciones"""
+
+    def setUp(self):
+        reset_catalog(self)
+        reset_loaded_weights()
+        caches['recommendations'].clear()
+        self.user = User.objects.create_user(
+            username='engineuser',
+            email='engine@test.com',
+            password='enginepass123',
+            experience_level='beginner'
+        )
+        self.garden = Garden.objects.create(
+            owner=self.user,
+            name='Huerto',
+            location='Santiago',
+            size_m2=10.0,
+            soil_type='loamy',
+            sun_exposure='partial_sun'
+        )
+        self.service = AIRecommendationService()
+
+    def test_feature_matrix_skips_unused_columns(self):
+        """Test que la matriz solo carga las columnas del recomendador"""
+        create_plant('Lechuga', difficulty='medium', planting_season='autumn')
+        matrix = PlantFeatureMatrix.from_queryset()
+
+        self.assertEqual(len(matrix), 1)
+        row = matrix.row(0)
+        self.assertEqual(row.name, 'Lechuga')
+        self.assertEqual(row.difficulty, 'medium')
+        self.assertEqual(row.planting_season, 'autumn')
+
+    @mock.patch.object(AIRecommendationService, '_jitter', side_effect=no_jitter)
+    def test_ranks_whole_catalog(self, _):
+        """Test que el top-K considera todo el catálogo, no las primeras filas"""
+        for i in range(6):
+            create_plant(f'Grande {i}', space_required=8.0)
+        small = [create_plant(f'Pequeña {i}', space_required=1.0) for i in range(2)]
+        create_plant('Difícil', difficulty='hard', space_required=1.0)
+
+        recommendations = self.service.generate_plant_recommendations(self.user, self.garden)
+
+        self.assertEqual(len(recommendations), 5)
+        self.assertEqual(
+            {r['plant_id'] for r in recommendations[:2]},
+            {p.id for p in small}
+        )
+        scores = [r['confidence_score'] for r in recommendations]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertNotIn('Difícil', [r['plant_name'] for r in recommendations])
+
+    def test_empty_catalog(self):
+        """Test catálogo vacío"""
+        self.assertEqual(self.service.generate_plant_recommendations(self.user, self.garden), [])
+
+
+class RecommendationCacheTest(TestCase):
+    """Tests de la caché de resultados del recomendador"""
+
+    def setUp(self):
+        reset_catalog(self)
+        caches['recommendations'].clear()
+        for i in range(4):
+            create_plant(f'Planta {i}', space_required=0.5)
+        self.user = User.objects.create_user(
+            username='cacheuser',
+            email='cache@test.com',
+            password='cachepass123',
+            experience_level='beginner'
+        )
+        self.gardens = [
+            Garden.objects.create(
+                owner=self.user,
+                name=f'Jardín {i}',
+                location='Santiago',
+                size_m2=4.0,
+                soil_type='loamy',
+                sun_exposure='partial_sun'
+            )
+            for i in range(2)
+        ]
+        self.service = AIRecommendationService()
+
+    def test_identical_gardens_share_entry(self):
+        """Test que jardines con los mismos atributos reutilizan el resultado"""
+        first = self.service.generate_plant_recommendations(self.user, self.gardens[0])
+        # Solo la lectura de la versión del catálogo
+        with self.assertNumQueries(1):
+            second = self.service.generate_plant_recommendations(self.user, self.gardens[1])
+        self.assertEqual(first, second)
+
+    def test_cached_and_fresh_results_agree(self):
+        """Test que la variación es determinista"""
+        cached = self.service.generate_plant_recommendations(self.user, self.gardens[0])
+        fresh = self.service.generate_plant_recommendations(self.user, self.gardens[0], use_cache=False)
+        self.assertEqual(cached, fresh)
+
+    def test_plant_change_invalidates(self):
+        """Test que un cambio en el catálogo invalida los resultados"""
+        before = self.service.generate_plant_recommendations(self.user, self.gardens[0], limit=10)
+        create_plant('Nueva', space_required=0.5)
+        after = self.service.generate_plant_recommendations(self.user, self.gardens[0], limit=10)
+        self.assertEqual(len(after), len(before) + 1)
+
+    def test_garden_change_invalidates_only_its_key(self):
+        """Test que guardar un jardín elimina solo la entrada que usaba"""
+        self.service.generate_plant_recommendations(self.user, self.gardens[0])
+        other = Garden.objects.create(
+            owner=User.objects.create_user(
+                username='other', email='other@test.com', password='otherpass123',
+                experience_level='advanced'
+            ),
+            name='Otro', location='Santiago', size_m2=9.0,
+            soil_type='clay', sun_exposure='shade'
+        )
+        self.service.generate_plant_recommendations(other.owner, other)
+
+        self.gardens[0].save()
+
+        cache = recommendation_cache.get_cache()
+        version = get_catalog_version()
+        own_key = self.service.cache_key(
+            recommendation_cache.profile_fingerprint(self.user, self.gardens[0]), version, 5
+        )
+        other_key = self.service.cache_key(
+            recommendation_cache.profile_fingerprint(other.owner, other), version, 5
+        )
+        self.assertIsNone(cache.get(own_key))
+        self.assertIsNotNone(cache.get(other_key))
+
+
+class PrecomputeRecommendationsTest(TestCase):
+    """Tests del comando precompute_recommendations"""
+
+    def setUp(self):
+        reset_catalog(self)
+        caches['recommendations'].clear()
+        for i in range(3):
+            create_plant(f'Planta {i}', space_required=0.5)
+        self.users = [
+            User.objects.create_user(
+                username=f'owner{i}',
+                email=f'owner{i}@test.com',
+                password='ownerpass123',
+                experience_level='intermediate'
+            )
+            for i in range(3)
+        ]
+        for user in self.users:
+            Garden.objects.create(
+                owner=user,
+                name=f'Jardín de {user.username}',
+                location='Santiago',
+                size_m2=6.0,
+                soil_type='loamy',
+                sun_exposure='full_sun'
+            )
+
+    def test_precompute_persists_rows(self):
+        """Test que el comando persiste recomendaciones y reemplaza las anteriores"""
+        call_command('precompute_recommendations', workers=1, shard_size=2, stdout=StringIO())
+        self.assertEqual(AIRecommendation.objects.filter(plant__isnull=False).count(), 9)
+
+        call_command('precompute_recommendations', workers=1, stdout=StringIO())
+        self.assertEqual(AIRecommendation.objects.filter(plant__isnull=False).count(), 9)
+
+        garden = Garden.objects.get(owner=self.users[0])
+        precomputed = AIRecommendationService().get_precomputed_recommendations(garden)
+        self.assertEqual(len(precomputed), 3)
+        self.assertTrue(all(rec['reasons'] for rec in precomputed))
+
+    def test_rerun_keeps_feedback(self):
+        """Test que recalcular no borra las recomendaciones con feedback del usuario"""
+        call_command('precompute_recommendations', workers=1, stdout=StringIO())
+        garden = Garden.objects.get(owner=self.users[0])
+        top = AIRecommendationService().generate_plant_recommendations(self.users[0], garden, 1, use_cache=False)
+        rated = AIRecommendation.objects.filter(garden=garden).exclude(plant_id=top[0]['plant_id']).first()
+        UserFeedback.objects.create(user=self.users[0], recommendation=rated, rating=4)
+
+        call_command('precompute_recommendations', workers=1, stdout=StringIO())
+        self.assertEqual(UserFeedback.objects.count(), 1)
+        self.assertTrue(AIRecommendation.objects.filter(pk=rated.pk, status='pending').exists())
+
+        # Si deja de recomendarse, la fila queda descartada pero no se borra
+        call_command('precompute_recommendations', workers=1, limit=1, stdout=StringIO())
+        self.assertEqual(UserFeedback.objects.count(), 1)
+        self.assertEqual(AIRecommendation.objects.get(pk=rated.pk).status, 'dismissed')
+        self.assertEqual(AIRecommendation.objects.filter(status='pending').count(), 3)
+
+    def test_shard_queries_do_not_grow_with_gardens(self):
+        """Test que un grupo se puntúa con un número fijo de consultas"""
+        for user in self.users:
+            for i in range(3):
+                Garden.objects.create(owner=user, name=f'Extra {i}', location='Santiago',
+                                      size_m2=2.0 + i, soil_type='clay', sun_exposure='partial_sun')
+        owner_ids = [user.id for user in self.users]
+        score_owner_shard(owner_ids, 5)
+
+        # Versión del catálogo y jardines con su dueño; sin cargas diferidas por jardín
+        with self.assertNumQueries(2):
+            _, garden_count, rows = score_owner_shard(owner_ids, 5)
+        self.assertEqual(garden_count, 12)
+        self.assertEqual(len(rows), 36)
+
+
+class RecommendationJobTest(APITestCase):
+    """Tests de la cola de trabajos asíncronos"""
+
+    def setUp(self):
+        cache.clear()
+        caches['recommendations'].clear()
+        reset_catalog(self)
+        create_plant('Rabanito', space_required=0.2)
+        self.user = User.objects.create_user(
+            username='jobuser',
+            email='job@test.com',
+            password='jobpass123',
+            experience_level='beginner'
+        )
+        self.garden = Garden.objects.create(
+            owner=self.user,
+            name='Balcón',
+            location='Santiago',
+            size_m2=2.0,
+            soil_type='loamy',
+            sun_exposure='full_sun'
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_async_job_lifecycle(self):
+        """Test encolar, procesar con el worker y consultar el resultado"""
+        response = self.client.post(
+            '/api/v1/ai-recommendations/generate_recommendations/',
+            {'garden_id': self.garden.id, 'async': 'true'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        job_id = response.data['job_id']
+
+        # Un segundo pedido reutiliza el trabajo pendiente
+        response = self.client.post(
+            '/api/v1/ai-recommendations/generate_recommendations/',
+            {'garden_id': self.garden.id, 'async': 'true'}
+        )
+        self.assertEqual(response.data['job_id'], job_id)
+
+        response = self.client.get(f'/api/v1/ai-recommendations/jobs/{job_id}/')
+        self.assertEqual(response.data['status'], 'queued')
+
+        call_command('process_recommendation_jobs', once=True, stdout=StringIO())
+
+        response = self.client.get(f'/api/v1/ai-recommendations/jobs/{job_id}/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'done')
+        self.assertEqual(response.data['recommendations'][0]['plant_name'], 'Rabanito')
+
+    def test_worker_requeues_jobs_abandoned_while_it_runs(self):
+        """Test que un worker en marcha recupera los trabajos de otro que murió"""
+        class Stop(Exception):
+            pass
+
+        sleeps = []
+
+        def sleep(seconds):
+            sleeps.append(seconds)
+            if len(sleeps) == 1:
+                # Un worker hermano toma un trabajo y muere sin terminarlo
+                RecommendationJob.objects.create(
+                    user=self.user, garden=self.garden, status='running', worker_token='muerto',
+                    started_at=timezone.now() - timedelta(minutes=5),
+                )
+            else:
+                raise Stop
+
+        monotonic = iter(range(0, 1000, 100))
+        command = 'ai_recommendations.management.commands.process_recommendation_jobs.time'
+        with mock.patch(f'{command}.sleep', side_effect=sleep), \
+                mock.patch(f'{command}.monotonic', side_effect=lambda: next(monotonic)):
+            with self.assertRaises(Stop):
+                call_command('process_recommendation_jobs', stale_minutes=1, stdout=StringIO())
+
+        self.assertEqual(RecommendationJob.objects.get().status, 'done')
+
+    def test_job_of_other_user_not_visible(self):
+        """Test que un usuario no puede consultar trabajos ajenos"""
+        other = User.objects.create_user(
+            username='otherjob', email='otherjob@test.com', password='otherpass123'
+        )
+        job = RecommendationJob.objects.create(user=other, garden=self.garden)
+
+        response = self.client.get(f'/api/v1/ai-recommendations/jobs/{job.id}/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class FeedbackLearningTest(TestCase):
+    """Tests del aprendizaje incremental desde UserFeedback"""
+
+    def setUp(self):
+        tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmpdir.cleanup)
+        self.path = os.path.join(tmpdir.name, 'weights.bin')
+        override = override_settings(AI_WEIGHTS_PATH=self.path)
+        override.enable()
+        self.addCleanup(override.disable)
+        reset_loaded_weights()
+        self.addCleanup(reset_loaded_weights)
+        reset_catalog(self)
+        caches['recommendations'].clear()
+
+        self.user = User.objects.create_user(
+            username='feedbackuser',
+            email='feedback@test.com',
+            password='feedbackpass123',
+            experience_level='intermediate'
+        )
+        self.garden = Garden.objects.create(
+            owner=self.user,
+            name='Huerto',
+            location='Santiago',
+            size_m2=4.0,
+            soil_type='loamy',
+            sun_exposure='partial_sun'
+        )
+        self.easy = create_plant('Fácil', difficulty='easy', space_required=0.5)
+        self.medium = create_plant('Media', difficulty='medium', space_required=0.5)
+
+    def rate(self, plant, rating):
+        recommendation = AIRecommendation.objects.create(
+            user=self.user, garden=self.garden, plant=plant,
+            recommendation_type='general', title=plant.name,
+            description='', confidence_score=0.8
+        )
+        return UserFeedback.objects.create(user=self.user, recommendation=recommendation, rating=rating)
+
+    def test_incremental_refresh(self):
+        """Test que solo se procesa el feedback posterior al high-water-mark"""
+        self.rate(self.easy, 5)
+        state, processed = refresh_weights()
+        self.assertEqual(processed, 1)
+        easy_weight = state.weights[FEATURE_NAMES.index('difficulty_easy')]
+        self.assertGreater(easy_weight, 0)
+
+        _, processed = refresh_weights()
+        self.assertEqual(processed, 0)
+
+        self.rate(self.medium, 1)
+        state, processed = refresh_weights()
+        self.assertEqual(processed, 1)
+
+        loaded = FeedbackWeights.load(self.path)
+        self.assertEqual(loaded.updates, 2)
+        self.assertTrue((loaded.weights == state.weights).all())
+
+    def test_late_commit_with_older_timestamp_is_not_skipped(self):
+        """Test que el cursor por id no salta filas con created_at anterior al último procesado"""
+        self.rate(self.easy, 5)
+        refresh_weights()
+        # Fila que tomó su created_at antes que la ya procesada pero confirmó después
+        late = self.rate(self.medium, 1)
+        UserFeedback.objects.filter(pk=late.pk).update(created_at=timezone.now() - timedelta(minutes=1))
+
+        state, processed = refresh_weights()
+        self.assertEqual(processed, 1)
+        self.assertEqual(state.hwm_id, late.pk)
+
+    def test_reads_previous_weights_format(self):
+        weights = np.arange(len(FEATURE_NAMES), dtype='<f8')
+        data = struct.pack('<4sHHqqQ', b'HTWL', 1, len(FEATURE_NAMES), 123456, 42, 7) + weights.tobytes()
+        state = FeedbackWeights.from_bytes(data)
+        self.assertEqual((state.hwm_id, state.updates), (42, 7))
+        self.assertTrue((state.weights == weights).all())
+
+    @mock.patch.object(AIRecommendationService, '_jitter', side_effect=no_jitter)
+    def test_weights_change_ranking(self, _):
+        """Test que los pesos aprendidos modifican el score"""
+        service = AIRecommendationService()
+        before = service.generate_plant_recommendations(self.user, self.garden)
+        self.assertEqual(before[0]['plant_name'], 'Fácil')
+
+        weights = np.zeros(len(FEATURE_NAMES))
+        weights[FEATURE_NAMES.index('difficulty_easy')] = -0.15
+        weights[FEATURE_NAMES.index('difficulty_medium')] = 0.15
+        FeedbackWeights(weights, updates=1).save(self.path)
+        reset_loaded_weights()
+
+        after = service.generate_plant_recommendations(self.user, self.garden)
+        self.assertEqual(after[0]['plant_name'], 'Media')
+
+
+class BatchRecommendationTest(APITestCase):
+    """Tests del endpoint de recomendaciones para varios jardines"""
+
+    def setUp(self):
+        cache.clear()
+        caches['recommendations'].clear()
+        reset_catalog(self)
+        create_plant('Cilantro', space_required=0.2)
+        create_plant('Menta', space_required=3.0)
+        self.user = User.objects.create_user(
+            username='batchuser',
+            email='batch@test.com',
+            password='batchpass123',
+            experience_level='beginner'
+        )
+        self.gardens = [
+            Garden.objects.create(
+                owner=self.user,
+                name=f'Jardín {size}',
+                location='Santiago',
+                size_m2=size,
+                soil_type='loamy',
+                sun_exposure='full_sun'
+            )
+            for size in (1.0, 10.0, 10.0)
+        ]
+        self.client.force_authenticate(user=self.user)
+
+    def test_all_gardens(self):
+        """Test que "all" devuelve resultados para cada jardín del usuario"""
+        response = self.client.post(
+            '/api/v1/ai-recommendations/generate_batch/',
+            {'garden_ids': 'all'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {r['garden_id']: r['recommendations'] for r in response.data['results']}
+        self.assertEqual(set(results), {g.id for g in self.gardens})
+        self.assertEqual([r['plant_name'] for r in results[self.gardens[0].id]], ['Cilantro'])
+        self.assertEqual(len(results[self.gardens[1].id]), 2)
+
+    def test_foreign_gardens_reported_as_not_found(self):
+        """Test que los jardines ajenos no se procesan"""
+        other = User.objects.create_user(
+            username='otherbatch', email='otherbatch@test.com', password='otherpass123'
+        )
+        foreign = Garden.objects.create(
+            owner=other, name='Ajeno', location='Santiago', size_m2=5.0,
+            soil_type='sandy', sun_exposure='shade'
+        )
+        response = self.client.post(
+            '/api/v1/ai-recommendations/generate_batch/',
+            {'garden_ids': [self.gardens[0].id, foreign.id]}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([r['garden_id'] for r in response.data['results']], [self.gardens[0].id])
+        self.assertEqual(response.data['not_found'], [foreign.id])
+
+    def test_invalid_payload(self):
+        """Test validación de garden_ids"""
+        response = self.client.post(
+            '/api/v1/ai-recommendations/generate_batch/',
+            {'garden_ids': ['abc']}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_explain_false_skips_explanations(self):
+        """Test que ?explain=false no genera razones ni fecha de cosecha"""
+        with mock.patch.object(PlantRecommendation, 'reasons', new_callable=mock.PropertyMock) as reasons:
+            response = self.client.post(
+                '/api/v1/ai-recommendations/generate_batch/?explain=false',
+                {'garden_ids': 'all'}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        reasons.assert_not_called()
+        recommendation = response.data['results'][0]['recommendations'][0]
+        self.assertEqual(set(recommendation), set(PlantRecommendation.FIELDS))
+
+
+class RecommendationBenchmarkTest(TestCase):
+    """Tests del comando benchmark_recommendations"""
+
+    def test_writes_machine_readable_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, 'bench.json')
+            call_command(
+                'benchmark_recommendations', sizes='50', iterations=3, users=2,
+                gardens_per_user=2, output=output, stdout=StringIO(), stderr=StringIO()
+            )
+            with open(output, encoding='utf-8') as f:
+                report = json.load(f)
+
+        self.assertEqual(
+            [row['scenario'] for row in report['results']],
+            ['single', 'single_cached', 'batch', 'bulk']
+        )
+        for row in report['results']:
+            self.assertEqual(row['catalog_size'], 50)
+            self.assertGreater(row['throughput_per_s'], 0)
+            self.assertLessEqual(row['p50_ms'], row['p99_ms'])
+        self.assertEqual(report['results'][-1]['items'], 4)
@@ -1,62 +1,185 @@
-from rest_framework import viewsets, status
-from rest_framework.decorators import action
-from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticated
-from django_ratelimit.decorators import ratelimit
-from django.utils.decorators import method_decorator
-from .ai_service import AIRecommendationService
-from gardens.models import Garden
-import logging
-
-logger = logging.getLogger(__name__)
-
-@method_decorator(ratelimit(key='user', rate='10/m', method='POST'), name='generate_recommendations')
-class AIRecommendationViewSet(viewsets.ViewSet):
-    permission_classes = [IsAuthenticated]
-    
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        self.ai_service = AIRecommendationService()
-    
-    @action(detail=False, methods=['post'])
-    def generate_recommendations(self, request):
-        """
-        Genera recomendaciones de plantas usando IA
-        """
-        try:
-            garden_id = request.data.get('garden_id')
-            
-            if not garden_id:
-                return Response(
-                    {'error': 'garden_id es requerido'}, 
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-            
-            # Verificar que el jardín pertenece al usuario
-            try:
-                garden = Garden.objects.get(id=garden_id, owner=request.user)
-            except Garden.DoesNotExist:
-                return Response(
-                    {'error': 'Jardín no encontrado'}, 
-                    status=status.HTTP_404_NOT_FOUND
-                )
-            
-            # Generar recomendaciones
-            recommendations = self.ai_service.generate_plant_recommendations(
-                request.user, garden
-            )
-            
-            logger.info(f"AI recommendations generated for user {request.user.id}")
-            
-            return Response({
-                'garden': garden.name,
-                'recommendations': recommendations,
-                'generated_at': datetime.now().isoformat()
-            })
-            
-        except Exception as e:
-            logger.error(f"Error generating recommendations: {str(e)}")
-            return Response(
-                {'error': 'Error interno del servidor'}, 
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+from rest_framework import viewsets, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from django_ratelimit.decorators import ratelimit
+from django.utils.decorators import method_decorator
+from .ai_service import AIRecommendationService, PlantRecommendation
+from .jobs import enqueue_job
+from .models import RecommendationJob
+from gardens.models import Garden
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def explain_requested(request) -> bool:
+    """
+    ?explain=false omite razones y fecha de cosecha de la respuesta
+    """
+    return request.query_params.get('explain', 'true').lower() not in ('0', 'false', 'no')
+
+
+@method_decorator(ratelimit(key='user', rate='10/m', method='POST'), name='generate_recommendations')
+@method_decorator(ratelimit(key='user', rate='10/m', method='POST'), name='generate_batch')
+@method_decorator(ratelimit(key='user', rate='60/m', method='GET'), name='job_status')
+class AIRecommendationViewSet(viewsets.ViewSet):
+    permission_classes = [IsAuthenticated]
+    
+    # Máximo de jardines por solicitud en generate_batch
+    MAX_BATCH_GARDENS = 100
+    
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.ai_service = AIRecommendationService()
+    
+    @action(detail=False, methods=['post'])
+    def generate_recommendations(self, request):
+        """
+        Genera recomendaciones de plantas usando IA
+        """
+        try:
+            garden_id = request.data.get('garden_id')
+            
+            if not garden_id:
+                return Response(
+                    {'error': 'garden_id es requerido'}, 
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            
+            # Verificar que el jardín pertenece al usuario
+            try:
+                garden = Garden.objects.get(id=garden_id, owner=request.user)
+            except Garden.DoesNotExist:
+                return Response(
+                    {'error': 'Jardín no encontrado'}, 
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            
+            # Modo asíncrono: encolar y responder de inmediato con el id del trabajo
+            if str(request.data.get('async', '')).lower() in ('1', 'true'):
+                job = enqueue_job(request.user, garden)
+                return Response({
+                    'job_id': job.id,
+                    'status': job.status,
+                    'garden': garden.name,
+                }, status=status.HTTP_202_ACCEPTED)
+            
+            # Generar recomendaciones
+            recommendations = self.ai_service.generate_plant_recommendations(
+                request.user, garden
+            )
+            
+            logger.info(f"AI recommendations generated for user {request.user.id}")
+            
+            explain = explain_requested(request)
+            return Response({
+                'garden': garden.name,
+                'recommendations': [rec.to_dict(explain) for rec in recommendations],
+                'generated_at': datetime.now().isoformat()
+            })
+            
+        except Exception as e:
+            logger.error(f"Error generating recommendations: {str(e)}")
+            return Response(
+                {'error': 'Error interno del servidor'}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+    
+    @action(detail=False, methods=['post'])
+    def generate_batch(self, request):
+        """
+        Genera recomendaciones para varios jardines del usuario en una sola respuesta.
+        garden_ids: lista de ids o "all" para todos los jardines del usuario.
+        """
+        if hasattr(request.data, 'getlist'):
+            garden_ids = request.data.getlist('garden_ids')
+            if garden_ids == ['all']:
+                garden_ids = 'all'
+        else:
+            garden_ids = request.data.get('garden_ids')
+        
+        gardens = Garden.objects.filter(owner=request.user).order_by('id')
+        requested = None
+        
+        if garden_ids != 'all':
+            if not garden_ids or not isinstance(garden_ids, list):
+                return Response(
+                    {'error': 'garden_ids debe ser una lista de ids o "all"'}, 
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            try:
+                requested = list(dict.fromkeys(int(garden_id) for garden_id in garden_ids))
+            except (TypeError, ValueError):
+                return Response(
+                    {'error': 'garden_ids contiene valores inválidos'}, 
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            if len(requested) > self.MAX_BATCH_GARDENS:
+                return Response(
+                    {'error': f'Máximo {self.MAX_BATCH_GARDENS} jardines por solicitud'}, 
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            gardens = gardens.filter(id__in=requested)
+        
+        try:
+            # Una sola consulta de propiedad para todos los jardines
+            gardens = list(gardens)
+            batch = self.ai_service.generate_batch_recommendations(request.user, gardens)
+        except Exception as e:
+            logger.error(f"Error generating batch recommendations: {str(e)}")
+            return Response(
+                {'error': 'Error interno del servidor'}, 
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        
+        found = {garden.id for garden in gardens}
+        explain = explain_requested(request)
+        logger.info(f"AI batch recommendations generated for user {request.user.id} ({len(gardens)} gardens)")
+        
+        return Response({
+            'results': [
+                {
+                    'garden_id': garden.id,
+                    'garden': garden.name,
+                    'recommendations': [rec.to_dict(explain) for rec in recommendations],
+                }
+                for garden, recommendations in zip(gardens, batch)
+            ],
+            'not_found': [garden_id for garden_id in (requested or []) if garden_id not in found],
+            'generated_at': datetime.now().isoformat()
+        })
+    
+    @action(detail=False, methods=['get'], url_path=r'jobs/(?P<job_id>[0-9]+)')
+    def job_status(self, request, job_id=None):
+        """
+        Consulta el estado y resultado de un trabajo de recomendaciones
+        """
+        try:
+            job = RecommendationJob.objects.select_related('garden').get(
+                id=job_id, user=request.user
+            )
+        except RecommendationJob.DoesNotExist:
+            return Response(
+                {'error': 'Trabajo no encontrado'}, 
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        data = {
+            'job_id': job.id,
+            'status': job.status,
+            'garden': job.garden.name,
+        }
+        if job.status == 'done':
+            data['recommendations'] = job.result
+            if not explain_requested(request):
+                data['recommendations'] = [
+                    {key: rec[key] for key in PlantRecommendation.FIELDS if key in rec}
+                    for rec in job.result
+                ]
+            data['generated_at'] = job.finished_at.isoformat()
+        elif job.status == 'failed':
+            data['error'] = 'Error interno del servidor'
+        
+        return Response(data)
\ No newline at end of file
@@ -0,0 +1,60 @@
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.utils import timezone
+from gardens.models import Garden, Plant
+from .models import SiteCounters
+
+User = get_user_model()
+
+COUNTER_ROW = 1
+
+
+def counted_models() -> dict:
+    """
+    Modelo contado -> campo de SiteCounters
+    """
+    return {
+        Plant: 'total_plants',
+        User: 'total_users',
+        Garden: 'total_gardens',
+    }
+
+
+def increment(field: str, delta: int):
+    """
+    Suma `delta` al contador en la base de datos (sin leer la fila)
+    """
+    updated = SiteCounters.objects.filter(pk=COUNTER_ROW).update(
+        **{field: F(field) + delta}, updated_at=timezone.now()
+    )
+    if not updated:
+        # Sin fila todavía: se crea con los totales reales
+        reconcile()
+
+
+def reconcile() -> dict:
+    """
+    Recalcula los totales con COUNT y corrige la fila.
+    Devuelve {campo: (valor anterior, valor real)} para los que no coincidían.
+    """
+    counters = SiteCounters.objects.filter(pk=COUNTER_ROW).first()
+    actual = {field: model.objects.count() for model, field in counted_models().items()}
+
+    drift = {
+        field: (getattr(counters, field) if counters else None, value)
+        for field, value in actual.items()
+        if counters is None or getattr(counters, field) != value
+    }
+    SiteCounters.objects.update_or_create(pk=COUNTER_ROW, defaults=actual)
+    return drift
+
+
+def get_counters() -> SiteCounters:
+    """
+    Totales de la portada: una lectura de una fila
+    """
+    counters = SiteCounters.objects.filter(pk=COUNTER_ROW).first()
+    if counters is None:
+        reconcile()
+        counters = SiteCounters.objects.get(pk=COUNTER_ROW)
+    return counters
@@ -0,0 +1,127 @@
+import time
+from django.core.cache import caches
+from django.db.models import Count, Q
+from gardens.models import Garden, Plant, WateringSchedule
+
+RECENT_PLANTS = 6
+
+# Alias en settings.CACHES para las partes del dashboard
+CACHE_ALIAS = 'dashboard'
+
+# Partes por usuario; cada una se invalida por separado
+PARTS = ('gardens', 'waterings', 'weather')
+RECENT_PLANTS_KEY = 'dashboard:recent_plants'
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def part_key(user_id, part: str) -> str:
+    return f'dashboard:{user_id}:{part}'
+
+
+def garden_summary(user):
+    """
+    Jardines del usuario con sus planes activos contados en la misma consulta.
+    Devuelve (jardines, total de jardines, total de planes activos).
+    """
+    gardens = list(
+        Garden.objects
+        .filter(owner=user)
+        .only('id', 'name', 'location', 'size_m2', 'soil_type')
+        .annotate(active_plan_count=Count('cultivationplan', filter=Q(cultivationplan__status='active')))
+        .order_by('id')
+    )
+    return gardens, len(gardens), sum(garden.active_plan_count for garden in gardens)
+
+
+def upcoming_waterings(user, limit=5):
+    """
+    Próximos riegos calculados por update_watering_schedules
+    """
+    return list(
+        WateringSchedule.objects
+        .filter(plan__garden__owner=user, plan__status='active')
+        .select_related('plan__plant', 'plan__garden')
+        .order_by('next_watering_date')[:limit]
+    )
+
+
+def build_gardens_part(user) -> dict:
+    user_gardens, total_gardens, active_plans = garden_summary(user)
+    return {
+        'user_gardens': user_gardens,
+        'total_gardens': total_gardens,
+        'active_plans': active_plans,
+    }
+
+
+def build_waterings_part(user) -> dict:
+    return {'upcoming_waterings': upcoming_waterings(user)}
+
+
+def build_weather_part(user, weather_service) -> dict:
+    """
+    Bloque del clima; vale mientras sigan vigentes las entradas de clima usadas
+    """
+    location = user.location or 'Santiago, Chile'
+    # Región ya resuelta al guardar el usuario
+    location_key = user.location_key if user.location else None
+
+    current_weather = weather_service.get_current_weather(location, location_key)
+    return {
+        'current_weather': current_weather,
+        'weather_forecast': weather_service.get_weekly_forecast(location, location_key),
+        'gardening_tip': weather_service.get_gardening_tip(current_weather),
+        'fresh_until': weather_service.fresh_until(location, location_key),
+    }
+
+
+def get_dashboard_context(user, weather_service) -> dict:
+    """
+    Contexto del dashboard armado desde la caché por partes. Con todo vigente
+    cuesta una sola lectura (get_many); solo se reconstruyen las partes faltantes.
+    """
+    cache = get_cache()
+    keys = {part: part_key(user.pk, part) for part in PARTS}
+    cached = cache.get_many([*keys.values(), RECENT_PLANTS_KEY])
+    updates = {}
+
+    gardens = cached.get(keys['gardens'])
+    if gardens is None:
+        gardens = updates[keys['gardens']] = build_gardens_part(user)
+
+    waterings = cached.get(keys['waterings'])
+    if waterings is None:
+        waterings = updates[keys['waterings']] = build_waterings_part(user)
+
+    weather = cached.get(keys['weather'])
+    if weather is None or time.time() >= weather['fresh_until']:
+        weather = updates[keys['weather']] = build_weather_part(user, weather_service)
+
+    recent_plants = cached.get(RECENT_PLANTS_KEY)
+    if recent_plants is None:
+        recent_plants = updates[RECENT_PLANTS_KEY] = list(Plant.objects.order_by('id')[:RECENT_PLANTS])
+
+    if updates:
+        cache.set_many(updates)
+
+    context = {**gardens, **waterings, **weather, 'recent_plants': recent_plants}
+    del context['fresh_until']
+    return context
+
+
+def invalidate_user(user_id, parts=PARTS):
+    """
+    Descarta solo las partes indicadas del dashboard de un usuario
+    """
+    get_cache().delete_many([part_key(user_id, part) for part in parts])
+
+
+def invalidate_waterings(user_ids):
+    get_cache().delete_many([part_key(user_id, 'waterings') for user_id in user_ids])
+
+
+def invalidate_recent_plants():
+    get_cache().delete(RECENT_PLANTS_KEY)
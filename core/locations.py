@@ -0,0 +1,106 @@
+import re
+import unicodedata
+from collections import namedtuple
+
+Region = namedtuple('Region', ['id', 'name', 'country', 'query', 'aliases'])
+
+# Ciudades conocidas: id canónico, nombre, país, consulta para el proveedor y alias
+REGIONS = (
+    Region('cl-santiago', 'Santiago', 'Chile', 'Santiago,CL',
+           ('santiago de chile', 'stgo', 'scl', 'region metropolitana', 'rm')),
+    Region('cl-valparaiso', 'Valparaíso', 'Chile', 'Valparaiso,CL', ('valpo',)),
+    Region('cl-vina-del-mar', 'Viña del Mar', 'Chile', 'Vina del Mar,CL', ('vina',)),
+    Region('cl-la-serena', 'La Serena', 'Chile', 'La Serena,CL', ('serena',)),
+    Region('cl-concepcion', 'Concepción', 'Chile', 'Concepcion,CL', ('conce',)),
+    Region('cl-antofagasta', 'Antofagasta', 'Chile', 'Antofagasta,CL', ('antofa',)),
+    Region('cl-temuco', 'Temuco', 'Chile', 'Temuco,CL', ()),
+    Region('cl-puerto-montt', 'Puerto Montt', 'Chile', 'Puerto Montt,CL', ('pto montt',)),
+    Region('cl-rancagua', 'Rancagua', 'Chile', 'Rancagua,CL', ()),
+    Region('cl-talca', 'Talca', 'Chile', 'Talca,CL', ()),
+    Region('cl-arica', 'Arica', 'Chile', 'Arica,CL', ()),
+    Region('cl-iquique', 'Iquique', 'Chile', 'Iquique,CL', ()),
+    Region('cl-calama', 'Calama', 'Chile', 'Calama,CL', ()),
+    Region('cl-copiapo', 'Copiapó', 'Chile', 'Copiapo,CL', ()),
+    Region('cl-coquimbo', 'Coquimbo', 'Chile', 'Coquimbo,CL', ()),
+    Region('cl-chillan', 'Chillán', 'Chile', 'Chillan,CL', ()),
+    Region('cl-valdivia', 'Valdivia', 'Chile', 'Valdivia,CL', ()),
+    Region('cl-osorno', 'Osorno', 'Chile', 'Osorno,CL', ()),
+    Region('cl-punta-arenas', 'Punta Arenas', 'Chile', 'Punta Arenas,CL', ()),
+)
+
+COUNTRY_NAMES = {'chile', 'cl'}
+
+
+def normalize_location(location: str) -> str:
+    """
+    Minúsculas, sin tildes ni puntuación y con espacios simples
+    """
+    text = unicodedata.normalize('NFKD', location or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+    return ' '.join(re.sub(r'[^\w\s]', ' ', text).split())
+
+
+class LocationIndex:
+    """
+    Índice de nombres y alias normalizados a regiones.
+    Un dict resuelve la forma exacta y un trie por palabras encuentra el alias más
+    largo al inicio del texto ("santiago centro" -> Santiago). El costo depende
+    del largo del texto, no del tamaño de la tabla de ciudades.
+    """
+
+    def __init__(self, regions=REGIONS):
+        self.regions = {region.id: region for region in regions}
+        self.exact = {}
+        self.trie = {}
+        for region in regions:
+            for name in (region.name, *region.aliases):
+                self.add(normalize_location(name), region.id)
+
+    def add(self, name: str, region_id: str):
+        self.exact.setdefault(name, region_id)
+        node = self.trie
+        for word in name.split():
+            node = node.setdefault(word, {})
+        node.setdefault(None, region_id)
+
+    def _longest_prefix(self, words):
+        node = self.trie
+        found = None
+        for word in words:
+            node = node.get(word)
+            if node is None:
+                break
+            found = node.get(None, found)
+        return found
+
+    def resolve(self, location: str):
+        """
+        Id de la región para `location`, o None si no se reconoce
+        """
+        # "Ciudad, País": la ciudad es lo que va antes de la primera coma
+        city = (location or '').split(',')[0]
+        for text in (normalize_location(location), normalize_location(city)):
+            if text in self.exact:
+                return self.exact[text]
+        words = normalize_location(city).split()
+        # "Santiago Chile" sin coma
+        while words and words[-1] in COUNTRY_NAMES:
+            words.pop()
+        return self._longest_prefix(words)
+
+    def location_key(self, location: str) -> str:
+        """
+        Clave canónica: id de región o, si no se reconoce, el texto normalizado
+        (nunca choca con un id porque los ids llevan guion)
+        """
+        return self.resolve(location) or normalize_location(location)
+
+    def region(self, location_key: str):
+        return self.regions.get(location_key)
+
+
+location_index = LocationIndex()
+
+
+def location_key(location: str) -> str:
+    return location_index.location_key(location)
@@ -0,0 +1,53 @@
+import asyncio
+import time
+from django.core.management.base import BaseCommand, CommandError
+from core.weather_prefetch import distinct_locations, prefetch_locations
+from gardens.watering import update_watering_schedules
+
+
+class Command(BaseCommand):
+    help = 'Precarga en caché el clima de todas las ubicaciones de usuarios y jardines'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency', type=int, default=10,
+            help='Consultas simultáneas al proveedor'
+        )
+        parser.add_argument(
+            '--rate', type=float, default=10.0,
+            help='Máximo de consultas por segundo al proveedor'
+        )
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Consultar también las ubicaciones con datos vigentes en caché'
+        )
+        parser.add_argument(
+            '--schedules', action='store_true',
+            help='Recalcular los riegos programados con los pronósticos nuevos'
+        )
+
+    def handle(self, *args, **options):
+        if options['concurrency'] <= 0 or options['rate'] <= 0:
+            raise CommandError('--concurrency y --rate deben ser positivos')
+
+        locations = distinct_locations()
+        self.stdout.write(f'Precargando clima de {len(locations)} ubicación(es)...')
+
+        started = time.monotonic()
+        stats = asyncio.run(prefetch_locations(
+            locations,
+            concurrency=options['concurrency'],
+            rate=options['rate'],
+            force=options['force'],
+        ))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{stats['fetched']} consultas, {stats['skipped']} vigentes en caché, "
+                f"{stats['failed']} fallidas en {time.monotonic() - started:.1f}s"
+            )
+        )
+
+        if options['schedules']:
+            total = update_watering_schedules()
+            self.stdout.write(self.style.SUCCESS(f'{total} riegos programados'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from core.counters import reconcile
+
+
+class Command(BaseCommand):
+    help = 'Corrige los totales de la portada recalculándolos con COUNT'
+
+    def handle(self, *args, **options):
+        drift = reconcile()
+
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('Contadores al día'))
+            return
+
+        for field, (stored, actual) in drift.items():
+            self.stdout.write(f'{field}: {stored} -> {actual}')
+        self.stdout.write(self.style.SUCCESS(f'{len(drift)} contador(es) corregidos'))
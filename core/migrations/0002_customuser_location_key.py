@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:50
+
+from django.db import migrations, models
+
+
+def resolve_location_keys(apps, schema_editor):
+    from core.locations import location_key
+
+    Model = apps.get_model('core', 'CustomUser')
+    rows = list(Model.objects.only('id', 'location'))
+    for row in rows:
+        row.location_key = location_key(row.location)
+    Model.objects.bulk_update(rows, ['location_key'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customuser',
+            name='location_key',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.RunPython(resolve_location_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:54
+
+from django.db import migrations, models
+
+
+def create_counters(apps, schema_editor):
+    SiteCounters = apps.get_model('core', 'SiteCounters')
+    SiteCounters.objects.update_or_create(pk=1, defaults={
+        'total_plants': apps.get_model('gardens', 'Plant').objects.count(),
+        'total_users': apps.get_model('core', 'CustomUser').objects.count(),
+        'total_gardens': apps.get_model('gardens', 'Garden').objects.count(),
+    })
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_customuser_location_key'),
+        ('gardens', '0003_wateringschedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SiteCounters',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('total_plants', models.BigIntegerField(default=0)),
+                ('total_users', models.BigIntegerField(default=0)),
+                ('total_gardens', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Contadores del sitio',
+                'verbose_name_plural': 'Contadores del sitio',
+            },
+        ),
+        migrations.RunPython(create_counters, migrations.RunPython.noop),
+    ]
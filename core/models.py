@@ -1,41 +1,58 @@
-from django.contrib.auth.models import AbstractUser
-from django.db import models
-from django.core.validators import RegexValidator
-
-class CustomUser(AbstractUser):
-    EXPERIENCE_LEVELS = [
-        ('beginner', 'Principiante'),
-        ('intermediate', 'Intermedio'),
-        ('advanced', 'Avanzado'),
-    ]
-    
-    email = models.EmailField(unique=True)
-    phone_number = models.CharField(
-        max_length=15,
-        validators=[RegexValidator(r'^\+?1?\d{9,15}$')],
-        blank=True,
-        help_text="Formato: '+999999999'. Hasta 15 dígitos."
-    )
-    location = models.CharField(max_length=100, blank=True)
-    experience_level = models.CharField(
-        max_length=20,
-        choices=EXPERIENCE_LEVELS,
-        default='beginner'
-    )
-    available_space = models.PositiveIntegerField(
-        help_text="Espacio disponible en metros cuadrados",
-        null=True,
-        blank=True
-    )
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-    
-    USERNAME_FIELD = 'email'
-    REQUIRED_FIELDS = ['username']
-    
-    def __str__(self):
-        return f"{self.username} - {self.experience_level}"
-    
-    class Meta:
-        verbose_name = "Usuario"
-        verbose_name_plural = "Usuarios"
+from django.contrib.auth.models import AbstractUser
+from django.db import models
+from django.core.validators import RegexValidator
+
+class CustomUser(AbstractUser):
+    EXPERIENCE_LEVELS = [
+        ('beginner', 'Principiante'),
+        ('intermediate', 'Intermedio'),
+        ('advanced', 'Avanzado'),
+    ]
+    
+    email = models.EmailField(unique=True)
+    phone_number = models.CharField(
+        max_length=15,
+        validators=[RegexValidator(r'^\+?1?\d{9,15}$')],
+        blank=True,
+        help_text="Formato: '+999999999'. Hasta 15 dígitos."
+    )
+    location = models.CharField(max_length=100, blank=True)
+    # Región canónica de `location` (core.locations), resuelta al guardar
+    location_key = models.CharField(max_length=100, blank=True, editable=False)
+    experience_level = models.CharField(
+        max_length=20,
+        choices=EXPERIENCE_LEVELS,
+        default='beginner'
+    )
+    available_space = models.PositiveIntegerField(
+        help_text="Espacio disponible en metros cuadrados",
+        null=True,
+        blank=True
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    USERNAME_FIELD = 'email'
+    REQUIRED_FIELDS = ['username']
+    
+    def __str__(self):
+        return f"{self.username} - {self.experience_level}"
+    
+    class Meta:
+        verbose_name = "Usuario"
+        verbose_name_plural = "Usuarios"
+
+
+class SiteCounters(models.Model):
+    """
+    Totales globales de la portada en una sola fila (pk=1), mantenidos por
+    señales en core.counters y corregidos por reconcile_counters
+    """
+    total_plants = models.BigIntegerField(default=0)
+    total_users = models.BigIntegerField(default=0)
+    total_gardens = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Contadores del sitio"
+        verbose_name_plural = "Contadores del sitio"
@@ -0,0 +1,67 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from gardens.models import CultivationPlan, Garden, Plant
+from . import counters, dashboard
+from .locations import location_key
+
+User = get_user_model()
+
+
+@receiver(pre_save, sender=User)
+def resolve_user_location(sender, instance, **kwargs):
+    """
+    Guarda la región canónica para no resolver la ubicación en cada request
+    """
+    instance.location_key = location_key(instance.location)
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Plant)
+@receiver(post_save, sender=Garden)
+def count_created(sender, instance, created, raw=False, **kwargs):
+    """
+    Mantiene los totales de la portada sin COUNT sobre las tablas
+    """
+    if created and not raw:
+        counters.increment(counters.counted_models()[sender], 1)
+
+
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Plant)
+@receiver(post_delete, sender=Garden)
+def count_deleted(sender, instance, **kwargs):
+    counters.increment(counters.counted_models()[sender], -1)
+
+
+@receiver(post_save, sender=Garden)
+@receiver(post_delete, sender=Garden)
+def garden_dashboard_changed(sender, instance, **kwargs):
+    # Tarjetas de jardines y nombres en los riegos; el clima no depende del jardín
+    dashboard.invalidate_user(instance.owner_id, ['gardens', 'waterings'])
+
+
+@receiver(post_save, sender=CultivationPlan)
+@receiver(post_delete, sender=CultivationPlan)
+def plan_dashboard_changed(sender, instance, **kwargs):
+    owner_id = Garden.objects.filter(pk=instance.garden_id).values_list('owner_id', flat=True).first()
+    if owner_id is not None:
+        dashboard.invalidate_user(owner_id, ['gardens', 'waterings'])
+
+
+@receiver(post_save, sender=User)
+def user_dashboard_changed(sender, instance, created, **kwargs):
+    # La ubicación define el bloque del clima
+    if not created:
+        dashboard.invalidate_user(instance.pk, ['weather'])
+
+
+@receiver(post_delete, sender=User)
+def user_dashboard_deleted(sender, instance, **kwargs):
+    dashboard.invalidate_user(instance.pk)
+
+
+@receiver(post_save, sender=Plant)
+@receiver(post_delete, sender=Plant)
+def plant_dashboard_changed(sender, instance, **kwargs):
+    dashboard.invalidate_recent_plants()
@@ -1,3 +1,394 @@
-from django.test import TestCase
-
-# Create your tests here.
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+import requests
+from io import StringIO
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from gardens.models import CultivationPlan, Garden, Plant
+from . import weather_cache
+from .models import SiteCounters
+from .counters import get_counters
+from .locations import LocationIndex, Region, location_key
+from .weather_client import CircuitBreaker, OpenWeatherClient, WeatherUnavailable
+from .weather_service import WeatherService
+
+User = get_user_model()
+
+
+class InlineExecutor:
+    """Ejecuta los refrescos en el mismo hilo para que los tests sean deterministas"""
+
+    def submit(self, fn, *args, **kwargs):
+        fn(*args, **kwargs)
+
+
+class WeatherCacheTest(TestCase):
+    """Tests de la caché de clima"""
+
+    def setUp(self):
+        weather_cache.clear()
+        self.service = WeatherService()
+
+    def test_second_call_is_served_from_cache(self):
+        with mock.patch.object(WeatherService, '_fetch_current_weather',
+                               wraps=self.service._fetch_current_weather) as fetch:
+            first = self.service.get_current_weather('Valparaíso, Chile')
+            second = self.service.get_current_weather('valparaiso chile')
+        self.assertEqual(fetch.call_count, 1)
+        self.assertEqual(first['temperature'], second['temperature'])
+        self.assertEqual(second['location'], 'valparaiso chile')
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        key = weather_cache.weather_key('forecast', 'cl-santiago')
+        with mock.patch('core.weather_cache.time.time', return_value=1000.0):
+            weather_cache.store(key, ['vencido'], ttl=10)
+
+        with mock.patch.object(weather_cache, '_refresh_pool', InlineExecutor()), \
+                mock.patch('core.weather_cache.time.time', return_value=2000.0):
+            self.assertEqual(self.service.get_weekly_forecast('Santiago'), ['vencido'])
+            # El refresco en segundo plano ya reemplazó la entrada
+            self.assertEqual(len(self.service.get_weekly_forecast('Santiago')), 7)
+
+    def test_fresh_entries_are_served_from_local_tier(self):
+        key = weather_cache.weather_key('current', 'cl-santiago')
+        # Otro proceso (prefetch_weather) dejó la entrada en la caché compartida
+        caches['weather'].set(key, (time.time() + 60, {'temperature': 30}))
+        fetch = mock.Mock()
+        self.assertEqual(weather_cache.get_or_fetch(key, fetch, ttl=60), {'temperature': 30})
+
+        caches['weather'].clear()
+        self.assertEqual(weather_cache.get_or_fetch(key, fetch, ttl=60), {'temperature': 30})
+        fetch.assert_not_called()
+
+    def test_local_tier_evicts_least_recently_used(self):
+        local = weather_cache.get_local_cache()
+        keys = [f'weather:current:lru-{i}' for i in range(local._max_entries)]
+        for key in keys:
+            local.set(key, 1)
+        local.get(keys[0])
+        local.set('weather:current:nueva', 1)
+        self.assertIsNotNone(local.get(keys[0]))
+        self.assertIsNone(local.get(keys[1]))
+        self.assertEqual(sum(local.get(key) is not None for key in keys), len(keys) - 1)
+
+    def test_failed_fetch_falls_back_without_caching(self):
+        with mock.patch.object(WeatherService, '_fetch_current_weather', side_effect=RuntimeError):
+            weather = self.service.get_current_weather('Santiago')
+        self.assertEqual(weather['location'], 'Ubicación no disponible')
+        self.assertIsNone(caches['weather'].get(weather_cache.weather_key('current', 'cl-santiago')))
+
+
+class StubWeatherHandler(BaseHTTPRequestHandler):
+    """Respuestas de OpenWeatherMap configurables por test"""
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+        if server.delay:
+            time.sleep(server.delay)
+        if server.status != 200:
+            self.send_response(server.status)
+            self.end_headers()
+            return
+
+        now = int(time.time())
+        if self.path.startswith('/weather'):
+            payload = {
+                'weather': [{'description': 'cielo claro', 'icon': '01d'}],
+                'main': {'temp': 24.6, 'humidity': 40},
+                'wind': {'speed': 2.5},
+            }
+        else:
+            payload = {'list': [
+                {
+                    'dt': now + hours * 3600,
+                    'weather': [{'description': 'lluvia ligera', 'icon': '10d'}],
+                    'main': {'temp_max': 20 + hours % 5, 'temp_min': 10 + hours % 3},
+                }
+                for hours in range(0, 120, 3)
+            ]}
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class OpenWeatherClientTest(TestCase):
+    """Tests del cliente HTTP del clima contra un servidor local"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StubWeatherHandler)
+        self.server.requests = []
+        self.server.status = 200
+        self.server.delay = 0
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+        override = override_settings(
+            WEATHER_CONNECT_TIMEOUT=0.5,
+            WEATHER_READ_TIMEOUT=0.2,
+            WEATHER_MAX_RETRIES=1,
+            WEATHER_RETRY_BACKOFF=0,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+        self.client = OpenWeatherClient(
+            'test-key', f'http://127.0.0.1:{self.server.server_port}', circuit=self.breaker
+        )
+
+    def test_maps_provider_payload(self):
+        weather = self.client.current('Santiago')
+        self.assertEqual(weather['temperature'], 25)
+        self.assertEqual(weather['icon'], 'sunny')
+        self.assertEqual(weather['wind_speed'], 9)
+
+        forecast = self.client.forecast('Santiago')
+        self.assertGreaterEqual(len(forecast), 5)
+        self.assertEqual(forecast[0]['icon'], 'rainy')
+
+    def test_breaker_opens_and_skips_network(self):
+        self.server.status = 503
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                self.client.current('Santiago')
+        # 2 llamadas x (1 intento + 1 reintento)
+        self.assertEqual(len(self.server.requests), 4)
+        self.assertEqual(self.breaker.state, 'open')
+
+        with mock.patch('core.weather_service.OpenWeatherClient', return_value=self.client), \
+                override_settings(WEATHER_PROVIDER='openweathermap'):
+            weather_cache.clear()
+            service = WeatherService()
+            self.assertEqual(service.get_current_weather('Santiago')['location'], 'Ubicación no disponible')
+            self.assertEqual(len(service.get_weekly_forecast('Santiago')), 7)
+        self.assertEqual(len(self.server.requests), 4)
+
+    def test_rejected_key_counts_as_failure(self):
+        self.breaker.failures = 1
+        self.server.status = 404
+        with self.assertRaises(WeatherUnavailable):
+            self.client.current('Ciudad Inexistente')
+        self.assertEqual(self.breaker.failures, 0)
+
+        self.server.status = 401
+        for _ in range(2):
+            with self.assertRaises(WeatherUnavailable):
+                self.client.current('Santiago')
+        # Sin reintentos: una clave inválida no se arregla sola
+        self.assertEqual(len(self.server.requests), 3)
+        self.assertEqual(self.breaker.state, 'open')
+
+    def test_read_timeout_is_retried_then_fails(self):
+        self.server.delay = 0.5
+        started = time.monotonic()
+        with self.assertRaises(Exception):
+            self.client.current('Santiago')
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertEqual(self.breaker.failures, 1)
+
+    def test_failed_half_open_probe_is_released(self):
+        self.breaker.failures = 2
+        self.breaker.opened_at = time.monotonic() - 61
+        broken = requests.exceptions.ChunkedEncodingError('respuesta cortada')
+        with mock.patch.object(self.client.session, 'get', side_effect=broken):
+            with self.assertRaises(WeatherUnavailable):
+                self.client.current('Santiago')
+        self.assertEqual(self.breaker.state, 'open')
+
+        # Pasado el reset, la siguiente llamada de prueba sí llega al proveedor
+        self.breaker.opened_at = time.monotonic() - 61
+        self.assertEqual(self.client.current('Santiago')['temperature'], 25)
+        self.assertEqual(self.breaker.state, 'closed')
+
+
+class PrefetchWeatherTest(TestCase):
+    """Tests del comando prefetch_weather"""
+
+    def setUp(self):
+        weather_cache.clear()
+        user = User.objects.create_user(
+            username='prefetch', email='prefetch@test.com', password='prefetchpass123',
+            location='Santiago'
+        )
+        for location in ('santiago', 'Valparaíso', 'VALPARAISO'):
+            Garden.objects.create(
+                owner=user, name=location, location=location, size_m2=5.0,
+                soil_type='loamy', sun_exposure='full_sun'
+            )
+
+    def test_fills_cache_once_per_location(self):
+        with mock.patch.object(WeatherService, '_fetch_current_weather',
+                               wraps=WeatherService()._fetch_current_weather) as fetch:
+            call_command('prefetch_weather', concurrency=4, rate=100, stdout=StringIO())
+            self.assertEqual(fetch.call_count, 2)
+
+            for location_key in ('cl-santiago', 'cl-valparaiso'):
+                for kind in ('current', 'forecast'):
+                    self.assertTrue(weather_cache.is_fresh(weather_cache.weather_key(kind, location_key)))
+
+            # Segunda pasada: todo vigente en caché
+            call_command('prefetch_weather', stdout=StringIO())
+            self.assertEqual(fetch.call_count, 2)
+
+
+class LocationResolverTest(TestCase):
+    """Tests de la normalización de ubicaciones"""
+
+    def test_spellings_collapse_to_one_region(self):
+        for spelling in ('Santiago', 'santiago de chile', 'Stgo.', 'Santiago, Chile',
+                         'SANTIAGO CHILE', 'Santiago Centro'):
+            self.assertEqual(location_key(spelling), 'cl-santiago', spelling)
+        self.assertEqual(location_key('Viña del Mar, Chile'), 'cl-vina-del-mar')
+        self.assertEqual(location_key('Valparaíso'), location_key('VALPARAISO'))
+
+    def test_unknown_location_keeps_normalized_text(self):
+        self.assertEqual(location_key('Lima, Perú'), 'lima peru')
+
+    def test_index_extends_with_new_cities(self):
+        index = LocationIndex([Region('pe-lima', 'Lima', 'Perú', 'Lima,PE', ('lima metropolitana',))])
+        self.assertEqual(index.location_key('Lima, Perú'), 'pe-lima')
+        self.assertEqual(index.location_key('Lima Metropolitana'), 'pe-lima')
+
+    def test_key_is_stored_on_user_and_garden(self):
+        user = User.objects.create_user(
+            username='loc', email='loc@test.com', password='locpass123', location='Stgo'
+        )
+        garden = Garden.objects.create(
+            owner=user, name='Huerto', location='La Serena, Chile', size_m2=5.0,
+            soil_type='loamy', sun_exposure='full_sun'
+        )
+        user.refresh_from_db()
+        garden.refresh_from_db()
+        self.assertEqual(user.location_key, 'cl-santiago')
+        self.assertEqual(garden.location_key, 'cl-la-serena')
+
+
+class DashboardQueryTest(TestCase):
+    """Tests del número de consultas del dashboard"""
+
+    def setUp(self):
+        caches['dashboard'].clear()
+        weather_cache.clear()
+        self.user = User.objects.create_user(
+            username='dash', email='dash@test.com', password='dashpass123', location='Santiago'
+        )
+        self.plant = Plant.objects.create(
+            name='Tomate', description='Tomate', difficulty='medium', planting_season='spring',
+            harvest_time_days=90, space_required=1.0, water_frequency=2
+        )
+        self.client.force_login(self.user)
+
+    def add_garden(self, name, active_plans):
+        garden = Garden.objects.create(
+            owner=self.user, name=name, location='Santiago', size_m2=5.0,
+            soil_type='loamy', sun_exposure='full_sun'
+        )
+        for status in ['active'] * active_plans + ['completed']:
+            CultivationPlan.objects.create(
+                garden=garden, plant=self.plant, status=status,
+                planting_date='2026-01-01', expected_harvest_date='2026-04-01'
+            )
+        return garden
+
+    def test_query_count_does_not_grow_with_gardens(self):
+        self.add_garden('Huerto 1', active_plans=2)
+        self.client.get(reverse('dashboard'))
+        caches['dashboard'].clear()
+
+        # Sesión + usuario + jardines con conteos + riegos + plantas
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['total_gardens'], 1)
+        self.assertEqual(response.context['active_plans'], 2)
+
+        for i in range(2, 6):
+            self.add_garden(f'Huerto {i}', active_plans=1)
+        caches['dashboard'].clear()
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['total_gardens'], 5)
+        self.assertEqual(response.context['active_plans'], 6)
+        self.assertContains(response, 'Franco')
+
+    def test_warm_render_is_one_cache_read(self):
+        self.add_garden('Huerto 1', active_plans=1)
+        self.client.get(reverse('dashboard'))
+
+        dashboard_cache = caches['dashboard']
+        with mock.patch.object(dashboard_cache, 'get_many', wraps=dashboard_cache.get_many) as get_many, \
+                mock.patch.object(dashboard_cache, 'set_many') as set_many:
+            # Solo sesión y usuario
+            with self.assertNumQueries(2):
+                response = self.client.get(reverse('dashboard'))
+        self.assertEqual(get_many.call_count, 1)
+        set_many.assert_not_called()
+        self.assertEqual(response.context['active_plans'], 1)
+
+    def test_garden_change_invalidates_only_its_parts(self):
+        self.client.get(reverse('dashboard'))
+        self.add_garden('Huerto nuevo', active_plans=1)
+
+        dashboard_cache = caches['dashboard']
+        self.assertIsNone(dashboard_cache.get(f'dashboard:{self.user.pk}:gardens'))
+        self.assertIsNotNone(dashboard_cache.get(f'dashboard:{self.user.pk}:weather'))
+
+        response = self.client.get(reverse('dashboard'))
+        self.assertEqual(response.context['total_gardens'], 1)
+        self.assertEqual(response.context['active_plans'], 1)
+
+
+class SiteCountersTest(TestCase):
+    """Tests de los contadores de la portada"""
+
+    def test_counters_follow_creates_and_deletes(self):
+        before = get_counters()
+        user = User.objects.create_user(
+            username='count', email='count@test.com', password='countpass123'
+        )
+        garden = Garden.objects.create(
+            owner=user, name='Huerto', location='Santiago', size_m2=5.0,
+            soil_type='loamy', sun_exposure='full_sun'
+        )
+        Garden.objects.create(
+            owner=user, name='Balcón', location='Santiago', size_m2=2.0,
+            soil_type='sandy', sun_exposure='shade'
+        )
+        garden.name = 'Huerto grande'
+        garden.save()
+
+        counters = get_counters()
+        self.assertEqual(counters.total_users, before.total_users + 1)
+        self.assertEqual(counters.total_gardens, before.total_gardens + 2)
+
+        # Borrar el usuario borra sus jardines en cascada
+        user.delete()
+        counters = get_counters()
+        self.assertEqual(counters.total_users, before.total_users)
+        self.assertEqual(counters.total_gardens, before.total_gardens)
+
+    def test_reconcile_fixes_drift(self):
+        SiteCounters.objects.filter(pk=1).update(total_plants=999)
+        output = StringIO()
+        call_command('reconcile_counters', stdout=output)
+        self.assertIn('total_plants: 999 -> 0', output.getvalue())
+        self.assertEqual(get_counters().total_plants, 0)
+
+    def test_home_reads_one_row(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('home'))
+        self.assertEqual(response.status_code, 200)
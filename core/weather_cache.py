@@ -0,0 +1,108 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+# Alias en settings.CACHES: caché en archivos compartida entre procesos; el TTL va por entrada.
+# Al llenarse, FileBasedCache borra entradas al azar (no es LRU)
+CACHE_ALIAS = 'weather'
+# Nivel LRU por proceso delante de la compartida: guarda solo entradas frescas
+LOCAL_CACHE_ALIAS = 'weather_local'
+
+# Tiempo máximo que una clave queda marcada como "refrescando"
+REFRESH_LOCK_SECONDS = 30
+
+# Los refrescos de entradas vencidas corren fuera del request
+_refresh_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='weather-refresh')
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def get_local_cache():
+    return caches[LOCAL_CACHE_ALIAS]
+
+
+def clear():
+    get_local_cache().clear()
+    get_cache().clear()
+
+
+def weather_key(kind: str, location_key: str) -> str:
+    return f'weather:{kind}:{location_key}'
+
+
+def store(key: str, value, ttl: int):
+    """
+    Guarda el valor como fresco durante `ttl` segundos; después se sigue sirviendo
+    como vencido por WEATHER_STALE_SECONDS mientras se refresca
+    """
+    entry = (time.time() + ttl, value)
+    get_cache().set(key, entry, timeout=ttl + settings.WEATHER_STALE_SECONDS)
+    get_local_cache().set(key, entry, timeout=ttl)
+
+
+def is_fresh(key: str) -> bool:
+    entry = get_cache().get(key)
+    return entry is not None and time.time() < entry[0]
+
+
+def fresh_until(keys) -> float:
+    """
+    Momento (epoch) en que vence la primera de las entradas; 0 si falta alguna
+    """
+    keys = list(keys)
+    entries = get_cache().get_many(keys)
+    if len(entries) < len(keys):
+        return 0.0
+    return min(entry[0] for entry in entries.values())
+
+
+def get_or_fetch(key: str, fetch, ttl: int):
+    """
+    Stale-while-revalidate: una entrada vencida se devuelve de inmediato y se
+    refresca en segundo plano; solo una ausencia total espera a `fetch`
+    """
+    local = get_local_cache()
+    entry = local.get(key)
+    if entry is not None:
+        return entry[1]
+
+    entry = get_cache().get(key)
+    if entry is not None:
+        fresh_until, value = entry
+        remaining = fresh_until - time.time()
+        if remaining > 0:
+            # El nivel local la guarda solo mientras sigue fresca
+            local.set(key, entry, timeout=remaining)
+        else:
+            schedule_refresh(key, fetch, ttl)
+        return value
+
+    value = fetch()
+    store(key, value, ttl)
+    return value
+
+
+def schedule_refresh(key: str, fetch, ttl: int) -> bool:
+    """
+    Encola el refresco de una clave; cache.add evita refrescos duplicados en vuelo
+    """
+    if not get_cache().add(f'{key}:refreshing', 1, timeout=REFRESH_LOCK_SECONDS):
+        return False
+    _refresh_pool.submit(_refresh, key, fetch, ttl)
+    return True
+
+
+def _refresh(key: str, fetch, ttl: int):
+    try:
+        store(key, fetch(), ttl)
+    except Exception as e:
+        # Se sigue sirviendo el valor vencido hasta que el refresco funcione
+        logger.warning(f"No se pudo refrescar {key}: {e}")
+    finally:
+        get_cache().delete(f'{key}:refreshing')
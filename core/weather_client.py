@@ -0,0 +1,234 @@
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+import requests
+from requests.adapters import HTTPAdapter
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class WeatherUnavailable(Exception):
+    """
+    El proveedor de clima no respondió (o el circuito está abierto)
+    """
+
+
+class CircuitOpen(WeatherUnavailable):
+    pass
+
+
+class CircuitBreaker:
+    """
+    Tras `failure_threshold` fallos seguidos deja de llamar al proveedor durante
+    `reset_timeout` segundos; luego permite una llamada de prueba (half-open)
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half_open'
+        return 'open'
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half_open' and not self._probing:
+                # Solo una llamada de prueba a la vez
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.reset()
+
+    def record_failure(self):
+        with self._lock:
+            self._probing = False
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+
+
+_session = None
+_breaker = None
+_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """
+    Sesión HTTP compartida por el proceso (reutiliza conexiones keep-alive)
+    """
+    global _session
+    with _lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=settings.WEATHER_POOL_SIZE,
+                max_retries=0,
+            )
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+    return _session
+
+
+def get_breaker() -> CircuitBreaker:
+    """
+    Circuito del proveedor, uno por proceso y compartido por todos los WeatherService
+    """
+    global _breaker
+    with _lock:
+        if _breaker is None:
+            _breaker = CircuitBreaker(
+                settings.WEATHER_BREAKER_THRESHOLD, settings.WEATHER_BREAKER_RESET_SECONDS
+            )
+    return _breaker
+
+
+# Códigos de icono de OpenWeatherMap (sin sufijo día/noche) a los iconos de la app
+ICON_CODES = {
+    '01': 'sunny',
+    '02': 'partly_cloudy',
+    '03': 'cloudy',
+    '04': 'cloudy',
+    '09': 'rainy',
+    '10': 'rainy',
+    '11': 'stormy',
+    '13': 'snow',
+    '50': 'cloudy',
+}
+
+
+class OpenWeatherClient:
+    """
+    Cliente de OpenWeatherMap con timeouts estrictos, reintentos con jitter y
+    circuit breaker
+    """
+
+    # Respuestas que vale la pena reintentar
+    RETRY_STATUS = {429, 500, 502, 503, 504}
+    # Errores propios de la consulta (p. ej. ciudad desconocida): el proveedor sí respondió
+    QUERY_ERROR_STATUS = {400, 404}
+
+    def __init__(self, api_key: str, base_url: str, session: requests.Session = None,
+                 circuit: CircuitBreaker = None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.session = session or get_session()
+        self.circuit = circuit or get_breaker()
+        self.timeout = (settings.WEATHER_CONNECT_TIMEOUT, settings.WEATHER_READ_TIMEOUT)
+        self.max_retries = settings.WEATHER_MAX_RETRIES
+        self.backoff = settings.WEATHER_RETRY_BACKOFF
+
+    def current(self, location: str) -> dict:
+        data = self._get('weather', location)
+        weather = data['weather'][0]
+        return {
+            'location': location,
+            'temperature': round(data['main']['temp']),
+            'description': weather['description'].capitalize(),
+            'humidity': data['main']['humidity'],
+            'wind_speed': round(data['wind']['speed'] * 3.6),
+            'icon': ICON_CODES.get(weather['icon'][:2], 'partly_cloudy'),
+            'last_updated': datetime.now().strftime("%H:%M"),
+        }
+
+    def forecast(self, location: str) -> list:
+        """
+        Agrupa el pronóstico cada 3 horas por día (el plan gratuito cubre 5 días)
+        """
+        data = self._get('forecast', location)
+        days = defaultdict(list)
+        for entry in data['list']:
+            days[datetime.fromtimestamp(entry['dt']).date()].append(entry)
+
+        forecast = []
+        for day in sorted(days):
+            entries = days[day]
+            # Descripción del tramo más cercano al mediodía
+            midday = min(entries, key=lambda entry: abs(datetime.fromtimestamp(entry['dt']).hour - 12))
+            weather = midday['weather'][0]
+            forecast.append({
+                'date': day.strftime("%Y-%m-%d"),
+                'day_name': day.strftime("%A"),
+                'day_short': day.strftime("%a"),
+                'max_temp': round(max(entry['main']['temp_max'] for entry in entries)),
+                'min_temp': round(min(entry['main']['temp_min'] for entry in entries)),
+                'description': weather['description'].capitalize(),
+                'icon': ICON_CODES.get(weather['icon'][:2], 'partly_cloudy'),
+            })
+        return forecast[:7]
+
+    def _get(self, endpoint: str, location: str) -> dict:
+        if not self.circuit.allow_request():
+            raise CircuitOpen('Circuito abierto para el proveedor de clima')
+
+        params = {'q': location, 'appid': self.api_key, 'units': 'metric', 'lang': 'es'}
+        try:
+            return self._request(endpoint, params)
+        except WeatherUnavailable:
+            raise
+        except Exception:
+            # Error inesperado: cuenta como fallo para no dejar tomada la llamada de prueba
+            self.circuit.record_failure()
+            raise
+
+    def _request(self, endpoint: str, params: dict) -> dict:
+        url = f'{self.base_url}/{endpoint}'
+        last_error = None
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                # Backoff exponencial con jitter completo
+                time.sleep(random.uniform(0, self.backoff * 2 ** (attempt - 1)))
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+            except requests.RequestException as e:
+                # Conexión, timeout, respuesta cortada (ChunkedEncodingError), etc.
+                last_error = e
+                continue
+
+            if response.status_code in self.RETRY_STATUS:
+                last_error = WeatherUnavailable(f'{endpoint}: HTTP {response.status_code}')
+                continue
+            if response.status_code in self.QUERY_ERROR_STATUS:
+                self.circuit.record_success()
+                raise WeatherUnavailable(f'{endpoint}: HTTP {response.status_code}')
+            if response.status_code != 200:
+                # 401/403 y demás: reintentar no ayuda, pero el proveedor no es usable
+                self.circuit.record_failure()
+                logger.warning(f"Proveedor de clima rechazó la consulta ({endpoint}): HTTP {response.status_code}")
+                raise WeatherUnavailable(f'{endpoint}: HTTP {response.status_code}')
+
+            try:
+                data = response.json()
+            except ValueError as e:
+                last_error = e
+                continue
+            self.circuit.record_success()
+            return data
+
+        self.circuit.record_failure()
+        logger.warning(f"Proveedor de clima no disponible ({endpoint}): {last_error}")
+        raise WeatherUnavailable(str(last_error))
@@ -0,0 +1,94 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from gardens.models import Garden
+from . import weather_cache
+from .locations import location_key
+from .weather_service import WeatherService
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+def distinct_locations() -> dict:
+    """
+    Ubicaciones de usuarios y jardines, una por región (location_key ya resuelto)
+    """
+    locations = {}
+    for queryset in (User.objects.all(), Garden.objects.all()):
+        values = queryset.exclude(location='').values_list('location_key', 'location').distinct()
+        for key, location in values.iterator(chunk_size=2000):
+            locations.setdefault(key or location_key(location), location)
+    locations.pop('', None)
+    return locations
+
+
+class RateLimiter:
+    """
+    Token bucket: como máximo `rate` solicitudes por segundo, con ráfagas de hasta `burst`
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+async def prefetch_locations(locations: dict, concurrency: int = 10, rate: float = 10.0,
+                             force: bool = False, service: WeatherService = None) -> dict:
+    """
+    Consulta clima actual y pronóstico de cada ubicación y los deja en la caché.
+    `locations` es {clave normalizada: ubicación}. El cliente HTTP es bloqueante,
+    así que cada consulta corre en un pool de `concurrency` hilos.
+    """
+    service = service or WeatherService()
+    limiter = RateLimiter(rate, burst=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+    stats = {'fetched': 0, 'skipped': 0, 'failed': 0}
+
+    jobs = (
+        ('current', service._fetch_current_weather, settings.WEATHER_CURRENT_TTL),
+        ('forecast', service._fetch_forecast, settings.WEATHER_FORECAST_TTL),
+    )
+
+    async def fetch(executor, location_key, location, kind, fetcher, ttl):
+        key = weather_cache.weather_key(kind, location_key)
+        if not force and weather_cache.is_fresh(key):
+            stats['skipped'] += 1
+            return
+        async with semaphore:
+            await limiter.acquire()
+            try:
+                value = await loop.run_in_executor(executor, fetcher, location)
+            except Exception as e:
+                logger.warning(f"Prefetch de clima fallido para {location} ({kind}): {e}")
+                stats['failed'] += 1
+                return
+        weather_cache.store(key, value, ttl)
+        stats['fetched'] += 1
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='weather-prefetch') as executor:
+        await asyncio.gather(*(
+            fetch(executor, location_key, location, kind, fetcher, ttl)
+            for location_key, location in locations.items()
+            for kind, fetcher, ttl in jobs
+        ))
+    return stats
@@ -1,24 +1,51 @@
-from django.contrib import admin
-from .models import Plant, Garden, CultivationPlan
-
-@admin.register(Plant)
-class PlantAdmin(admin.ModelAdmin):
-    list_display = ('name', 'scientific_name', 'difficulty', 'planting_season', 'harvest_time_days')
-    list_filter = ('difficulty', 'planting_season')
-    search_fields = ('name', 'scientific_name')
-    ordering = ('name',)
-
-@admin.register(Garden) 
-class GardenAdmin(admin.ModelAdmin):
-    list_display = ('name', 'owner', 'size_m2', 'soil_type', 'sun_exposure', 'created_at')
-    list_filter = ('soil_type', 'sun_exposure', 'has_irrigation')
-    search_fields = ('name', 'owner__username', 'location')
-    raw_id_fields = ('owner',)
-
-@admin.register(CultivationPlan)
-class CultivationPlanAdmin(admin.ModelAdmin):
-    list_display = ('garden', 'plant', 'status', 'planting_date', 'expected_harvest_date')
-    list_filter = ('status', 'planting_date')
-    search_fields = ('garden__name', 'plant__name')
-    raw_id_fields = ('garden', 'plant')
-    date_hierarchy = 'planting_date'
\ No newline at end of file
+from django.contrib import admin
+from .export import GARDEN_EXPORT_FIELDS, PLAN_EXPORT_FIELDS, export_response
+from .models import Plant, Garden, CultivationPlan, WateringSchedule
+
+
+def export_action(fields, filename, export_format):
+    """
+    Acción de admin que descarga en streaming los registros seleccionados
+    """
+    def export(modeladmin, request, queryset):
+        return export_response(queryset.order_by('id'), fields, export_format, filename)
+
+    export.__name__ = f'export_{export_format}'
+    export.short_description = f'Exportar seleccionados ({export_format.upper()})'
+    return export
+
+@admin.register(Plant)
+class PlantAdmin(admin.ModelAdmin):
+    list_display = ('name', 'scientific_name', 'difficulty', 'planting_season', 'harvest_time_days')
+    list_filter = ('difficulty', 'planting_season')
+    search_fields = ('name', 'scientific_name')
+    ordering = ('name',)
+
+@admin.register(Garden) 
+class GardenAdmin(admin.ModelAdmin):
+    list_display = ('name', 'owner', 'size_m2', 'soil_type', 'sun_exposure', 'created_at')
+    list_filter = ('soil_type', 'sun_exposure', 'has_irrigation')
+    search_fields = ('name', 'owner__username', 'location')
+    raw_id_fields = ('owner',)
+    actions = [
+        export_action(GARDEN_EXPORT_FIELDS, 'jardines', 'csv'),
+        export_action(GARDEN_EXPORT_FIELDS, 'jardines', 'ndjson'),
+    ]
+
+@admin.register(CultivationPlan)
+class CultivationPlanAdmin(admin.ModelAdmin):
+    list_display = ('garden', 'plant', 'status', 'planting_date', 'expected_harvest_date')
+    list_filter = ('status', 'planting_date')
+    search_fields = ('garden__name', 'plant__name')
+    raw_id_fields = ('garden', 'plant')
+    date_hierarchy = 'planting_date'
+    actions = [
+        export_action(PLAN_EXPORT_FIELDS, 'planes', 'csv'),
+        export_action(PLAN_EXPORT_FIELDS, 'planes', 'ndjson'),
+    ]
+
+@admin.register(WateringSchedule)
+class WateringScheduleAdmin(admin.ModelAdmin):
+    list_display = ('plan', 'next_watering_date', 'method', 'rain_delay_days', 'location_key', 'computed_at')
+    list_filter = ('method', 'next_watering_date')
+    raw_id_fields = ('plan',)
@@ -1,6 +1,9 @@
-from django.apps import AppConfig
-
-
-class GardensConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'gardens'
+from django.apps import AppConfig
+
+
+class GardensConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'gardens'
+
+    def ready(self):
+        from . import signals  # noqa: F401
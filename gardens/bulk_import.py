@@ -0,0 +1,304 @@
+import csv
+import json
+from itertools import islice
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from core import counters, dashboard
+from core.locations import location_key
+from .catalog import bump_catalog_version
+from .models import Garden, Plant
+
+User = get_user_model()
+
+IMPORT_BATCH_SIZE = 1000
+
+IMPORT_FORMATS = ('csv', 'json', 'ndjson')
+
+# Columnas aceptadas; las demás se ignoran
+PLANT_IMPORT_FIELDS = ('name', 'scientific_name', 'description', 'difficulty', 'planting_season',
+                       'harvest_time_days', 'space_required', 'water_frequency')
+GARDEN_IMPORT_FIELDS = ('name', 'location', 'size_m2', 'soil_type', 'sun_exposure',
+                        'has_irrigation', 'notes')
+
+# Columnas que se pueden actualizar cuando la fila ya existe; solo se escriben
+# las que trae cada fila, así una columna ausente no borra el valor guardado
+PLANT_UPDATE_FIELDS = [field for field in PLANT_IMPORT_FIELDS if field != 'name']
+GARDEN_UPDATE_FIELDS = list(GARDEN_IMPORT_FIELDS)
+
+
+class ImportReport:
+    """
+    Resultado de una importación: filas creadas, actualizadas y errores por fila
+    (número de fila empezando en 1, sin contar el encabezado)
+    """
+
+    def __init__(self):
+        self.created = 0
+        self.updated = 0
+        self.errors = []
+
+    def add_error(self, row_number: int, errors):
+        self.errors.append({'row': row_number, 'errors': errors})
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def to_dict(self) -> dict:
+        return {'created': self.created, 'updated': self.updated, 'errors': self.errors}
+
+
+class UnreadableRow:
+    """
+    Fila que no se pudo leer (JSON o CSV mal formado); queda como error en el reporte
+    """
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+def _read_lines(lines, parse):
+    """
+    Fila por línea; un error de formato marca esa fila y se sigue con la siguiente.
+    Un error de codificación corta la lectura: el texto que sigue no es confiable.
+    """
+    lines = iter(lines)
+    while True:
+        try:
+            line = next(lines)
+        except StopIteration:
+            return
+        except UnicodeDecodeError as e:
+            yield UnreadableRow(f'Texto no válido en UTF-8; se detuvo la lectura: {e}')
+            return
+        except csv.Error as e:
+            yield UnreadableRow(f'CSV inválido: {e}')
+            continue
+        try:
+            yield parse(line)
+        except ValueError as e:
+            yield UnreadableRow(f'JSON inválido: {e}')
+
+
+def read_rows(stream, import_format: str):
+    """
+    Filas (dicts) de un archivo de texto CSV, JSON (lista) o NDJSON. El CSV y
+    el NDJSON se leen de a una línea; las líneas ilegibles llegan como
+    UnreadableRow para que el reporte las liste sin cortar la importación.
+    """
+    if import_format not in IMPORT_FORMATS:
+        raise ValueError(f'Formato de importación desconocido: {import_format}')
+
+    if import_format == 'csv':
+        return _read_lines(csv.DictReader(stream), lambda row: row)
+    if import_format == 'ndjson':
+        return _read_lines((line for line in stream if line.strip()), json.loads)
+    rows = json.load(stream)
+    if not isinstance(rows, list):
+        raise ValueError('El JSON debe ser una lista de objetos')
+    return iter(rows)
+
+
+def batches(rows, size: int):
+    """
+    (número de la primera fila, lista de filas) por tanda
+    """
+    rows = iter(rows)
+    first = 1
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield first, batch
+        first += len(batch)
+
+
+def _clean(instance, exclude=()):
+    """
+    Validación de campos en memoria, sin consultas (las restricciones únicas
+    las resuelve el upsert)
+    """
+    try:
+        instance.full_clean(exclude=['image', *exclude], validate_unique=False, validate_constraints=False)
+    except ValidationError as e:
+        return e.message_dict
+    return None
+
+
+def _pick(row: dict, fields) -> dict:
+    return {field: row[field] for field in fields if row.get(field) not in (None, '')}
+
+
+def _row_errors(row):
+    """
+    Errores de una fila que no es un objeto legible, o None
+    """
+    if isinstance(row, UnreadableRow):
+        return {'__all__': [row.message]}
+    if not isinstance(row, dict):
+        return {'__all__': ['La fila debe ser un objeto']}
+    return None
+
+
+def _by_update_fields(items):
+    """
+    {(columnas a actualizar): [instancias]} para un upsert por grupo
+    """
+    groups = {}
+    for instance, fields in items:
+        groups.setdefault(tuple(fields), []).append(instance)
+    return groups
+
+
+def _validate_plants(first, batch, report):
+    """
+    [(planta, columnas presentes a actualizar)] de las filas válidas
+    """
+    plants = {}
+    for number, row in enumerate(batch, start=first):
+        errors = _row_errors(row)
+        if errors:
+            report.add_error(number, errors)
+            continue
+        values = _pick(row, PLANT_IMPORT_FIELDS)
+        plant = Plant(**values)
+        errors = _clean(plant)
+        if errors:
+            report.add_error(number, errors)
+        elif plant.name in plants:
+            report.add_error(number, {'name': [f'Nombre repetido en la fila {plants[plant.name][0]}']})
+        else:
+            fields = [field for field in PLANT_UPDATE_FIELDS if field in values]
+            plants[plant.name] = (number, plant, fields)
+    return [(plant, fields) for _, plant, fields in plants.values()]
+
+
+def import_plants(rows, batch_size: int = IMPORT_BATCH_SIZE, update_existing: bool = True) -> ImportReport:
+    """
+    Carga o actualiza plantas por nombre, una transacción por tanda: valida la
+    tanda en memoria y la escribe con un solo upsert (bulk_create con
+    update_conflicts). Las filas inválidas quedan en el reporte y no detienen
+    la importación. Con `update_existing=False` las plantas existentes no se tocan.
+    """
+    report = ImportReport()
+    for first, batch in batches(rows, batch_size):
+        plants = _validate_plants(first, batch, report)
+        if not plants:
+            continue
+
+        with transaction.atomic():
+            names = [plant.name for plant, _ in plants]
+            existing = set(Plant.objects.filter(name__in=names).values_list('name', flat=True))
+            for fields, group in _by_update_fields(plants).items():
+                if update_existing and fields:
+                    Plant.objects.bulk_create(
+                        group,
+                        update_conflicts=True,
+                        unique_fields=['name'],
+                        update_fields=list(fields),
+                    )
+                else:
+                    Plant.objects.bulk_create(group, ignore_conflicts=True)
+            if update_existing:
+                report.updated += len(existing)
+            report.created += len(plants) - len(existing)
+            # bulk_create no envía señales: la versión sube en la misma transacción
+            bump_catalog_version()
+
+    if report.created or report.updated:
+        transaction.on_commit(_plants_imported)
+    return report
+
+
+def _plants_imported():
+    dashboard.invalidate_recent_plants()
+    counters.reconcile()
+
+
+def _validate_gardens(first, batch, owners, report):
+    """
+    [(jardín, columnas presentes a actualizar)] de las filas válidas
+    """
+    gardens = []
+    for number, row in enumerate(batch, start=first):
+        errors = _row_errors(row)
+        if errors:
+            report.add_error(number, errors)
+            continue
+        values = _pick(row, GARDEN_IMPORT_FIELDS)
+        garden = Garden(**values)
+        if row.get('id') not in (None, ''):
+            try:
+                garden.pk = int(row['id'])
+            except (TypeError, ValueError):
+                report.add_error(number, {'id': ['Debe ser un número entero']})
+                continue
+
+        errors = _clean(garden, exclude=['owner']) or {}
+        owner_id = owners.get(row.get('owner'))
+        if owner_id is None:
+            errors['owner'] = [f"Usuario desconocido: {row.get('owner')!r}"]
+        if errors:
+            report.add_error(number, errors)
+            continue
+
+        garden.owner_id = owner_id
+        # bulk_create no pasa por la señal pre_save que resuelve la región
+        garden.location_key = location_key(garden.location)
+        fields = ['owner', *(field for field in GARDEN_UPDATE_FIELDS if field in values)]
+        if 'location' in values:
+            fields.append('location_key')
+        gardens.append((garden, [*fields, 'updated_at']))
+    return gardens
+
+
+def import_gardens(rows, batch_size: int = IMPORT_BATCH_SIZE) -> ImportReport:
+    """
+    Carga jardines por tandas. El dueño va por nombre de usuario (una consulta
+    por tanda); las filas con `id` actualizan ese jardín o lo crean con ese id
+    mediante un upsert, las demás se crean.
+    """
+    report = ImportReport()
+    owner_ids = set()
+    for first, batch in batches(rows, batch_size):
+        usernames = {row.get('owner') for row in batch if isinstance(row, dict)}
+        owners = dict(User.objects.filter(username__in=usernames).values_list('username', 'id'))
+        gardens = _validate_gardens(first, batch, owners, report)
+        if not gardens:
+            continue
+
+        keyed = [(garden, fields) for garden, fields in gardens if garden.pk is not None]
+        new = [garden for garden, _ in gardens if garden.pk is None]
+        with transaction.atomic():
+            if keyed:
+                existing = Garden.objects.filter(pk__in=[garden.pk for garden, _ in keyed]).count()
+                for fields, group in _by_update_fields(keyed).items():
+                    Garden.objects.bulk_create(
+                        group,
+                        update_conflicts=True,
+                        unique_fields=['id'],
+                        update_fields=list(fields),
+                    )
+                report.updated += existing
+                report.created += len(keyed) - existing
+            if new:
+                Garden.objects.bulk_create(new)
+                report.created += len(new)
+        owner_ids.update(garden.owner_id for garden, _ in gardens)
+
+    if owner_ids:
+        transaction.on_commit(lambda: _gardens_imported(owner_ids))
+    return report
+
+
+def _gardens_imported(owner_ids):
+    counters.reconcile()
+    for owner_id in owner_ids:
+        dashboard.invalidate_user(owner_id, ['gardens', 'waterings'])
+
+
+IMPORTERS = {
+    'plants': import_plants,
+    'gardens': import_gardens,
+}
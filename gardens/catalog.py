@@ -0,0 +1,78 @@
+import time
+from django.db import transaction
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from .models import CatalogVersion
+
+CATALOG_ROW = 1
+
+
+def _create_state():
+    # Sembrar con el reloj para no repetir versiones (ni nombres de snapshot) si la BD se recrea
+    row, _ = CatalogVersion.objects.get_or_create(
+        pk=CATALOG_ROW, defaults={'version': time.time_ns(), 'modified_at': timezone.now()}
+    )
+    return row.version, row.modified_at
+
+
+def get_catalog_state():
+    """
+    (versión, momento de la última escritura) del catálogo de plantas.
+    Vive en una fila de la BD, compartida por todos los procesos (workers,
+    comandos de gestión, hijos de precompute).
+    """
+    state = CatalogVersion.objects.filter(pk=CATALOG_ROW).values_list('version', 'modified_at').first()
+    return state or _create_state()
+
+
+def get_catalog_version() -> int:
+    """
+    Versión actual del catálogo de plantas; cambia con cada escritura en Plant
+    """
+    return get_catalog_state()[0]
+
+
+def get_catalog_modified():
+    return get_catalog_state()[1]
+
+
+def bump_catalog_version():
+    """
+    Avanza la versión del catálogo en la misma transacción que la escritura en
+    Plant: si esta se revierte, la versión también. La nueva versión sale del
+    reloj, así una versión revertida no vuelve a usarse para otro contenido.
+    Devuelve (versión anterior, versión nueva).
+    """
+    with transaction.atomic():
+        # En un UPDATE las expresiones leen los valores previos de la fila
+        updated = CatalogVersion.objects.filter(pk=CATALOG_ROW).update(
+            previous_version=F('version'),
+            version=Greatest(F('version') + 1, Value(time.time_ns())),
+            modified_at=timezone.now(),
+        )
+        if not updated:
+            version = _create_state()[0]
+            return version, version
+        return CatalogVersion.objects.values_list('previous_version', 'version').get(pk=CATALOG_ROW)
+
+
+def request_catalog_state(request):
+    """
+    Estado del catálogo leído una vez por request (ETag y Last-Modified)
+    """
+    state = getattr(request, '_catalog_state', None)
+    if state is None:
+        state = request._catalog_state = get_catalog_state()
+    return state
+
+
+def catalog_etag(request, *parts) -> str:
+    """
+    ETag de una página o recurso del catálogo: cambia con cada escritura en Plant
+    """
+    return '-'.join(['catalog', str(request_catalog_state(request)[0]), *map(str, parts)])
+
+
+def catalog_last_modified(request):
+    return request_catalog_state(request)[1]
@@ -0,0 +1,89 @@
+import csv
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+# Filas leídas de la BD por ronda; la memoria no depende del total exportado
+EXPORT_CHUNK_SIZE = 2000
+
+# Columnas exportadas: nombre en el archivo -> lookup de values_list()
+GARDEN_EXPORT_FIELDS = (
+    ('id', 'id'),
+    ('owner', 'owner__username'),
+    ('name', 'name'),
+    ('location', 'location'),
+    ('location_key', 'location_key'),
+    ('size_m2', 'size_m2'),
+    ('soil_type', 'soil_type'),
+    ('sun_exposure', 'sun_exposure'),
+    ('has_irrigation', 'has_irrigation'),
+    ('notes', 'notes'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+)
+
+PLAN_EXPORT_FIELDS = (
+    ('id', 'id'),
+    ('garden', 'garden_id'),
+    ('garden_name', 'garden__name'),
+    ('plant', 'plant_id'),
+    ('plant_name', 'plant__name'),
+    ('status', 'status'),
+    ('planting_date', 'planting_date'),
+    ('expected_harvest_date', 'expected_harvest_date'),
+    ('actual_harvest_date', 'actual_harvest_date'),
+    ('notes', 'notes'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+)
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class Echo:
+    """
+    "Archivo" cuyo write devuelve la línea en vez de guardarla, para csv.writer
+    """
+
+    def write(self, value):
+        return value
+
+
+def ndjson_lines(rows, names):
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(dict(zip(names, row))) + '\n'
+
+
+def csv_lines(rows, names):
+    writer = csv.writer(Echo())
+    yield writer.writerow(names)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def export_rows(queryset, fields, chunk_size: int = EXPORT_CHUNK_SIZE):
+    """
+    Tuplas de `fields` leídas por tandas con un cursor del servidor
+    """
+    return queryset.values_list(*[lookup for _, lookup in fields]).iterator(chunk_size=chunk_size)
+
+
+def export_response(queryset, fields, export_format: str, filename: str,
+                    chunk_size: int = EXPORT_CHUNK_SIZE) -> StreamingHttpResponse:
+    """
+    Respuesta que escribe el export fila a fila en NDJSON o CSV, sin armar
+    la lista completa en memoria
+    """
+    if export_format not in CONTENT_TYPES:
+        raise ValueError(f'Formato de exportación desconocido: {export_format}')
+
+    names = [name for name, _ in fields]
+    rows = export_rows(queryset, fields, chunk_size)
+    lines = ndjson_lines(rows, names) if export_format == 'ndjson' else csv_lines(rows, names)
+
+    response = StreamingHttpResponse(lines, content_type=CONTENT_TYPES[export_format])
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    return response
@@ -0,0 +1,85 @@
+from django.db.models import Count, Q
+from .models import Plant
+
+# Tramos de días a cosecha y de espacio requerido
+HARVEST_BUCKETS = (
+    ('short', 'Hasta 60 días', Q(harvest_time_days__lte=60)),
+    ('medium', '61 a 120 días', Q(harvest_time_days__gt=60, harvest_time_days__lte=120)),
+    ('long', 'Más de 120 días', Q(harvest_time_days__gt=120)),
+)
+
+SPACE_BUCKETS = (
+    ('small', 'Hasta 0,25 m²', Q(space_required__lte=0.25)),
+    ('medium', '0,25 a 1 m²', Q(space_required__gt=0.25, space_required__lte=1)),
+    ('large', 'Más de 1 m²', Q(space_required__gt=1)),
+)
+
+FACET_LABELS = {
+    'difficulty': 'Dificultad',
+    'season': 'Temporada',
+    'harvest': 'Cosecha',
+    'space': 'Espacio',
+}
+
+# Facetas del catálogo: nombre -> [(valor, etiqueta, filtro)]
+FACETS = {
+    'difficulty': tuple((code, label, Q(difficulty=code)) for code, label in Plant.DIFFICULTY_LEVELS),
+    'season': tuple((code, label, Q(planting_season=code)) for code, label in Plant.SEASONS),
+    'harvest': HARVEST_BUCKETS,
+    'space': SPACE_BUCKETS,
+}
+
+
+def facet_filter(name: str, value: str):
+    """
+    Filtro de un valor de faceta, o None si la faceta o el valor no existen
+    """
+    for code, _, condition in FACETS.get(name, ()):
+        if code == value:
+            return condition
+    return None
+
+
+def selected_facets(params) -> dict:
+    """
+    Valores de faceta válidos presentes en `params` (GET o query_params)
+    """
+    selected = {}
+    for name in FACETS:
+        value = params.get(name)
+        if value and facet_filter(name, value) is not None:
+            selected[name] = value
+    return selected
+
+
+def apply_facets(queryset, selected: dict):
+    for name, value in selected.items():
+        queryset = queryset.filter(facet_filter(name, value))
+    return queryset
+
+
+def facet_counts(queryset, selected: dict = None) -> dict:
+    """
+    Conteos de todas las facetas en una sola consulta de agregación condicional.
+    `queryset` es la búsqueda sin facetas; el conteo de cada faceta aplica las
+    selecciones de las demás, así se ve cuánto queda al cambiar esa faceta.
+    """
+    selected = selected or {}
+    aggregates = {}
+    for name, values in FACETS.items():
+        others = Q()
+        for other, value in selected.items():
+            if other != name:
+                others &= facet_filter(other, value)
+        for code, _, condition in values:
+            aggregates[f'{name}__{code}'] = Count('id', filter=condition & others)
+
+    totals = queryset.order_by().aggregate(**aggregates)
+    return {
+        name: [
+            {'value': code, 'label': label, 'count': totals[f'{name}__{code}'],
+             'selected': selected.get(name) == code}
+            for code, label, _ in values
+        ]
+        for name, values in FACETS.items()
+    }
@@ -0,0 +1,55 @@
+import json
+import os
+import time
+from django.core.management.base import BaseCommand, CommandError
+from gardens.bulk_import import IMPORTERS, IMPORT_BATCH_SIZE, IMPORT_FORMATS, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Importa plantas o jardines desde CSV, JSON o NDJSON por tandas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=sorted(IMPORTERS), help='Qué se importa')
+        parser.add_argument('path', help='Archivo a importar')
+        parser.add_argument(
+            '--format', choices=IMPORT_FORMATS, default=None,
+            help='Formato del archivo (por defecto, según la extensión)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=IMPORT_BATCH_SIZE,
+            help='Filas por tanda (validación y escritura)'
+        )
+        parser.add_argument(
+            '--report', default=None,
+            help='Guarda el reporte completo (JSON) en este archivo'
+        )
+
+    def handle(self, *args, **options):
+        import_format = options['format'] or os.path.splitext(options['path'])[1].lstrip('.').lower()
+        if import_format not in IMPORT_FORMATS:
+            raise CommandError(f'No se reconoce el formato de {options["path"]}; usa --format')
+
+        started = time.monotonic()
+        try:
+            with open(options['path'], encoding='utf-8-sig', newline='') as stream:
+                report = IMPORTERS[options['model']](
+                    read_rows(stream, import_format), batch_size=max(1, options['batch_size'])
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as f:
+                json.dump(report.to_dict(), f, ensure_ascii=False, indent=2)
+
+        for error in report.errors[:20]:
+            self.stdout.write(self.style.WARNING(f"Fila {error['row']}: {error['errors']}"))
+        if len(report.errors) > 20:
+            self.stdout.write(self.style.WARNING(f'... y {len(report.errors) - 20} filas más con errores'))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{report.created} creados, {report.updated} actualizados, '
+                f'{len(report.errors)} con errores en {time.monotonic() - started:.1f}s'
+            )
+        )
@@ -0,0 +1,183 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import groupby
+from operator import attrgetter
+import django
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from gardens.models import Garden
+from ai_recommendations.ai_service import AIRecommendationService
+from ai_recommendations.models import AIRecommendation, UserFeedback
+
+
+def score_owner_shard(owner_ids, limit):
+    """
+    Genera recomendaciones para todos los jardines de un grupo de usuarios.
+    Se ejecuta dentro de un proceso del pool; devuelve filas planas para persistir.
+    """
+    service = AIRecommendationService()
+    # Todo el grupo se puntúa con la misma versión del catálogo
+    catalog_version = service.catalog_version()
+    gardens = (
+        Garden.objects
+        .filter(owner_id__in=owner_ids)
+        .select_related('owner')
+        .only('id', 'size_m2', 'soil_type', 'sun_exposure', 'has_irrigation', 'owner',
+              'owner__experience_level')
+        .order_by('owner_id', 'id')
+    )
+
+    garden_count = 0
+    rows = []
+    # Los jardines de un mismo usuario se puntúan juntos
+    for _, owner_gardens in groupby(gardens.iterator(chunk_size=1000), key=attrgetter('owner_id')):
+        owner_gardens = list(owner_gardens)
+        owner = owner_gardens[0].owner
+        # Sin caché de resultados: una corrida masiva solo la llenaría de claves que no se leen
+        batch = service.generate_batch_recommendations(owner, owner_gardens, limit=limit, use_cache=False,
+                                                       catalog_version=catalog_version)
+        garden_count += len(owner_gardens)
+        for garden, recommendations in zip(owner_gardens, batch):
+            for rec in recommendations:
+                rows.append((
+                    owner.id,
+                    garden.id,
+                    rec['plant_id'],
+                    rec['plant_name'],
+                    rec['confidence_score'],
+                    '\n'.join(rec['reasons']),
+                ))
+    return owner_ids, garden_count, rows
+
+
+class Command(BaseCommand):
+    help = 'Precalcula recomendaciones IA para todos los jardines'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', type=int, default=os.cpu_count() or 1,
+            help='Procesos del pool (1 = sin pool, en el mismo proceso)'
+        )
+        parser.add_argument(
+            '--shard-size', type=int, default=500,
+            help='Usuarios por tarea enviada al pool'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=1000,
+            help='Filas por bulk_create'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=5,
+            help='Recomendaciones por jardín'
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options['workers'])
+        shard_size = max(1, options['shard_size'])
+        self.batch_size = max(1, options['batch_size'])
+        limit = options['limit']
+
+        self.stdout.write(f'Precalculando recomendaciones con {workers} proceso(s)...')
+
+        shards = self._owner_shards(shard_size)
+        total_gardens = 0
+        total_rows = 0
+
+        if workers == 1:
+            for shard in shards:
+                owner_ids, garden_count, rows = score_owner_shard(shard, limit)
+                total_gardens += garden_count
+                total_rows += self._persist(owner_ids, rows)
+        else:
+            # spawn: cada proceso inicializa Django por su cuenta y abre su propia conexión
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(workers, mp_context=context, initializer=django.setup) as pool:
+                pending = set()
+                for shard in shards:
+                    pending.add(pool.submit(score_owner_shard, shard, limit))
+                    # Mantener acotado el trabajo en vuelo para no cargar todo en memoria
+                    if len(pending) >= workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            owner_ids, garden_count, rows = future.result()
+                            total_gardens += garden_count
+                            total_rows += self._persist(owner_ids, rows)
+                for future in pending:
+                    owner_ids, garden_count, rows = future.result()
+                    total_gardens += garden_count
+                    total_rows += self._persist(owner_ids, rows)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{total_rows} recomendaciones precalculadas para {total_gardens} jardines'
+            )
+        )
+
+    def _owner_shards(self, shard_size):
+        """
+        Recorre los dueños de jardines por rangos de id (keyset), sin cargar la tabla completa
+        """
+        last_owner_id = 0
+        while True:
+            owner_ids = list(
+                Garden.objects
+                .filter(owner_id__gt=last_owner_id)
+                .order_by('owner_id')
+                .values_list('owner_id', flat=True)
+                .distinct()[:shard_size]
+            )
+            if not owner_ids:
+                return
+            yield owner_ids
+            last_owner_id = owner_ids[-1]
+
+    def _persist(self, owner_ids, rows):
+        """
+        Actualiza en su lugar las recomendaciones pendientes precalculadas de los
+        jardines del shard, por (jardín, planta). Las que ya no salen se borran,
+        salvo las que tienen feedback (UserFeedback cae en cascada y es lo que
+        aprende update_recommendation_weights): esas se marcan como descartadas.
+        """
+        with transaction.atomic():
+            existing = {}
+            stale = []
+            current = (
+                AIRecommendation.objects
+                .filter(garden__owner_id__in=owner_ids, plant__isnull=False, status='pending')
+                .order_by('id')
+                .values_list('id', 'garden_id', 'plant_id')
+            )
+            for pk, garden_id, plant_id in current:
+                if (garden_id, plant_id) in existing:
+                    stale.append(pk)
+                else:
+                    existing[garden_id, plant_id] = pk
+
+            to_create, to_update = [], []
+            for user_id, garden_id, plant_id, plant_name, confidence, reasons in rows:
+                recommendation = AIRecommendation(
+                    pk=existing.pop((garden_id, plant_id), None),
+                    user_id=user_id,
+                    garden_id=garden_id,
+                    plant_id=plant_id,
+                    recommendation_type='general',
+                    title=f'Cultivar {plant_name}',
+                    description=reasons,
+                    confidence_score=confidence,
+                )
+                (to_create if recommendation.pk is None else to_update).append(recommendation)
+            stale.extend(existing.values())
+
+            if stale:
+                with_feedback = set(
+                    UserFeedback.objects.filter(recommendation_id__in=stale)
+                    .values_list('recommendation_id', flat=True)
+                )
+                AIRecommendation.objects.filter(pk__in=with_feedback).update(status='dismissed')
+                AIRecommendation.objects.filter(pk__in=set(stale) - with_feedback).delete()
+            AIRecommendation.objects.bulk_update(
+                to_update, ['user', 'title', 'description', 'confidence_score'], batch_size=self.batch_size
+            )
+            AIRecommendation.objects.bulk_create(to_create, batch_size=self.batch_size)
+        return len(rows)
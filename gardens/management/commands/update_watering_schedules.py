@@ -0,0 +1,29 @@
+import time
+from django.core.management.base import BaseCommand
+from gardens.watering import update_watering_schedules
+
+
+class Command(BaseCommand):
+    help = 'Recalcula el próximo riego de todos los planes activos según el pronóstico'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--region', action='append', dest='regions', default=None,
+            help='Solo esta región (location_key); se puede repetir'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=2000,
+            help='Filas por lectura y por bulk_create'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        total = update_watering_schedules(
+            location_keys=options['regions'],
+            batch_size=max(1, options['batch_size']),
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{total} riegos programados en {time.monotonic() - started:.1f}s'
+            )
+        )
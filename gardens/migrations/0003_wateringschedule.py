@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gardens', '0002_garden_location_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WateringSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('next_watering_date', models.DateField()),
+                ('method', models.CharField(choices=[('manual', 'Manual'), ('irrigation', 'Riego automático')], max_length=20)),
+                ('rain_delay_days', models.PositiveIntegerField(default=0)),
+                ('location_key', models.CharField(blank=True, max_length=200)),
+                ('computed_at', models.DateTimeField()),
+                ('plan', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='watering_schedule', to='gardens.cultivationplan')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['next_watering_date'], name='gardens_wat_next_wa_f6072a_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-18 15:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gardens', '0003_wateringschedule'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='garden',
+            index=models.Index(fields=['owner', '-created_at', '-id'], name='garden_owner_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='plant',
+            index=models.Index(fields=['name', 'id'], name='plant_name_id_idx'),
+        ),
+    ]
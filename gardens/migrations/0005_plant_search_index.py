@@ -0,0 +1,23 @@
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from gardens.search import install_search_index
+    install_search_index(schema_editor)
+
+
+def uninstall(apps, schema_editor):
+    from gardens.search import uninstall_search_index
+    uninstall_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gardens', '0004_keyset_indexes'),
+    ]
+
+    # Índice FTS5 con triggers; solo se crea en SQLite
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:08
+
+from django.db import migrations, models
+from django.db.models import Count, F, Min
+
+
+def merge_duplicate_plants(apps, schema_editor):
+    """
+    Antes de la restricción única: por cada nombre repetido se conserva la
+    planta de menor id, las filas que apuntaban a las demás pasan a apuntarle
+    y las repetidas se borran
+    """
+    Plant = apps.get_model('gardens', 'Plant')
+    duplicates = (
+        Plant.objects.values('name')
+        .annotate(keep_id=Min('id'), total=Count('id'))
+        .filter(total__gt=1)
+    )
+    removed = 0
+    for row in duplicates:
+        extra_ids = list(
+            Plant.objects.filter(name=row['name']).exclude(pk=row['keep_id']).values_list('id', flat=True)
+        )
+        # Planes, recomendaciones y cualquier otra FK a Plant
+        for relation in Plant._meta.related_objects:
+            if relation.one_to_many or relation.one_to_one:
+                relation.related_model.objects.filter(
+                    **{f'{relation.field.name}__in': extra_ids}
+                ).update(**{relation.field.name: row['keep_id']})
+        removed += Plant.objects.filter(pk__in=extra_ids).delete()[0]
+
+    if removed:
+        # Los borrados de la migración no pasan por las señales de los contadores
+        apps.get_model('core', 'SiteCounters').objects.filter(pk=1).update(
+            total_plants=F('total_plants') - removed
+        )
+
+
+def reinstall_search_index(apps, schema_editor):
+    # En SQLite AddConstraint rehace gardens_plant y se pierden los triggers del índice FTS5
+    from gardens.search import install_search_index
+    install_search_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gardens', '0005_plant_search_index'),
+        # Modelos con FK a Plant que hay que reapuntar, y los contadores del sitio
+        ('ai_recommendations', '0002_airecommendation_garden_plant'),
+        ('core', '0003_sitecounters'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicate_plants, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='plant',
+            constraint=models.UniqueConstraint(fields=('name',), name='unique_plant_name'),
+        ),
+        migrations.RunPython(reinstall_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:19
+
+import time
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def create_catalog_version(apps, schema_editor):
+    CatalogVersion = apps.get_model('gardens', 'CatalogVersion')
+    CatalogVersion.objects.get_or_create(
+        pk=1, defaults={'version': time.time_ns(), 'modified_at': timezone.now()}
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gardens', '0006_unique_plant_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField()),
+                ('previous_version', models.BigIntegerField(blank=True, null=True)),
+                ('modified_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Versión del catálogo',
+                'verbose_name_plural': 'Versión del catálogo',
+            },
+        ),
+        migrations.RunPython(create_catalog_version, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 4.2.7 on 2026-10-18 16:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('gardens', '0007_catalogversion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlantSearchIndex',
+            fields=[
+                ('plant', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='gardens.plant')),
+                ('document', models.TextField(db_column='gardens_plant_fts')),
+            ],
+            options={
+                'db_table': 'gardens_plant_fts',
+                'managed': False,
+            },
+        ),
+    ]
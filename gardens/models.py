@@ -1,90 +1,169 @@
-from django.db import models
-from django.contrib.auth import get_user_model
-from django.core.validators import MinValueValidator, MaxValueValidator
-
-User = get_user_model()
-
-class Plant(models.Model):
-    DIFFICULTY_LEVELS = [
-        ('easy', 'Fácil'),
-        ('medium', 'Medio'),
-        ('hard', 'Difícil'),
-    ]
-    
-    SEASONS = [
-        ('spring', 'Primavera'),
-        ('summer', 'Verano'),
-        ('autumn', 'Otoño'),
-        ('winter', 'Invierno'),
-        ('all_year', 'Todo el año'),
-    ]
-    
-    name = models.CharField(max_length=100)
-    scientific_name = models.CharField(max_length=150, blank=True)
-    description = models.TextField()
-    difficulty = models.CharField(max_length=10, choices=DIFFICULTY_LEVELS)
-    planting_season = models.CharField(max_length=20, choices=SEASONS)
-    harvest_time_days = models.PositiveIntegerField(
-        help_text="Días desde siembra hasta cosecha"
-    )
-    space_required = models.FloatField(
-        help_text="Espacio requerido en metros cuadrados"
-    )
-    water_frequency = models.PositiveIntegerField(
-        help_text="Frecuencia de riego en días"
-    )
-    image = models.ImageField(upload_to='plants/', blank=True, null=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-    
-    def __str__(self):
-        return f"{self.name} ({self.difficulty})"
-
-class Garden(models.Model):
-    SOIL_TYPES = [
-        ('sandy', 'Arenoso'),
-        ('clay', 'Arcilloso'),
-        ('loamy', 'Franco'),
-        ('rocky', 'Rocoso'),
-    ]
-    
-    EXPOSURE_TYPES = [
-        ('full_sun', 'Sol directo'),
-        ('partial_sun', 'Sol parcial'),
-        ('shade', 'Sombra'),
-    ]
-    
-    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='gardens')
-    name = models.CharField(max_length=100)
-    location = models.CharField(max_length=200)
-    size_m2 = models.FloatField(validators=[MinValueValidator(0.1)])
-    soil_type = models.CharField(max_length=20, choices=SOIL_TYPES)
-    sun_exposure = models.CharField(max_length=20, choices=EXPOSURE_TYPES)
-    has_irrigation = models.BooleanField(default=False)
-    notes = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-    
-    def __str__(self):
-        return f"{self.name} - {self.owner.username}"
-
-class CultivationPlan(models.Model):
-    STATUS_CHOICES = [
-        ('planned', 'Planificado'),
-        ('active', 'Activo'),
-        ('completed', 'Completado'),
-        ('failed', 'Fallido'),
-    ]
-    
-    garden = models.ForeignKey(Garden, on_delete=models.CASCADE)
-    plant = models.ForeignKey(Plant, on_delete=models.CASCADE)
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='planned')
-    planting_date = models.DateField()
-    expected_harvest_date = models.DateField()
-    actual_harvest_date = models.DateField(null=True, blank=True)
-    notes = models.TextField(blank=True)
-    ai_recommendations = models.JSONField(default=dict, blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
-    
-    def __str__(self):
-        return f"{self.garden.name} - {self.plant.name} ({self.status})"
\ No newline at end of file
+from django.db import models
+from django.contrib.auth import get_user_model
+from django.core.validators import MinValueValidator, MaxValueValidator
+
+User = get_user_model()
+
+class Plant(models.Model):
+    DIFFICULTY_LEVELS = [
+        ('easy', 'Fácil'),
+        ('medium', 'Medio'),
+        ('hard', 'Difícil'),
+    ]
+    
+    SEASONS = [
+        ('spring', 'Primavera'),
+        ('summer', 'Verano'),
+        ('autumn', 'Otoño'),
+        ('winter', 'Invierno'),
+        ('all_year', 'Todo el año'),
+    ]
+    
+    name = models.CharField(max_length=100)
+    scientific_name = models.CharField(max_length=150, blank=True)
+    description = models.TextField()
+    difficulty = models.CharField(max_length=10, choices=DIFFICULTY_LEVELS)
+    planting_season = models.CharField(max_length=20, choices=SEASONS)
+    harvest_time_days = models.PositiveIntegerField(
+        help_text="Días desde siembra hasta cosecha"
+    )
+    space_required = models.FloatField(
+        help_text="Espacio requerido en metros cuadrados"
+    )
+    water_frequency = models.PositiveIntegerField(
+        help_text="Frecuencia de riego en días"
+    )
+    image = models.ImageField(upload_to='plants/', blank=True, null=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        indexes = [
+            # Paginación por keyset del catálogo
+            models.Index(fields=['name', 'id'], name='plant_name_id_idx'),
+        ]
+        constraints = [
+            # Clave natural de las importaciones masivas (upsert por nombre)
+            models.UniqueConstraint(fields=['name'], name='unique_plant_name'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} ({self.difficulty})"
+
+class PlantSearchIndex(models.Model):
+    """
+    Tabla FTS5 gardens_plant_fts (solo SQLite), creada y mantenida por
+    gardens.search. El modelo solo existe para unirla a Plant por rowid y
+    rankear con bm25 en la misma consulta; `document` es la columna oculta
+    que lleva el nombre de la tabla (la del MATCH).
+    """
+    plant = models.OneToOneField(
+        Plant, on_delete=models.DO_NOTHING, primary_key=True,
+        db_column='rowid', related_name='search_index', db_constraint=False,
+    )
+    document = models.TextField(db_column='gardens_plant_fts')
+    
+    class Meta:
+        managed = False
+        db_table = 'gardens_plant_fts'
+
+class Garden(models.Model):
+    SOIL_TYPES = [
+        ('sandy', 'Arenoso'),
+        ('clay', 'Arcilloso'),
+        ('loamy', 'Franco'),
+        ('rocky', 'Rocoso'),
+    ]
+    
+    EXPOSURE_TYPES = [
+        ('full_sun', 'Sol directo'),
+        ('partial_sun', 'Sol parcial'),
+        ('shade', 'Sombra'),
+    ]
+    
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='gardens')
+    name = models.CharField(max_length=100)
+    location = models.CharField(max_length=200)
+    # Región canónica de `location` (core.locations), resuelta al guardar
+    location_key = models.CharField(max_length=200, blank=True, editable=False)
+    size_m2 = models.FloatField(validators=[MinValueValidator(0.1)])
+    soil_type = models.CharField(max_length=20, choices=SOIL_TYPES)
+    sun_exposure = models.CharField(max_length=20, choices=EXPOSURE_TYPES)
+    has_irrigation = models.BooleanField(default=False)
+    notes = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            # Paginación por keyset de los jardines de cada usuario
+            models.Index(fields=['owner', '-created_at', '-id'], name='garden_owner_recent_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.name} - {self.owner.username}"
+
+class CultivationPlan(models.Model):
+    STATUS_CHOICES = [
+        ('planned', 'Planificado'),
+        ('active', 'Activo'),
+        ('completed', 'Completado'),
+        ('failed', 'Fallido'),
+    ]
+    
+    garden = models.ForeignKey(Garden, on_delete=models.CASCADE)
+    plant = models.ForeignKey(Plant, on_delete=models.CASCADE)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='planned')
+    planting_date = models.DateField()
+    expected_harvest_date = models.DateField()
+    actual_harvest_date = models.DateField(null=True, blank=True)
+    notes = models.TextField(blank=True)
+    ai_recommendations = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    def __str__(self):
+        return f"{self.garden.name} - {self.plant.name} ({self.status})"
+
+
+class CatalogVersion(models.Model):
+    """
+    Versión del catálogo de plantas en una sola fila (pk=1). Cada escritura en
+    Plant la incrementa; derivan de ella el snapshot, los índices en memoria y
+    los validadores HTTP del catálogo.
+    """
+    version = models.BigIntegerField()
+    previous_version = models.BigIntegerField(null=True, blank=True)
+    modified_at = models.DateTimeField()
+    
+    class Meta:
+        verbose_name = "Versión del catálogo"
+        verbose_name_plural = "Versión del catálogo"
+    
+    def __str__(self):
+        return f"Catálogo v{self.version}"
+
+
+class WateringSchedule(models.Model):
+    """
+    Próximo riego de un plan activo, calculado por gardens.watering
+    """
+    METHODS = [
+        ('manual', 'Manual'),
+        ('irrigation', 'Riego automático'),
+    ]
+    
+    plan = models.OneToOneField(CultivationPlan, on_delete=models.CASCADE, related_name='watering_schedule')
+    next_watering_date = models.DateField()
+    method = models.CharField(max_length=20, choices=METHODS)
+    # Días que la lluvia pronosticada postergó el riego
+    rain_delay_days = models.PositiveIntegerField(default=0)
+    location_key = models.CharField(max_length=200, blank=True)
+    computed_at = models.DateTimeField()
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['next_watering_date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.plan_id} - {self.next_watering_date}"
@@ -0,0 +1,155 @@
+import base64
+import binascii
+import json
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from rest_framework.pagination import CursorPagination
+
+# Orden estable de cada listado; el id desempata para que el cursor sea único
+PLANT_ORDERING = ('name', 'id')
+RECENT_ORDERING = ('-created_at', '-id')
+SEARCH_ORDERING = ('search_rank', 'id')
+
+
+def encode_cursor(values, reverse: bool = False) -> str:
+    payload = json.dumps({'p': values, 'r': int(reverse)}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str):
+    """
+    (valores de la última fila, hacia atrás) o None si el cursor no es válido
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        values, reverse = payload['p'], bool(payload['r'])
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        return None
+    if not isinstance(values, list):
+        return None
+    return values, reverse
+
+
+def _after(ordering, values) -> Q:
+    """
+    Filtro "fila posterior a `values`" en el orden dado:
+    (a > x) OR (a = x AND b > y) ...
+    """
+    condition = Q()
+    for index in reversed(range(len(ordering))):
+        field = ordering[index].lstrip('-')
+        lookup = 'lt' if ordering[index].startswith('-') else 'gt'
+        step = Q(**{f'{field}__{lookup}': values[index]})
+        if index < len(ordering) - 1:
+            step |= Q(**{field: values[index]}) & condition
+        condition = step
+    return condition
+
+
+def _reverse(ordering):
+    return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+
+class KeysetPage:
+    """
+    Página de un listado paginado por keyset; se itera como la página de Paginator
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+
+def keyset_page(queryset, ordering, cursor: str = None, page_size: int = 10) -> KeysetPage:
+    """
+    Página de `queryset` en el orden `ordering` a partir de un cursor opaco.
+    Sin COUNT ni OFFSET: cada página es un rango sobre el índice del orden, así
+    que las páginas profundas cuestan lo mismo que la primera. Un cursor inválido
+    vuelve a la primera página.
+    """
+    fields = [field.lstrip('-') for field in ordering]
+    decoded = decode_cursor(cursor) if cursor else None
+    if decoded is not None and len(decoded[0]) != len(ordering):
+        decoded = None
+
+    values, reverse = decoded if decoded else (None, False)
+    if values is not None:
+        try:
+            values = [_to_python(queryset.model, field, value) for field, value in zip(fields, values)]
+        except Exception:
+            values, reverse = None, False
+
+    page_ordering = _reverse(ordering) if reverse else tuple(ordering)
+    if values is not None:
+        queryset = queryset.filter(_after(page_ordering, values))
+    rows = list(queryset.order_by(*page_ordering)[:page_size + 1])
+
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+    if not rows:
+        return KeysetPage(rows)
+
+    def position(obj):
+        return [_serialize(getattr(obj, field)) for field in fields]
+
+    # Hacia adelante, "más filas" significa página siguiente; hacia atrás, anterior
+    has_next = has_more if not reverse else True
+    has_previous = values is not None if not reverse else has_more
+    return KeysetPage(
+        rows,
+        next_cursor=encode_cursor(position(rows[-1])) if has_next else None,
+        previous_cursor=encode_cursor(position(rows[0]), reverse=True) if has_previous else None,
+    )
+
+
+def _to_python(model, field: str, value):
+    try:
+        model_field = model._meta.get_field(field)
+    except FieldDoesNotExist:
+        # Anotación (p. ej. search_rank): el valor ya viene en su tipo JSON
+        return value
+    return model_field.to_python(value)
+
+
+def _serialize(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+class PlantCursorPagination(CursorPagination):
+    """
+    Catálogo de la API ordenado por nombre; el cursor de DRF es opaco (base64)
+    """
+    ordering = PLANT_ORDERING
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+
+
+class RecentCursorPagination(CursorPagination):
+    """
+    Jardines y planes del usuario, los más recientes primero
+    """
+    ordering = RECENT_ORDERING
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
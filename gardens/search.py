@@ -0,0 +1,118 @@
+import re
+from django.db import connection
+from django.db.models import Case, F, FloatField, Func, IntegerField, Lookup, Q, Value, When
+from .models import PlantSearchIndex
+
+# Tabla FTS5 de contenido externo sobre gardens_plant (solo SQLite)
+FTS_TABLE = PlantSearchIndex._meta.db_table
+
+# Peso de cada columna en bm25: el nombre pesa más que la descripción
+COLUMN_WEIGHTS = (10.0, 5.0, 1.0)
+
+_CREATE_SQL = (
+    # remove_diacritics 2: "calabacin" encuentra "Calabacín"
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, scientific_name, description,
+        content='gardens_plant', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON gardens_plant BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, scientific_name, description)
+        VALUES (new.id, new.name, new.scientific_name, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON gardens_plant BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, scientific_name, description)
+        VALUES ('delete', old.id, old.name, old.scientific_name, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au
+        AFTER UPDATE OF name, scientific_name, description ON gardens_plant BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, scientific_name, description)
+        VALUES ('delete', old.id, old.name, old.scientific_name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, scientific_name, description)
+        VALUES (new.id, new.name, new.scientific_name, new.description);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+)
+
+_DROP_SQL = (
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+)
+
+
+def install_search_index(schema_editor):
+    """
+    Crea (o recrea tras rehacer gardens_plant) el índice FTS5 y sus triggers.
+    Las migraciones lo llaman; en otros motores no hace nada.
+    """
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in _CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def uninstall_search_index(schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in _DROP_SQL:
+        schema_editor.execute(sql)
+
+
+def match_expression(query: str) -> str:
+    """
+    Consulta FTS5 con cada palabra como prefijo: "toma cher" -> "toma"* "cher"*
+    """
+    words = re.findall(r'\w+', query.lower())
+    return ' '.join(f'"{word}"*' for word in words)
+
+
+class Match(Lookup):
+    """
+    `document__match`: consulta FTS5 sobre la columna oculta de la tabla
+    """
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', lhs_params + rhs_params
+
+
+PlantSearchIndex._meta.get_field('document').register_lookup(Match)
+
+
+class BM25(Func):
+    """
+    Relevancia bm25 de la fila del MATCH (más negativo = más relevante)
+    """
+    function = 'bm25'
+    output_field = FloatField()
+
+    def __init__(self, document, weights=COLUMN_WEIGHTS):
+        super().__init__(document, *[Value(weight) for weight in weights])
+
+
+def search_plants(queryset, query: str):
+    """
+    Filtra `queryset` por `query` y lo anota con `search_rank` (menor = más relevante).
+    En SQLite une el índice FTS5 por rowid y rankea con bm25 en la misma
+    consulta, sin tope de resultados; en otros motores cae a icontains por nombre.
+    """
+    if connection.vendor != 'sqlite':
+        matches = queryset.filter(
+            Q(name__icontains=query) | Q(scientific_name__icontains=query) | Q(description__icontains=query)
+        )
+        return matches.annotate(search_rank=Case(
+            When(name__icontains=query, then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        ))
+
+    expression = match_expression(query)
+    if not expression:
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+    return queryset.filter(search_index__document__match=expression).annotate(
+        search_rank=BM25(F('search_index__document'))
+    )
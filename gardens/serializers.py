@@ -1,36 +1,82 @@
-from rest_framework import serializers
-from .models import Garden, Plant, CultivationPlan
-from django.contrib.auth import get_user_model
-
-User = get_user_model()
-
-class PlantSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Plant
-        fields = '__all__'
-
-class GardenSerializer(serializers.ModelSerializer):
-    owner_name = serializers.CharField(source='owner.username', read_only=True)
-    
-    class Meta:
-        model = Garden
-        fields = ['id', 'name', 'location', 'size_m2', 'soil_type', 
-                 'sun_exposure', 'has_irrigation', 'notes', 'owner_name', 'created_at']
-        read_only_fields = ['id', 'created_at', 'owner_name']
-
-class CultivationPlanSerializer(serializers.ModelSerializer):
-    garden_name = serializers.CharField(source='garden.name', read_only=True)
-    plant_name = serializers.CharField(source='plant.name', read_only=True)
-    plant_difficulty = serializers.CharField(source='plant.difficulty', read_only=True)
-    
-    class Meta:
-        model = CultivationPlan
-        fields = '__all__'
-        read_only_fields = ['id', 'created_at', 'updated_at']
-
-class UserProfileSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = User
-        fields = ['id', 'username', 'email', 'location', 'experience_level', 
-                 'available_space', 'phone_number']
+from rest_framework import serializers
+from .models import Garden, Plant, CultivationPlan
+from django.contrib.auth import get_user_model
+
+User = get_user_model()
+
+class PlantSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Plant
+        fields = '__all__'
+
+class GardenSerializer(serializers.ModelSerializer):
+    owner_name = serializers.CharField(source='owner.username', read_only=True)
+    
+    class Meta:
+        model = Garden
+        fields = ['id', 'name', 'location', 'size_m2', 'soil_type', 
+                 'sun_exposure', 'has_irrigation', 'notes', 'owner_name', 'created_at']
+        read_only_fields = ['id', 'created_at', 'owner_name']
+
+class CultivationPlanSerializer(serializers.ModelSerializer):
+    garden_name = serializers.CharField(source='garden.name', read_only=True)
+    plant_name = serializers.CharField(source='plant.name', read_only=True)
+    plant_difficulty = serializers.CharField(source='plant.difficulty', read_only=True)
+    
+    class Meta:
+        model = CultivationPlan
+        fields = '__all__'
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+# Modo rápido de lectura: clave de la respuesta -> lookup de values()
+PLAN_FAST_FIELDS = (
+    ('id', 'id'),
+    ('garden_name', 'garden__name'),
+    ('plant_name', 'plant__name'),
+    ('plant_difficulty', 'plant__difficulty'),
+    ('status', 'status'),
+    ('planting_date', 'planting_date'),
+    ('expected_harvest_date', 'expected_harvest_date'),
+    ('actual_harvest_date', 'actual_harvest_date'),
+    ('notes', 'notes'),
+    ('ai_recommendations', 'ai_recommendations'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+    ('garden', 'garden_id'),
+    ('plant', 'plant_id'),
+)
+
+PLAN_FAST_LOOKUPS = [lookup for _, lookup in PLAN_FAST_FIELDS]
+
+_date_field = serializers.DateField()
+_datetime_field = serializers.DateTimeField()
+
+# Conversión de fechas igual a la de CultivationPlanSerializer
+PLAN_FAST_FORMATS = {
+    'planting_date': _date_field.to_representation,
+    'expected_harvest_date': _date_field.to_representation,
+    'actual_harvest_date': _date_field.to_representation,
+    'created_at': _datetime_field.to_representation,
+    'updated_at': _datetime_field.to_representation,
+}
+
+
+def cultivation_plan_row(row: dict) -> dict:
+    """
+    Misma salida que CultivationPlanSerializer a partir de una fila de
+    values(PLAN_FAST_LOOKUPS), sin instancias de modelo ni campos por fila
+    """
+    data = {}
+    for key, lookup in PLAN_FAST_FIELDS:
+        value = row[lookup]
+        if value is not None and key in PLAN_FAST_FORMATS:
+            value = PLAN_FAST_FORMATS[key](value)
+        data[key] = value
+    return data
+
+class UserProfileSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'email', 'location', 'experience_level', 
+                 'available_space', 'phone_number']
         read_only_fields = ['id']
\ No newline at end of file
@@ -0,0 +1,37 @@
+from functools import partial
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from core.locations import location_key
+from .catalog import bump_catalog_version
+from .models import Garden, Plant
+from .snapshot import queue_plant_change
+from .suggest import apply_suggest_change
+
+
+@receiver(post_save, sender=Plant)
+def plant_saved(sender, instance, **kwargs):
+    """
+    Cualquier escritura en Plant invalida lo derivado del catálogo y publica
+    el snapshot y el índice de sugerencias de la nueva versión a partir de los
+    anteriores. Se publican al confirmar la transacción (el snapshot, una vez
+    por transacción); si se revierte, se reconstruyen desde la BD.
+    """
+    previous, version = bump_catalog_version()
+    queue_plant_change(previous, version, plant=instance)
+    transaction.on_commit(partial(apply_suggest_change, previous, version, plant=instance))
+
+
+@receiver(post_delete, sender=Plant)
+def plant_deleted(sender, instance, **kwargs):
+    previous, version = bump_catalog_version()
+    queue_plant_change(previous, version, deleted_id=instance.pk)
+    transaction.on_commit(partial(apply_suggest_change, previous, version, deleted_id=instance.pk))
+
+
+@receiver(pre_save, sender=Garden)
+def resolve_garden_location(sender, instance, **kwargs):
+    """
+    Guarda la región canónica para no resolver la ubicación en cada request
+    """
+    instance.location_key = location_key(instance.location)
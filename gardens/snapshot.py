@@ -0,0 +1,302 @@
+import glob
+import logging
+import os
+import struct
+import threading
+import time
+import uuid
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from .catalog import get_catalog_version
+from .models import Plant
+
+logger = logging.getLogger(__name__)
+
+DIFFICULTY_CODES = [code for code, _ in Plant.DIFFICULTY_LEVELS]
+SEASON_CODES = [code for code, _ in Plant.SEASONS]
+
+# Columnas numéricas del snapshot; los nombres van aparte como bloque UTF-8
+RECORD_DTYPE = np.dtype([
+    ('id', '<i8'),
+    ('space_required', '<f8'),
+    ('harvest_time_days', '<i4'),
+    ('water_frequency', '<i4'),
+    ('difficulty', 'i1'),
+    ('planting_season', 'i1'),
+])
+
+SNAPSHOT_FIELDS = ('id', 'name', 'difficulty', 'space_required', 'water_frequency',
+                   'planting_season', 'harvest_time_days')
+
+# magic, versión de formato, versión del catálogo, n° de filas, bytes de nombres
+_HEADER = struct.Struct('<4sHxxQQQ')
+_MAGIC = b'HPSN'
+_FORMAT_VERSION = 1
+
+# Snapshots antiguos que se conservan para workers que aún los tengan mapeados
+KEEP_VERSIONS = 3
+
+# Segundos que un snapshot reemplazado sigue en disco: otros workers pueden
+# haber leído su versión de la BD y estar por abrirlo
+SUPERSEDED_GRACE_SECONDS = 300
+
+
+class NameTable:
+    """
+    Nombres de plantas sobre un bloque UTF-8 con offsets; se decodifican bajo demanda
+    """
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index):
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return bytes(self.blob[start:end]).decode('utf-8')
+
+
+class PlantSnapshot:
+    """
+    Copia compacta de Plant con solo las columnas del recomendador y los filtros
+    del catálogo (sin description). Se guarda en un archivo por versión del catálogo
+    que los workers abren con mmap de solo lectura.
+    """
+
+    def __init__(self, version, records, offsets, blob):
+        self.version = version
+        self.records = records
+        self.names = NameTable(offsets, blob)
+
+    def __len__(self):
+        return len(self.records)
+
+    @classmethod
+    def from_rows(cls, version, rows):
+        """
+        Construye el snapshot desde tuplas en el orden de SNAPSHOT_FIELDS
+        """
+        rows = list(rows)
+        difficulty_index = {code: i for i, code in enumerate(DIFFICULTY_CODES)}
+        season_index = {code: i for i, code in enumerate(SEASON_CODES)}
+
+        records = np.zeros(len(rows), dtype=RECORD_DTYPE)
+        encoded = []
+        for i, (plant_id, name, difficulty, space, water, season, harvest) in enumerate(rows):
+            records[i] = (
+                plant_id,
+                space,
+                harvest,
+                water,
+                difficulty_index.get(difficulty, len(DIFFICULTY_CODES) - 1),
+                season_index.get(season, 0),
+            )
+            encoded.append(name.encode('utf-8'))
+
+        offsets = np.zeros(len(rows) + 1, dtype='<i8')
+        offsets[1:] = np.cumsum([len(name) for name in encoded], dtype=np.int64)
+        blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+        return cls(version, records, offsets, blob)
+
+    @classmethod
+    def from_queryset(cls, version, queryset=None):
+        if queryset is None:
+            queryset = Plant.objects.all()
+        return cls.from_rows(
+            version, queryset.order_by('id').values_list(*SNAPSHOT_FIELDS).iterator(chunk_size=5000)
+        )
+
+    def with_changes(self, version, upserts=(), deleted_ids=()):
+        """
+        Nuevo snapshot aplicando cambios puntuales, sin volver a leer la tabla.
+        Las filas modificadas se quitan y se agregan al final.
+        """
+        changed = PlantSnapshot.from_rows(version, upserts)
+        removed = np.array(list(set(deleted_ids) | {row[0] for row in upserts}), dtype='<i8')
+        keep = ~np.isin(self.records['id'], removed)
+
+        lengths = np.diff(self.names.offsets)
+        kept_blob = np.asarray(self.names.blob)[np.repeat(keep, lengths)]
+        all_lengths = np.concatenate([lengths[keep], np.diff(changed.names.offsets)])
+
+        offsets = np.zeros(len(all_lengths) + 1, dtype='<i8')
+        offsets[1:] = np.cumsum(all_lengths)
+        return PlantSnapshot(
+            version,
+            np.concatenate([self.records[keep], changed.records]),
+            offsets,
+            np.concatenate([kept_blob, changed.names.blob]),
+        )
+
+    def save(self, directory):
+        """
+        Escribe el snapshot de forma atómica en `directory`
+        """
+        os.makedirs(directory, exist_ok=True)
+        path = snapshot_path(directory, self.version)
+        tmp_path = f'{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp'
+        offsets = np.asarray(self.names.offsets, dtype='<i8')
+        blob = np.asarray(self.names.blob, dtype=np.uint8)
+
+        with open(tmp_path, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, self.version, len(self.records), len(blob)))
+            f.write(np.ascontiguousarray(self.records).tobytes())
+            f.write(offsets.tobytes())
+            f.write(blob.tobytes())
+        os.replace(tmp_path, path)
+        _prune_old_snapshots(directory)
+        return path
+
+    @classmethod
+    def open(cls, path):
+        """
+        Abre un snapshot con mmap de solo lectura; las páginas se comparten entre procesos
+        """
+        with open(path, 'rb') as f:
+            magic, format_version, version, count, blob_size = _HEADER.unpack(f.read(_HEADER.size))
+        if magic != _MAGIC or format_version != _FORMAT_VERSION:
+            raise ValueError(f'Snapshot de plantas no reconocido: {path}')
+
+        offset = _HEADER.size
+        records = np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=offset, shape=(count,)) \
+            if count else np.zeros(0, dtype=RECORD_DTYPE)
+        offset += RECORD_DTYPE.itemsize * count
+        offsets = np.memmap(path, dtype='<i8', mode='r', offset=offset, shape=(count + 1,))
+        offset += 8 * (count + 1)
+        blob = np.memmap(path, dtype=np.uint8, mode='r', offset=offset, shape=(blob_size,)) \
+            if blob_size else np.zeros(0, dtype=np.uint8)
+        return cls(version, records, offsets, blob)
+
+
+def snapshot_dir():
+    return str(settings.PLANT_SNAPSHOT_DIR)
+
+
+def snapshot_path(directory, version):
+    return os.path.join(directory, f'plants-{version}.snap')
+
+
+def _prune_old_snapshots(directory):
+    """
+    Borra los snapshots fuera de los últimos KEEP_VERSIONS que fueron
+    reemplazados hace más de SUPERSEDED_GRACE_SECONDS (según la fecha de
+    escritura del siguiente)
+    """
+    paths = glob.glob(os.path.join(directory, 'plants-*.snap'))
+    paths.sort(key=lambda path: int(os.path.basename(path)[len('plants-'):-len('.snap')]))
+    now = time.time()
+    for path, newer in zip(paths[:-KEEP_VERSIONS], paths[1:]):
+        try:
+            if now - os.path.getmtime(newer) < SUPERSEDED_GRACE_SECONDS:
+                continue
+            os.remove(path)
+        except OSError:
+            # En Windows no se puede borrar un archivo mapeado por otro proceso
+            pass
+
+
+_snapshot = None
+
+
+def get_plant_snapshot(version=None) -> PlantSnapshot:
+    """
+    Snapshot de la versión actual del catálogo para este proceso.
+    Si el archivo de esa versión no existe todavía, se construye y se publica.
+    """
+    global _snapshot
+    if version is None:
+        version = get_catalog_version()
+    if _snapshot is not None and _snapshot.version == version:
+        return _snapshot
+
+    directory = snapshot_dir()
+    path = snapshot_path(directory, version)
+    try:
+        _snapshot = PlantSnapshot.open(path)
+    except (FileNotFoundError, ValueError, struct.error):
+        snapshot = PlantSnapshot.from_queryset(version)
+        try:
+            snapshot.save(directory)
+            _snapshot = PlantSnapshot.open(path)
+        except OSError as e:
+            logger.error(f"No se pudo publicar el snapshot de plantas: {e}")
+            _snapshot = snapshot
+    return _snapshot
+
+
+# Cambios de Plant de la transacción en curso de este hilo, pendientes de publicar
+_pending = threading.local()
+
+
+def queue_plant_change(previous_version, version, plant=None, deleted_id=None):
+    """
+    Anota un cambio puntual (la escritura que llevó de `previous_version` a
+    `version`) y lo publica al confirmar la transacción. Todos los cambios de
+    una transacción se publican juntos en una sola reescritura del snapshot.
+    """
+    changes = getattr(_pending, 'changes', [])
+    versions = [change[1] for change in changes]
+    if previous_version in versions:
+        # Lo anotado después de `previous_version` se revirtió con un savepoint
+        del changes[versions.index(previous_version) + 1:]
+    else:
+        # Transacción nueva (o lo anotado antes se revirtió entero)
+        changes = []
+
+    row = tuple(getattr(plant, field) for field in SNAPSHOT_FIELDS) if plant is not None else None
+    changes.append((previous_version, version, row, deleted_id))
+    _pending.changes = changes
+    # Cada cambio registra la publicación por si su savepoint se revierte; la
+    # primera que corre publica todo y las demás no encuentran nada pendiente
+    transaction.on_commit(publish_pending_changes)
+
+
+def publish_pending_changes():
+    """
+    Publica el snapshot de la última versión anotada a partir del snapshot más
+    reciente de la cadena de cambios. Si no hay ninguno en disco, se
+    construirá completo en el próximo uso.
+    """
+    changes = getattr(_pending, 'changes', None)
+    _pending.changes = []
+    if not changes:
+        return None
+    # Los últimos cambios pueden venir de un savepoint revertido
+    versions = [change[1] for change in changes]
+    committed = get_catalog_version()
+    if committed in versions:
+        del changes[versions.index(committed) + 1:]
+
+    directory = snapshot_dir()
+    for start in reversed(range(len(changes))):
+        try:
+            previous = PlantSnapshot.open(snapshot_path(directory, changes[start][0]))
+        except (FileNotFoundError, ValueError, struct.error):
+            continue
+
+        upserts = {}
+        deleted_ids = set()
+        for _, _, row, deleted_id in changes[start:]:
+            if row is not None:
+                upserts[row[0]] = row
+                deleted_ids.discard(row[0])
+            if deleted_id is not None:
+                upserts.pop(deleted_id, None)
+                deleted_ids.add(deleted_id)
+        try:
+            return previous.with_changes(changes[-1][1], list(upserts.values()), deleted_ids).save(directory)
+        except OSError as e:
+            logger.error(f"No se pudo actualizar el snapshot de plantas: {e}")
+            return None
+    return None
+
+
+def release_plant_snapshot():
+    """
+    Suelta el snapshot mapeado por este proceso; el siguiente uso lo vuelve a abrir
+    """
+    global _snapshot
+    _snapshot = None
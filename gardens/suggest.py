@@ -0,0 +1,173 @@
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from .catalog import get_catalog_version
+from .models import Plant
+
+# Fracción mínima de trigramas de la consulta que debe tener un nombre
+MIN_SIMILARITY = 0.5
+
+# Cada cuánto se compara el índice con la versión del catálogo en la BD; los
+# cambios hechos en este proceso se aplican al instante
+VERSION_CHECK_SECONDS = 2.0
+
+# Tope de nombres comparados por consulta: acota la latencia cuando hasta los
+# trigramas menos frecuentes son comunes (se toman primero los más raros)
+MAX_CANDIDATES = 500
+
+
+def normalize_name(name: str) -> list:
+    """
+    Palabras de un nombre de planta en minúsculas, sin tildes ni puntuación:
+    "Tomate Cherry (rojo)" -> ["tomate", "cherry", "rojo"]
+    """
+    text = unicodedata.normalize('NFKD', name or '')
+    text = ''.join(char for char in text if not unicodedata.combining(char)).lower()
+    return re.findall(r'[^\W_]+', text)
+
+
+def trigrams(text: str) -> set:
+    """
+    Trigramas por palabra, sin tildes y con relleno al estilo pg_trgm:
+    "Tomate" -> {"  t", " to", "tom", "oma", "mat", "ate", "te "}
+    """
+    grams = set()
+    for word in normalize_name(text):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """
+    Índice invertido trigrama -> ids de planta para sugerencias tolerantes a errores
+    ("tomatte" -> "Tomate Cherry"). Vive en memoria del proceso y se actualiza
+    planta por planta.
+    """
+
+    def __init__(self, version=None):
+        self.version = version
+        self.names = {}
+        self.grams = {}
+        self.postings = defaultdict(set)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_rows(cls, version, rows):
+        index = cls(version)
+        for plant_id, name in rows:
+            index._add(plant_id, name)
+        return index
+
+    @classmethod
+    def from_queryset(cls, version):
+        return cls.from_rows(version, Plant.objects.values_list('id', 'name').iterator())
+
+    def _add(self, plant_id, name):
+        self._remove(plant_id)
+        grams = trigrams(name)
+        self.names[plant_id] = name
+        self.grams[plant_id] = grams
+        for gram in grams:
+            self.postings[gram].add(plant_id)
+
+    def _remove(self, plant_id):
+        for gram in self.grams.pop(plant_id, ()):
+            ids = self.postings[gram]
+            ids.discard(plant_id)
+            if not ids:
+                del self.postings[gram]
+        self.names.pop(plant_id, None)
+
+    def apply(self, previous_version, version, plant=None, deleted_id=None) -> bool:
+        with self._lock:
+            if self.version != previous_version:
+                return False
+            if plant is not None:
+                self._add(plant.pk, plant.name)
+            if deleted_id is not None:
+                self._remove(deleted_id)
+            self.version = version
+        return True
+
+    def search(self, query: str, limit: int = 8, min_similarity: float = MIN_SIMILARITY) -> list:
+        """
+        [(id, nombre, similitud)] de mayor a menor similitud. La similitud es la
+        fracción de trigramas de la consulta presentes en el nombre; a igualdad,
+        gana el nombre más parecido en largo (Jaccard).
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+        # Un nombre con al menos `needed` trigramas de la consulta tiene alguno de
+        # los `len - needed + 1` menos frecuentes: solo esas listas se recorren
+        needed = max(1, math.ceil(min_similarity * len(query_grams) - 1e-9))
+
+        with self._lock:
+            rarest = sorted(query_grams, key=lambda gram: len(self.postings.get(gram, ())))
+            candidates = set()
+            for gram in rarest[:len(query_grams) - needed + 1]:
+                for plant_id in self.postings.get(gram, ()):
+                    if len(candidates) >= MAX_CANDIDATES:
+                        break
+                    candidates.add(plant_id)
+
+            matches = []
+            for plant_id in candidates:
+                grams = self.grams[plant_id]
+                count = len(grams & query_grams)
+                if count < needed:
+                    continue
+                similarity = count / len(query_grams)
+                jaccard = count / (len(query_grams) + len(grams) - count)
+                matches.append((similarity, jaccard, plant_id, self.names[plant_id]))
+
+        matches.sort(key=lambda match: (-match[0], -match[1], match[3]))
+        return [(plant_id, name, round(similarity, 3)) for similarity, _, plant_id, name in matches[:limit]]
+
+
+_index = None
+_checked_at = 0.0
+_index_lock = threading.Lock()
+
+
+def get_suggest_index() -> TrigramIndex:
+    """
+    Índice de la versión actual del catálogo. Con el índice tibio no consulta
+    la BD: la versión compartida se revisa cada VERSION_CHECK_SECONDS (o antes,
+    si un cambio local no calzó), y se reconstruye si otro worker o un comando
+    cambió el catálogo sin pasar por este proceso.
+    """
+    global _index, _checked_at
+    index = _index
+    now = time.monotonic()
+    if index is not None and now - _checked_at < VERSION_CHECK_SECONDS:
+        return index
+
+    version = get_catalog_version()
+    with _index_lock:
+        if _index is None or _index.version != version:
+            _index = TrigramIndex.from_queryset(version)
+        _checked_at = now
+        return _index
+
+
+def apply_suggest_change(previous_version, version, plant=None, deleted_id=None):
+    """
+    Aplica un cambio puntual si el índice está en `previous_version`; si no,
+    el próximo uso revisa la versión y lo reconstruye completo
+    """
+    global _checked_at
+    index = _index
+    if index is not None and not index.apply(previous_version, version, plant=plant, deleted_id=deleted_id):
+        _checked_at = 0.0
+
+
+def suggest_plants(query: str, limit: int = 8) -> list:
+    return [
+        {'id': plant_id, 'name': name, 'score': score}
+        for plant_id, name, score in get_suggest_index().search(query, limit)
+    ]
@@ -1,153 +1,775 @@
-from django.test import TestCase, Client
-from django.urls import reverse
-from django.contrib.auth import get_user_model
-from rest_framework.test import APITestCase
-from rest_framework import status
-from .models import Garden, Plant, CultivationPlan
-
-User = get_user_model()
-
-class SecurityTestCase(APITestCase):
-    """Tests de seguridad OWASP"""
-    
-    def setUp(self):
-        self.user = User.objects.create_user(
-            username='testuser',
-            email='test@example.com',
-            password='testpass123'
-        )
-        self.other_user = User.objects.create_user(
-            username='otheruser',
-            email='other@example.com', 
-            password='otherpass123'
-        )
-        
-    def test_authentication_required(self):
-        """Test que endpoints requieren autenticación"""
-        response = self.client.get('/api/v1/gardens/')
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
-        
-    def test_sql_injection_prevention(self):
-        """Test prevención de SQL injection"""
-        self.client.force_authenticate(user=self.user)
-        
-        # Intento de SQL injection en búsqueda
-        malicious_input = "'; DROP TABLE gardens_plant; --"
-        response = self.client.get(f'/api/v1/plants/by_difficulty/?level={malicious_input}')
-        
-        # Debe retornar error de validación, no crash
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-        
-        # Verificar que la tabla sigue existiendo
-        self.assertTrue(Plant.objects.count() >= 0)
-        
-    def test_access_control(self):
-        """Test que usuarios solo acceden a sus datos"""
-        self.client.force_authenticate(user=self.user)
-        
-        # Crear jardín para otro usuario
-        other_garden = Garden.objects.create(
-            owner=self.other_user,
-            name='Jardín Ajeno',
-            location='Lugar secreto',
-            size_m2=5.0,
-            soil_type='sandy',
-            sun_exposure='shade'
-        )
-        
-        # Usuario no debe ver jardín de otro
-        response = self.client.get('/api/v1/gardens/')
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        
-        garden_ids = [g['id'] for g in response.data]
-        self.assertNotIn(other_garden.id, garden_ids)
-        
-    def test_input_validation(self):
-        """Test validación de entrada"""
-        self.client.force_authenticate(user=self.user)
-        
-        # Datos inválidos para crear jardín
-        invalid_data = {
-            'name': '',  # Nombre vacío
-            'size_m2': -5,  # Tamaño negativo
-            'soil_type': 'invalid_type',  # Tipo inválido
-        }
-        
-        response = self.client.post('/api/v1/gardens/', invalid_data)
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
-
-class PlantModelTest(TestCase):
-    """Tests del modelo Plant"""
-    
-    def test_plant_creation(self):
-        """Test creación de planta"""
-        plant = Plant.objects.create(
-            name='Test Plant',
-            description='Una planta de prueba',
-            difficulty='easy',
-            planting_season='spring',
-            harvest_time_days=30,
-            space_required=1.0,
-            water_frequency=3
-        )
-        
-        self.assertEqual(plant.name, 'Test Plant')
-        self.assertEqual(plant.difficulty, 'easy')
-        self.assertTrue(plant.harvest_time_days > 0)
-
-class AIRecommendationTest(APITestCase):
-    """Tests del servicio de IA"""
-    
-    def setUp(self):
-        self.user = User.objects.create_user(
-            username='aiuser',
-            email='ai@test.com',
-            password='aipass123',
-            experience_level='beginner'
-        )
-        
-        self.garden = Garden.objects.create(
-            owner=self.user,
-            name='Test Garden',
-            location='Test Location',
-            size_m2=5.0,
-            soil_type='loamy',
-            sun_exposure='full_sun'
-        )
-        
-        Plant.objects.create(
-            name='Easy Plant',
-            description='Test plant',
-            difficulty='easy',
-            planting_season='spring',
-            harvest_time_days=30,
-            space_required=1.0,
-            water_frequency=2
-        )
-    
-    def test_ai_recommendations_generation(self):
-        """Test generación de recomendaciones IA"""
-        self.client.force_authenticate(user=self.user)
-        
-        response = self.client.post(
-            '/api/v1/ai-recommendations/generate_recommendations/',
-            {'garden_id': self.garden.id}
-        )
-        
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertIn('recommendations', response.data)
-        self.assertIn('garden', response.data)
-        
-    def test_ai_rate_limiting(self):
-        """Test rate limiting en IA"""
-        self.client.force_authenticate(user=self.user)
-        
-        # Hacer múltiples requests rápidos
-        for _ in range(12):  # Límite es 10/minuto
-            response = self.client.post(
-                '/api/v1/ai-recommendations/generate_recommendations/',
-                {'garden_id': self.garden.id}
-            )
-        
-        # El último debe ser rate limited
-        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
\ No newline at end of file
+import csv
+import io
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from unittest import mock
+import numpy as np
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import IntegrityError, transaction
+from django.test import TestCase, Client, override_settings
+from django.urls import reverse
+from django.contrib.auth import get_user_model
+from rest_framework.test import APITestCase
+from rest_framework import status
+from core.counters import get_counters
+from .bulk_import import import_gardens, import_plants, read_rows
+from .catalog import bump_catalog_version, get_catalog_version
+from .models import CatalogVersion, Garden, Plant, CultivationPlan, WateringSchedule
+from .pagination import keyset_page, PLANT_ORDERING, SEARCH_ORDERING
+from .facets import facet_counts
+from .search import search_plants
+from .suggest import (MIN_SIMILARITY, VERSION_CHECK_SECONDS, TrigramIndex, get_suggest_index,
+                      suggest_plants, trigrams)
+from .snapshot import (DIFFICULTY_CODES, KEEP_VERSIONS, SUPERSEDED_GRACE_SECONDS, PlantSnapshot,
+                       get_plant_snapshot, snapshot_path)
+from .watering import next_watering_offsets, update_watering_schedules
+
+User = get_user_model()
+
+class SecurityTestCase(APITestCase):
+    """Tests de seguridad OWASP"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='testuser',
+            email='test@example.com',
+            password='testpass123'
+        )
+        self.other_user = User.objects.create_user(
+            username='otheruser',
+            email='other@example.com', 
+            password='otherpass123'
+        )
+        
+    def test_authentication_required(self):
+        """Test que endpoints requieren autenticación"""
+        response = self.client.get('/api/v1/gardens/')
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        
+    def test_sql_injection_prevention(self):
+        """Test prevención de SQL injection"""
+        self.client.force_authenticate(user=self.user)
+        
+        # Intento de SQL injection en búsqueda
+        malicious_input = "'; DROP TABLE gardens_plant; --"
+        response = self.client.get(f'/api/v1/plants/by_difficulty/?level={malicious_input}')
+        
+        # Debe retornar error de validación, no crash
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        
+        # Verificar que la tabla sigue existiendo
+        self.assertTrue(Plant.objects.count() >= 0)
+        
+    def test_access_control(self):
+        """Test que usuarios solo acceden a sus datos"""
+        self.client.force_authenticate(user=self.user)
+        
+        # Crear jardín para otro usuario
+        other_garden = Garden.objects.create(
+            owner=self.other_user,
+            name='Jardín Ajeno',
+            location='Lugar secreto',
+            size_m2=5.0,
+            soil_type='sandy',
+            sun_exposure='shade'
+        )
+        
+        # Usuario no debe ver jardín de otro
+        response = self.client.get('/api/v1/gardens/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        garden_ids = [g['id'] for g in response.data['results']]
+        self.assertNotIn(other_garden.id, garden_ids)
+        
+    def test_input_validation(self):
+        """Test validación de entrada"""
+        self.client.force_authenticate(user=self.user)
+        
+        # Datos inválidos para crear jardín
+        invalid_data = {
+            'name': '',  # Nombre vacío
+            'size_m2': -5,  # Tamaño negativo
+            'soil_type': 'invalid_type',  # Tipo inválido
+        }
+        
+        response = self.client.post('/api/v1/gardens/', invalid_data)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+class PlantModelTest(TestCase):
+    """Tests del modelo Plant"""
+    
+    def test_plant_creation(self):
+        """Test creación de planta"""
+        plant = Plant.objects.create(
+            name='Test Plant',
+            description='Una planta de prueba',
+            difficulty='easy',
+            planting_season='spring',
+            harvest_time_days=30,
+            space_required=1.0,
+            water_frequency=3
+        )
+        
+        self.assertEqual(plant.name, 'Test Plant')
+        self.assertEqual(plant.difficulty, 'easy')
+        self.assertTrue(plant.harvest_time_days > 0)
+
+class AIRecommendationTest(APITestCase):
+    """Tests del servicio de IA"""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username='aiuser',
+            email='ai@test.com',
+            password='aipass123',
+            experience_level='beginner'
+        )
+        
+        self.garden = Garden.objects.create(
+            owner=self.user,
+            name='Test Garden',
+            location='Test Location',
+            size_m2=5.0,
+            soil_type='loamy',
+            sun_exposure='full_sun'
+        )
+        
+        Plant.objects.create(
+            name='Easy Plant',
+            description='Test plant',
+            difficulty='easy',
+            planting_season='spring',
+            harvest_time_days=30,
+            space_required=1.0,
+            water_frequency=2
+        )
+    
+    def test_ai_recommendations_generation(self):
+        """Test generación de recomendaciones IA"""
+        self.client.force_authenticate(user=self.user)
+        
+        response = self.client.post(
+            '/api/v1/ai-recommendations/generate_recommendations/',
+            {'garden_id': self.garden.id}
+        )
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('recommendations', response.data)
+        self.assertIn('garden', response.data)
+        
+    def test_ai_rate_limiting(self):
+        """Test rate limiting en IA"""
+        self.client.force_authenticate(user=self.user)
+        
+        # Hacer múltiples requests rápidos
+        for _ in range(12):  # Límite es 10/minuto
+            response = self.client.post(
+                '/api/v1/ai-recommendations/generate_recommendations/',
+                {'garden_id': self.garden.id}
+            )
+        
+        # El último debe ser rate limited
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+class PlantSnapshotTest(TestCase):
+    """Tests del snapshot compartido del catálogo"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        override = override_settings(PLANT_SNAPSHOT_DIR=self.tmp.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.tomato = Plant.objects.create(
+            name='Tomate', scientific_name='Solanum lycopersicum', description='Tomate',
+            difficulty='medium', planting_season='spring', harvest_time_days=90,
+            space_required=1.0, water_frequency=2,
+        )
+        self.lettuce = Plant.objects.create(
+            name='Lechuga', scientific_name='Lactuca sativa', description='Lechuga',
+            difficulty='easy', planting_season='all_year', harvest_time_days=45,
+            space_required=0.3, water_frequency=3,
+        )
+
+    def test_save_and_open_roundtrip(self):
+        snapshot = PlantSnapshot.from_queryset(7)
+        path = snapshot.save(self.tmp.name)
+        opened = PlantSnapshot.open(path)
+
+        self.assertEqual(opened.version, 7)
+        self.assertEqual(list(opened.records['id']), [self.tomato.id, self.lettuce.id])
+        self.assertEqual([opened.names[i] for i in range(len(opened))], ['Tomate', 'Lechuga'])
+        self.assertEqual(DIFFICULTY_CODES[opened.records['difficulty'][1]], 'easy')
+
+    def test_plant_change_patches_next_version(self):
+        version = get_catalog_version()
+        get_plant_snapshot(version)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.lettuce.name = 'Lechuga romana'
+            self.lettuce.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tomato.delete()
+
+        path = snapshot_path(self.tmp.name, get_catalog_version())
+        self.assertTrue(os.path.exists(path))
+        snapshot = PlantSnapshot.open(path)
+        self.assertEqual(list(snapshot.records['id']), [self.lettuce.id])
+        self.assertEqual(snapshot.names[0], 'Lechuga romana')
+
+    def test_transaction_rewrites_snapshot_once(self):
+        get_plant_snapshot(get_catalog_version())
+
+        with mock.patch.object(PlantSnapshot, 'save', autospec=True, side_effect=PlantSnapshot.save) as save, \
+                self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for i in range(20):
+                    Plant.objects.create(
+                        name=f'Acelga {i}', description='', difficulty='easy', planting_season='spring',
+                        harvest_time_days=60, space_required=0.5, water_frequency=2,
+                    )
+                self.lettuce.name = 'Lechuga romana'
+                self.lettuce.save()
+                # Lo escrito en un savepoint revertido no llega al snapshot
+                with self.assertRaises(IntegrityError), transaction.atomic():
+                    self.tomato.delete()
+                    Plant.objects.create(name='Acelga 0', description='', difficulty='easy',
+                                         planting_season='spring', harvest_time_days=60,
+                                         space_required=0.5, water_frequency=2)
+        self.assertEqual(save.call_count, 1)
+
+        snapshot = PlantSnapshot.open(snapshot_path(self.tmp.name, get_catalog_version()))
+        self.assertEqual(len(snapshot), 22)
+        names = {snapshot.names[i] for i in range(len(snapshot))}
+        self.assertIn('Tomate', names)
+        self.assertIn('Lechuga romana', names)
+
+    def test_prune_keeps_recently_replaced_versions(self):
+        old = time.time() - 2 * SUPERSEDED_GRACE_SECONDS
+        for version in range(1, KEEP_VERSIONS + 3):
+            path = PlantSnapshot.from_queryset(version).save(self.tmp.name)
+            # Las versiones 1 y 2 se reemplazaron hace rato
+            if version <= 2:
+                os.utime(path, (old, old))
+
+        # La 1 ya pasó la gracia; la 2 fue reemplazada recién (por la 3) y sigue en disco
+        self.assertFalse(os.path.exists(snapshot_path(self.tmp.name, 1)))
+        self.assertTrue(os.path.exists(snapshot_path(self.tmp.name, 2)))
+
+
+class WateringScheduleTest(TestCase):
+    """Tests del cálculo de riegos según el pronóstico"""
+
+    def test_rain_pushes_watering_back(self):
+        # Regar cada 3 días; sembrados hace 0, 1 y 2 días -> riego en 0, 2 y 1 días
+        days_since = np.array([0, 1, 2])
+        frequency = np.array([3, 3, 3])
+        rain = np.array([False, True, False, False])
+
+        due, delay = next_watering_offsets(days_since, frequency, rain)
+        # La lluvia del día 1 reemplaza los riegos pendientes: próximo riego el día 4
+        self.assertEqual(due.tolist(), [0, 4, 4])
+        self.assertEqual(delay.tolist(), [0, 2, 3])
+
+        # Con riego automático se mantiene el programa aunque llueva
+        due, delay = next_watering_offsets(days_since, frequency, rain, np.array([False, True, False]))
+        self.assertEqual(due.tolist(), [0, 2, 4])
+        self.assertEqual(delay.tolist(), [0, 0, 3])
+
+    def test_update_schedules_for_active_plans(self):
+        user = User.objects.create_user(
+            username='riego', email='riego@test.com', password='riegopass123'
+        )
+        garden = Garden.objects.create(
+            owner=user, name='Huerto', location='Santiago', size_m2=5.0,
+            soil_type='loamy', sun_exposure='full_sun', has_irrigation=True
+        )
+        plant = Plant.objects.create(
+            name='Albahaca', description='Albahaca', difficulty='easy',
+            planting_season='spring', harvest_time_days=60, space_required=0.3, water_frequency=2
+        )
+        today = date(2026, 1, 10)
+        active = CultivationPlan.objects.create(
+            garden=garden, plant=plant, status='active',
+            planting_date=today - timedelta(days=1), expected_harvest_date=today + timedelta(days=60)
+        )
+        manual_garden = Garden.objects.create(
+            owner=user, name='Maceteros', location='Santiago', size_m2=2.0,
+            soil_type='loamy', sun_exposure='full_sun', has_irrigation=False
+        )
+        manual = CultivationPlan.objects.create(
+            garden=manual_garden, plant=plant, status='active',
+            planting_date=today - timedelta(days=1), expected_harvest_date=today + timedelta(days=60)
+        )
+        CultivationPlan.objects.create(
+            garden=garden, plant=plant, status='completed',
+            planting_date=today, expected_harvest_date=today
+        )
+        forecast = [
+            {'date': (today + timedelta(days=i)).isoformat(),
+             'icon': 'rainy' if i == 1 else 'sunny', 'description': ''}
+            for i in range(7)
+        ]
+
+        with mock.patch('gardens.watering.WeatherService.get_weekly_forecast', return_value=forecast) as get_forecast:
+            self.assertEqual(update_watering_schedules(today=today), 2)
+            # Una consulta de pronóstico por región
+            get_forecast.assert_called_once_with('Santiago', 'cl-santiago')
+
+        # La lluvia de mañana reemplaza el riego manual...
+        schedule = WateringSchedule.objects.get(plan=manual)
+        self.assertEqual(schedule.next_watering_date, today + timedelta(days=3))
+        self.assertEqual(schedule.rain_delay_days, 2)
+        self.assertEqual(schedule.method, 'manual')
+        # ...pero el riego automático sigue su programa
+        schedule = WateringSchedule.objects.get(plan=active)
+        self.assertEqual(schedule.next_watering_date, today + timedelta(days=1))
+        self.assertEqual(schedule.rain_delay_days, 0)
+        self.assertEqual(schedule.method, 'irrigation')
+
+
+class KeysetPaginationTest(APITestCase):
+    """Paginación por cursor del catálogo, los jardines y la API"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='keyset', password='pass12345')
+        for i in range(25):
+            Plant.objects.create(
+                name=f'Planta {i:02d}', description='', difficulty='easy', planting_season='spring',
+                harvest_time_days=60, space_required=0.5, water_frequency=2,
+            )
+
+    def test_keyset_page_walks_forward_and_back(self):
+        first = keyset_page(Plant.objects.all(), PLANT_ORDERING, page_size=10)
+        self.assertFalse(first.has_previous())
+        second = keyset_page(Plant.objects.all(), PLANT_ORDERING, first.next_cursor, page_size=10)
+        self.assertEqual([p.name for p in second][0], 'Planta 10')
+        last = keyset_page(Plant.objects.all(), PLANT_ORDERING, second.next_cursor, page_size=10)
+        self.assertEqual(len(last), 5)
+        self.assertFalse(last.has_next())
+
+        back = keyset_page(Plant.objects.all(), PLANT_ORDERING, last.previous_cursor, page_size=10)
+        self.assertEqual([p.name for p in back], [p.name for p in second])
+        self.assertTrue(back.has_previous())
+
+    def test_catalog_uses_cursor_without_count(self):
+        response = self.client.get(reverse('plants_catalog'))
+        page = response.context['page_obj']
+        self.assertEqual(len(page), 9)
+
+        # Sin COUNT(*) ni OFFSET: versión del catálogo, página y conteos de facetas
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('plants_catalog'), {'cursor': page.next_cursor})
+        self.assertEqual(response.context['page_obj'].object_list[0].name, 'Planta 09')
+
+        # Un cursor manipulado vuelve a la primera página
+        response = self.client.get(reverse('plants_catalog'), {'cursor': 'no-es-un-cursor'})
+        self.assertEqual(response.context['page_obj'].object_list[0].name, 'Planta 00')
+
+    def test_api_lists_are_cursor_paginated(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/v1/plants/')
+        self.assertEqual(len(response.data['results']), 20)
+        self.assertIn('cursor=', response.data['next'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual([p['name'] for p in response.data['results']],
+                         [f'Planta {i}' for i in range(20, 25)])
+        self.assertIsNone(response.data['next'])
+
+
+class PlantSearchIndexTest(APITestCase):
+    """Índice FTS5 del catálogo"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='search', password='pass12345')
+        defaults = dict(difficulty='easy', planting_season='spring', harvest_time_days=60,
+                        space_required=0.5, water_frequency=2)
+        self.zucchini = Plant.objects.create(
+            name='Calabacín', scientific_name='Cucurbita pepo', description='Crece rápido', **defaults)
+        self.tomato = Plant.objects.create(
+            name='Tomate Cherry', scientific_name='Solanum lycopersicum',
+            description='Fruto pequeño y dulce', **defaults)
+        self.basil = Plant.objects.create(
+            name='Albahaca', scientific_name='Ocimum basilicum',
+            description='Aromática, buena compañera del tomate', **defaults)
+
+    def search_names(self, query):
+        return [p.name for p in search_plants(Plant.objects.all(), query).order_by('search_rank', 'id')]
+
+    def test_prefix_and_accent_insensitive(self):
+        self.assertEqual(self.search_names('calabacin'), ['Calabacín'])
+        self.assertEqual(self.search_names('cucur'), ['Calabacín'])
+        self.assertEqual(self.search_names('dulc'), ['Tomate Cherry'])
+
+    def test_name_matches_rank_above_description(self):
+        self.assertEqual(self.search_names('tomate'), ['Tomate Cherry', 'Albahaca'])
+
+    def test_triggers_follow_updates_and_deletes(self):
+        self.tomato.name = 'Jitomate'
+        self.tomato.save()
+        self.assertEqual(self.search_names('jitom'), ['Jitomate'])
+        self.basil.delete()
+        self.assertEqual(self.search_names('albahaca'), [])
+
+    def test_catalog_and_api_use_index(self):
+        response = self.client.get(reverse('plants_catalog'), {'search': 'tomate'})
+        self.assertEqual([p.name for p in response.context['page_obj']], ['Tomate Cherry', 'Albahaca'])
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/v1/plants/search/', {'q': 'lycoper'})
+        self.assertEqual([p['name'] for p in response.data], ['Tomate Cherry'])
+
+    def test_large_result_sets_are_not_capped(self):
+        Plant.objects.bulk_create([
+            Plant(name=f'Tomate {i:03d}', description='', difficulty='easy', planting_season='spring',
+                  harvest_time_days=60, space_required=0.5, water_frequency=2)
+            for i in range(250)
+        ])
+        matches = search_plants(Plant.objects.all(), 'tomate')
+        facets = facet_counts(matches)
+        self.assertEqual(sum(value['count'] for value in facets['difficulty']), 252)
+
+        # Se recorre por keyset con el rank de bm25 hasta la última coincidencia
+        seen, cursor = [], None
+        while True:
+            page = keyset_page(matches, SEARCH_ORDERING, cursor, page_size=100)
+            seen.extend(plant.id for plant in page)
+            if not page.has_next():
+                break
+            cursor = page.next_cursor
+        self.assertEqual(len(seen), 252)
+        self.assertEqual(len(set(seen)), 252)
+
+
+class PlantSuggestIndexTest(APITestCase):
+    """Índice de trigramas para autocompletado"""
+
+    def setUp(self):
+        bump_catalog_version()
+        self.user = User.objects.create_user(username='suggest', password='pass12345')
+        defaults = dict(description='', difficulty='easy', planting_season='spring',
+                        harvest_time_days=60, space_required=0.5, water_frequency=2)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tomato = Plant.objects.create(name='Tomate Cherry', **defaults)
+            Plant.objects.create(name='Lechuga', **defaults)
+            Plant.objects.create(name='Zanahoria', **defaults)
+
+    def test_typo_tolerant_matches(self):
+        index = TrigramIndex.from_rows(1, Plant.objects.values_list('id', 'name'))
+        self.assertEqual(index.search('tomatte')[0][1], 'Tomate Cherry')
+        self.assertEqual(index.search('lechga')[0][1], 'Lechuga')
+        self.assertEqual(index.search('xyz'), [])
+
+    def test_incremental_updates_without_rebuild(self):
+        get_suggest_index()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tomato.name = 'Pimiento'
+            self.tomato.save()
+        # El índice ya tiene el cambio y la versión se revisó hace menos de VERSION_CHECK_SECONDS
+        with self.assertNumQueries(0):
+            names = [s['name'] for s in suggest_plants('pimiento')]
+        self.assertEqual(names, ['Pimiento'])
+
+    def test_rebuilds_after_change_from_another_process(self):
+        get_suggest_index()
+        # Otro proceso renombra y avanza la versión: aquí no corre ninguna señal
+        Plant.objects.filter(pk=self.tomato.pk).update(name='Pimiento')
+        bump_catalog_version()
+        later = time.monotonic() + VERSION_CHECK_SECONDS
+        with mock.patch('gardens.suggest.time.monotonic', return_value=later):
+            self.assertEqual([s['name'] for s in suggest_plants('pimiento')], ['Pimiento'])
+
+    def test_rare_trigram_scan_matches_full_scan(self):
+        names = [f'Tomate {word}' for word in ('cherry', 'pera', 'rosa', 'negro')] + \
+                ['Tomatillo', 'Zanahoria', 'Zapallo', 'Lechuga romana', 'Lechuga', 'Poroto']
+        index = TrigramIndex.from_rows(1, enumerate(names))
+        for query in ('tomatte', 'tomate ros', 'zanaoria', 'lechga', 'porto', 'to'):
+            query_grams = trigrams(query)
+            expected = set()
+            for plant_id, grams in index.grams.items():
+                if len(grams & query_grams) / len(query_grams) >= MIN_SIMILARITY:
+                    expected.add(plant_id)
+            found = {plant_id for plant_id, _, _ in index.search(query, limit=len(names))}
+            self.assertEqual(found, expected, query)
+
+    def test_suggest_endpoints(self):
+        response = self.client.get(reverse('plant_suggestions'), {'q': 'zanaoria'})
+        self.assertEqual(response.json()['suggestions'][0]['name'], 'Zanahoria')
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/v1/plants/suggest/', {'q': 'tomatte'})
+        self.assertEqual(response.data[0]['name'], 'Tomate Cherry')
+
+
+class PlantFacetsTest(APITestCase):
+    """Conteos por faceta del catálogo"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='facets', password='pass12345')
+        rows = [
+            ('Rabanito', 'easy', 'spring', 30, 0.1),
+            ('Lechuga', 'easy', 'all_year', 60, 0.2),
+            ('Tomate', 'medium', 'spring', 90, 0.5),
+            ('Alcachofa', 'hard', 'winter', 150, 2.0),
+        ]
+        for name, difficulty, season, harvest, space in rows:
+            Plant.objects.create(name=name, description='', difficulty=difficulty, planting_season=season,
+                                 harvest_time_days=harvest, space_required=space, water_frequency=2)
+
+    def counts(self, facets, name):
+        return {facet['value']: facet['count'] for facet in facets[name]}
+
+    def test_counts_in_one_query(self):
+        with self.assertNumQueries(1):
+            facets = facet_counts(Plant.objects.all())
+        self.assertEqual(self.counts(facets, 'difficulty'), {'easy': 2, 'medium': 1, 'hard': 1})
+        self.assertEqual(self.counts(facets, 'harvest'), {'short': 2, 'medium': 1, 'long': 1})
+        self.assertEqual(self.counts(facets, 'space'), {'small': 2, 'medium': 1, 'large': 1})
+        self.assertEqual(self.counts(facets, 'season')['spring'], 2)
+
+    def test_selection_narrows_other_facets_only(self):
+        facets = facet_counts(Plant.objects.all(), {'difficulty': 'easy'})
+        # La faceta elegida sigue mostrando las alternativas
+        self.assertEqual(self.counts(facets, 'difficulty'), {'easy': 2, 'medium': 1, 'hard': 1})
+        self.assertEqual(self.counts(facets, 'harvest'), {'short': 2, 'medium': 0, 'long': 0})
+
+    def test_catalog_and_api_facets(self):
+        response = self.client.get(reverse('plants_catalog'), {'harvest': 'short'})
+        self.assertEqual(len(response.context['page_obj']), 2)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get('/api/v1/plants/facets/', {'q': 'tomate'})
+        self.assertEqual(self.counts(response.data, 'difficulty'), {'easy': 0, 'medium': 1, 'hard': 0})
+
+
+class CatalogConditionalGetTest(APITestCase):
+    """Validadores ETag / Last-Modified del catálogo"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='etag', password='pass12345')
+        self.plant = Plant.objects.create(
+            name='Rabanito', description='', difficulty='easy', planting_season='spring',
+            harvest_time_days=30, space_required=0.1, water_frequency=2,
+        )
+
+    def test_catalog_pages_answer_304_with_one_query(self):
+        for url in (reverse('plants_catalog'), reverse('plant_detail', args=[self.plant.id])):
+            response = self.client.get(url)
+            self.assertIn('ETag', response)
+            self.assertIn('Last-Modified', response)
+            # Solo se lee la versión compartida del catálogo
+            with self.assertNumQueries(1):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+
+    def test_plant_write_changes_validators(self):
+        url = reverse('plant_detail', args=[self.plant.id])
+        etag = self.client.get(url)['ETag']
+        self.plant.water_frequency = 3
+        self.plant.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_version_bumped_elsewhere_changes_validators(self):
+        # Un comando u otro worker avanza la versión directamente en la BD
+        url = reverse('plants_catalog')
+        etag = self.client.get(url)['ETag']
+        CatalogVersion.objects.filter(pk=1).update(version=get_catalog_version() + 1)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_api_list_and_retrieve(self):
+        self.client.force_authenticate(user=self.user)
+        for url in ('/api/v1/plants/', f'/api/v1/plants/{self.plant.id}/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            with self.assertNumQueries(1):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+
+
+class CultivationPlanListQueryTest(APITestCase):
+    """Consultas del listado de planes de cultivo"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='plans', password='pass12345')
+        garden = Garden.objects.create(owner=self.user, name='Huerto', location='Santiago, Chile',
+                                       size_m2=10, soil_type='loamy', sun_exposure='full_sun')
+        for i in range(10):
+            plant = Plant.objects.create(
+                name=f'Planta {i}', description='', difficulty='easy', planting_season='spring',
+                harvest_time_days=30, space_required=0.1, water_frequency=2,
+            )
+            CultivationPlan.objects.create(
+                garden=garden, plant=plant, status='active', planting_date=date(2024, 9, 1),
+                expected_harvest_date=date(2024, 10, 1), ai_recommendations={'score': i},
+            )
+        self.client.force_authenticate(user=self.user)
+
+    def test_list_does_not_query_per_row(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/v1/cultivation-plans/')
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(response.data['results'][0]['garden_name'], 'Huerto')
+
+    def test_fast_mode_matches_serializer(self):
+        response = self.client.get('/api/v1/cultivation-plans/')
+        with self.assertNumQueries(1):
+            fast = self.client.get('/api/v1/cultivation-plans/', {'mode': 'fast'})
+        self.assertEqual(fast.json()['results'], response.json()['results'])
+
+
+class StreamingExportTest(APITestCase):
+    """Exportación en streaming de jardines y planes"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='export', email='export@example.com', password='pass12345')
+        other = User.objects.create_user(username='other-export', email='other-export@example.com', password='pass12345')
+        plant = Plant.objects.create(
+            name='Rabanito', description='', difficulty='easy', planting_season='spring',
+            harvest_time_days=30, space_required=0.1, water_frequency=2,
+        )
+        for owner, name in ((self.user, 'Huerto, "norte"'), (self.user, 'Balcón'), (other, 'Ajeno')):
+            garden = Garden.objects.create(owner=owner, name=name, location='Santiago, Chile',
+                                           size_m2=4, soil_type='loamy', sun_exposure='full_sun')
+            CultivationPlan.objects.create(garden=garden, plant=plant, planting_date=date(2024, 9, 1),
+                                           expected_harvest_date=date(2024, 10, 1))
+        self.client.force_authenticate(user=self.user)
+
+    def read(self, response):
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson_export_only_own_rows(self):
+        response = self.client.get('/api/v1/gardens/export/')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual([row['name'] for row in rows], ['Huerto, "norte"', 'Balcón'])
+        self.assertEqual(rows[0]['owner'], 'export')
+
+    def test_csv_export(self):
+        response = self.client.get('/api/v1/cultivation-plans/export/', {'fmt': 'csv'})
+        rows = list(csv.reader(io.StringIO(self.read(response))))
+        self.assertEqual(rows[0][:3], ['id', 'garden', 'garden_name'])
+        self.assertEqual([row[2] for row in rows[1:]], ['Huerto, "norte"', 'Balcón'])
+        self.assertEqual(rows[1][6], '2024-09-01')
+
+    def test_invalid_format(self):
+        response = self.client.get('/api/v1/gardens/export/', {'fmt': 'xml'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BulkImportTest(APITestCase):
+    """Importación masiva de plantas y jardines"""
+
+    PLANT_CSV = (
+        'name,scientific_name,description,difficulty,planting_season,harvest_time_days,space_required,water_frequency\n'
+        'Rabanito,Raphanus sativus,Raíz rápida,easy,spring,30,0.1,2\n'
+        'Lechuga,Lactuca sativa,Hoja verde,easy,all_year,45,0.25,2\n'
+        'Acelga,,Hoja,imposible,spring,60,0.3,3\n'
+        'Rabanito,,Repetida,easy,spring,30,0.1,2\n'
+    )
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', email='admin@example.com', password='pass12345')
+        self.user = User.objects.create_user(username='huertera', email='huertera@example.com', password='pass12345')
+        Plant.objects.create(
+            name='Lechuga', description='Antigua', difficulty='medium', planting_season='spring',
+            harvest_time_days=60, space_required=0.5, water_frequency=3,
+        )
+
+    def test_plant_upsert_with_row_errors(self):
+        version = get_catalog_version()
+        with self.captureOnCommitCallbacks(execute=True):
+            report = import_plants(read_rows(io.StringIO(self.PLANT_CSV), 'csv'))
+        self.assertEqual((report.created, report.updated), (1, 1))
+        self.assertEqual([error['row'] for error in report.errors], [3, 4])
+        self.assertIn('difficulty', report.errors[0]['errors'])
+
+        lettuce = Plant.objects.get(name='Lechuga')
+        self.assertEqual((lettuce.difficulty, lettuce.description), ('easy', 'Hoja verde'))
+        # Sin señales: versión del catálogo, contadores e índice de búsqueda al día
+        self.assertGreater(get_catalog_version(), version)
+        self.assertEqual(get_counters().total_plants, 2)
+        self.assertEqual([p.name for p in search_plants(Plant.objects.all(), 'raphanus')], ['Rabanito'])
+
+    def test_unreadable_lines_are_reported_per_row(self):
+        ndjson = (
+            '{"name": "Apio", "description": "Tallo", "difficulty": "medium", "planting_season": "autumn",'
+            ' "harvest_time_days": 90, "space_required": 0.3, "water_frequency": 2}\n'
+            '{"name": "Roto", \n'
+            '\n'
+            '{"name": "Puerro", "description": "Tallo", "difficulty": "easy", "planting_season": "autumn",'
+            ' "harvest_time_days": 120, "space_required": 0.2, "water_frequency": 2}\n'
+        )
+        report = import_plants(read_rows(io.StringIO(ndjson), 'ndjson'), batch_size=1)
+        self.assertEqual(report.created, 2)
+        self.assertEqual([error['row'] for error in report.errors], [2])
+        self.assertIn('JSON inválido', report.errors[0]['errors']['__all__'][0])
+
+        header, *lines = self.PLANT_CSV.splitlines(keepends=True)
+        huge = 'Enorme,,' + 'x' * (csv.field_size_limit() + 1) + ',easy,spring,30,0.1,2\n'
+        report = import_plants(read_rows(io.StringIO(header + huge + lines[0]), 'csv'))
+        self.assertEqual(report.created, 1)
+        self.assertIn('CSV inválido', report.errors[0]['errors']['__all__'][0])
+
+    def test_missing_columns_keep_stored_values(self):
+        Plant.objects.filter(name='Lechuga').update(scientific_name='Lactuca sativa')
+        rows = [{'name': 'Lechuga', 'description': 'Hoja verde', 'difficulty': 'easy', 'planting_season': 'all_year',
+                 'harvest_time_days': 45, 'space_required': 0.25, 'water_frequency': 2}]
+        report = import_plants(rows)
+        self.assertEqual(report.updated, 1)
+        lettuce = Plant.objects.get(name='Lechuga')
+        self.assertEqual((lettuce.description, lettuce.scientific_name), ('Hoja verde', 'Lactuca sativa'))
+
+    def test_garden_import_resolves_owner_and_location(self):
+        rows = [
+            {'owner': 'huertera', 'name': 'Terraza', 'location': 'Stgo', 'size_m2': '6',
+             'soil_type': 'loamy', 'sun_exposure': 'full_sun'},
+            {'owner': 'nadie', 'name': 'Huerto', 'location': 'Talca', 'size_m2': '6',
+             'soil_type': 'loamy', 'sun_exposure': 'full_sun'},
+        ]
+        report = import_gardens(rows)
+        self.assertEqual(report.created, 1)
+        self.assertIn('owner', report.errors[0]['errors'])
+
+        garden = Garden.objects.get(name='Terraza')
+        self.assertEqual((garden.owner, garden.location_key), (self.user, 'cl-santiago'))
+
+        report = import_gardens([dict(rows[0], id=garden.id, name='Terraza sur')])
+        self.assertEqual((report.created, report.updated), (0, 1))
+        self.assertEqual(Garden.objects.get(pk=garden.pk).name, 'Terraza sur')
+
+    def test_import_endpoint_is_admin_only(self):
+        rows = [{'name': 'Apio', 'description': 'Tallo', 'difficulty': 'medium', 'planting_season': 'autumn',
+                 'harvest_time_days': 90, 'space_required': 0.3, 'water_frequency': 2}]
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post('/api/v1/plants/import/', rows, format='json')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+        self.client.force_authenticate(user=self.admin)
+        response = self.client.post('/api/v1/plants/import/', rows, format='json')
+        self.assertEqual(response.data, {'created': 1, 'updated': 0, 'errors': []})
+
+        upload = SimpleUploadedFile('catalogo.csv', self.PLANT_CSV.encode())
+        response = self.client.post('/api/v1/plants/import/', {'file': upload}, format='multipart')
+        self.assertEqual((response.data['created'], response.data['updated']), (1, 1))
+
+    def test_command_writes_report(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'catalogo.csv')
+            report_path = os.path.join(directory, 'reporte.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.PLANT_CSV)
+            call_command('bulk_import', 'plants', path, '--report', report_path, stdout=io.StringIO())
+            with open(report_path, encoding='utf-8') as f:
+                report = json.load(f)
+        self.assertEqual(len(report['errors']), 2)
+        self.assertTrue(Plant.objects.filter(name='Rabanito').exists())
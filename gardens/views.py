@@ -1,127 +1,240 @@
-from rest_framework import viewsets, status, permissions
-from rest_framework.decorators import action
-from rest_framework.response import Response
-from django_ratelimit.decorators import ratelimit
-from django.utils.decorators import method_decorator
-from django.contrib.auth import get_user_model
-from django.db import models
-from .models import Garden, Plant, CultivationPlan
-from .serializers import GardenSerializer, PlantSerializer, CultivationPlanSerializer
-import logging
-
-logger = logging.getLogger(__name__)
-User = get_user_model()
-
-class IsOwnerOrReadOnly(permissions.BasePermission):
-    """
-    Permiso personalizado para permitir solo al dueño editar sus objetos
-    """
-    def has_object_permission(self, request, view, obj):
-        # Permisos de lectura para cualquier request,
-        # Permisos de escritura solo para el dueño del objeto
-        if request.method in permissions.SAFE_METHODS:
-            return True
-        return obj.owner == request.user
-
-@method_decorator(ratelimit(key='user', rate='100/h', method='GET'), name='list')
-@method_decorator(ratelimit(key='user', rate='20/h', method='POST'), name='create')
-class GardenViewSet(viewsets.ModelViewSet):
-    serializer_class = GardenSerializer
-    permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
-    
-    def get_queryset(self):
-        # CRÍTICO: Filtrar solo jardines del usuario autenticado
-        return Garden.objects.filter(owner=self.request.user).select_related('owner')
-    
-    def perform_create(self, serializer):
-        # CRÍTICO: Asignar automáticamente el usuario como propietario
-        serializer.save(owner=self.request.user)
-        logger.info(f"Garden created by user {self.request.user.id}")
-
-@method_decorator(ratelimit(key='ip', rate='200/h', method='GET'), name='list')
-class PlantViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Plant.objects.all()
-    serializer_class = PlantSerializer
-    permission_classes = [permissions.IsAuthenticated]
-    
-    @action(detail=False, methods=['get'])
-    def by_difficulty(self, request):
-        """Filtrar plantas por nivel de dificultad"""
-        difficulty = request.query_params.get('level', 'easy')
-        
-        # Validación estricta de entrada para prevenir injection
-        valid_difficulties = ['easy', 'medium', 'hard']
-        if difficulty not in valid_difficulties:
-            return Response(
-                {'error': 'Nivel de dificultad inválido. Opciones: easy, medium, hard'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        plants = Plant.objects.filter(difficulty=difficulty)
-        serializer = self.get_serializer(plants, many=True)
-        return Response(serializer.data)
-    
-    @action(detail=False, methods=['get'])
-    def search(self, request):
-        """Búsqueda segura de plantas"""
-        query = request.query_params.get('q', '').strip()
-        
-        # Validación de entrada
-        if len(query) < 2:
-            return Response(
-                {'error': 'La búsqueda debe tener al menos 2 caracteres'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Sanitización básica
-        if not query.replace(' ', '').isalnum():
-            return Response(
-                {'error': 'La búsqueda solo puede contener letras, números y espacios'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        # Búsqueda segura usando ORM (previene SQL injection)
-        plants = Plant.objects.filter(
-            models.Q(name__icontains=query) | 
-            models.Q(scientific_name__icontains=query)
-        )[:20]  # Limitar resultados
-        
-        serializer = self.get_serializer(plants, many=True)
-        return Response(serializer.data)
-
-@method_decorator(ratelimit(key='user', rate='50/h', method='POST'), name='create')
-class CultivationPlanViewSet(viewsets.ModelViewSet):
-    serializer_class = CultivationPlanSerializer
-    permission_classes = [permissions.IsAuthenticated]
-    
-    def get_queryset(self):
-        # Solo planes de jardines del usuario autenticado
-        return CultivationPlan.objects.filter(garden__owner=self.request.user)
-    
-    def perform_create(self, serializer):
-        garden = serializer.validated_data['garden']
-        # Verificar que el jardín pertenece al usuario (control de acceso)
-        if garden.owner != self.request.user:
-            raise permissions.PermissionDenied("No tienes permiso para este jardín")
-        serializer.save()
-        logger.info(f"Cultivation plan created by user {self.request.user.id}")
-    
-    @action(detail=True, methods=['post'])
-    def update_status(self, request, pk=None):
-        """Actualizar estado del plan de cultivo"""
-        plan = self.get_object()
-        new_status = request.data.get('status')
-        
-        # Validación de estado
-        valid_statuses = ['planned', 'active', 'completed', 'failed']
-        if new_status not in valid_statuses:
-            return Response(
-                {'error': 'Estado inválido'}, 
-                status=status.HTTP_400_BAD_REQUEST
-            )
-        
-        plan.status = new_status
-        plan.save()
-        
-        serializer = self.get_serializer(plan)
+from rest_framework import viewsets, status, permissions
+from rest_framework.decorators import action
+from rest_framework.parsers import JSONParser, MultiPartParser
+from rest_framework.response import Response
+from django_ratelimit.decorators import ratelimit
+from django.utils.decorators import method_decorator
+from django.contrib.auth import get_user_model
+from django.views.decorators.http import condition
+from .bulk_import import IMPORT_FORMATS, import_gardens, import_plants, read_rows
+from .catalog import catalog_etag, catalog_last_modified
+from .models import Garden, Plant, CultivationPlan
+from .serializers import (
+    GardenSerializer, PlantSerializer, CultivationPlanSerializer, PLAN_FAST_LOOKUPS, cultivation_plan_row
+)
+from .pagination import PlantCursorPagination, RecentCursorPagination
+from .export import CONTENT_TYPES, GARDEN_EXPORT_FIELDS, PLAN_EXPORT_FIELDS, export_response
+from .facets import facet_counts, selected_facets
+from .search import search_plants
+from .suggest import suggest_plants
+import io
+import logging
+
+logger = logging.getLogger(__name__)
+User = get_user_model()
+
+class IsOwnerOrReadOnly(permissions.BasePermission):
+    """
+    Permiso personalizado para permitir solo al dueño editar sus objetos
+    """
+    def has_object_permission(self, request, view, obj):
+        # Permisos de lectura para cualquier request,
+        # Permisos de escritura solo para el dueño del objeto
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        return obj.owner == request.user
+
+def stream_export(request, queryset, fields, filename):
+    export_format = request.query_params.get('fmt', 'ndjson')
+    if export_format not in CONTENT_TYPES:
+        return Response(
+            {'error': 'Formato inválido. Opciones: ndjson, csv'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    logger.info(f"Export of {filename} by user {request.user.id}")
+    return export_response(queryset.order_by('id'), fields, export_format, filename)
+
+def run_import(request, importer):
+    """
+    Filas como lista JSON en el cuerpo o como archivo `file` (csv, json o ndjson)
+    """
+    upload = request.FILES.get('file')
+    if upload is not None:
+        import_format = request.data.get('fmt') or upload.name.rsplit('.', 1)[-1].lower()
+        if import_format not in IMPORT_FORMATS:
+            return Response(
+                {'error': 'Formato inválido. Opciones: csv, json, ndjson'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            rows = read_rows(io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''), import_format)
+            report = importer(rows)
+        except (ValueError, UnicodeDecodeError) as e:
+            return Response({'error': f'Archivo inválido: {e}'}, status=status.HTTP_400_BAD_REQUEST)
+    elif isinstance(request.data, list):
+        report = importer(request.data)
+    else:
+        return Response(
+            {'error': 'Envía una lista de filas o un archivo en el campo "file"'}, 
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    logger.info(f"Bulk import by user {request.user.id}: {report.created} created, "
+                f"{report.updated} updated, {len(report.errors)} errors")
+    return Response(report.to_dict())
+
+@method_decorator(ratelimit(key='user', rate='100/h', method='GET'), name='list')
+@method_decorator(ratelimit(key='user', rate='20/h', method='POST'), name='create')
+class GardenViewSet(viewsets.ModelViewSet):
+    serializer_class = GardenSerializer
+    permission_classes = [permissions.IsAuthenticated, IsOwnerOrReadOnly]
+    pagination_class = RecentCursorPagination
+    
+    def get_queryset(self):
+        # CRÍTICO: Filtrar solo jardines del usuario autenticado
+        return Garden.objects.filter(owner=self.request.user).select_related('owner')
+    
+    def perform_create(self, serializer):
+        # CRÍTICO: Asignar automáticamente el usuario como propietario
+        serializer.save(owner=self.request.user)
+        logger.info(f"Garden created by user {self.request.user.id}")
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Exportación completa en streaming (?fmt=ndjson|csv)"""
+        return stream_export(request, self.get_queryset(), GARDEN_EXPORT_FIELDS, 'jardines')
+    
+    @action(detail=False, methods=['post'], url_path='import',
+            permission_classes=[permissions.IsAdminUser], parser_classes=[JSONParser, MultiPartParser])
+    def bulk_import(self, request):
+        """Importación masiva de jardines (solo administradores)"""
+        return run_import(request, import_gardens)
+
+def plant_api_etag(request, pk=None, **kwargs):
+    # Cada representación (JSON, API navegable) tiene su propio validador
+    renderer = getattr(request, 'accepted_renderer', None)
+    return catalog_etag(request, 'api', renderer.format if renderer else '', pk or 'list')
+
+def plant_api_last_modified(request, *args, **kwargs):
+    return catalog_last_modified(request)
+
+plant_conditional = condition(etag_func=plant_api_etag, last_modified_func=plant_api_last_modified)
+
+@method_decorator(ratelimit(key='ip', rate='200/h', method='GET'), name='list')
+@method_decorator(plant_conditional, name='list')
+@method_decorator(plant_conditional, name='retrieve')
+class PlantViewSet(viewsets.ReadOnlyModelViewSet):
+    queryset = Plant.objects.all()
+    serializer_class = PlantSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PlantCursorPagination
+    
+    @action(detail=False, methods=['get'])
+    def by_difficulty(self, request):
+        """Filtrar plantas por nivel de dificultad"""
+        difficulty = request.query_params.get('level', 'easy')
+        
+        # Validación estricta de entrada para prevenir injection
+        valid_difficulties = ['easy', 'medium', 'hard']
+        if difficulty not in valid_difficulties:
+            return Response(
+                {'error': 'Nivel de dificultad inválido. Opciones: easy, medium, hard'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        page = self.paginate_queryset(Plant.objects.filter(difficulty=difficulty))
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Búsqueda segura de plantas"""
+        query = request.query_params.get('q', '').strip()
+        
+        # Validación de entrada
+        if len(query) < 2:
+            return Response(
+                {'error': 'La búsqueda debe tener al menos 2 caracteres'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Sanitización básica
+        if not query.replace(' ', '').isalnum():
+            return Response(
+                {'error': 'La búsqueda solo puede contener letras, números y espacios'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Índice de texto completo con parámetros (previene SQL injection), por relevancia
+        plants = search_plants(Plant.objects.all(), query).order_by('search_rank', 'id')[:20]  # Limitar resultados
+        
+        serializer = self.get_serializer(plants, many=True)
+        return Response(serializer.data)
+
+    @action(detail=False, methods=['post'], url_path='import',
+            permission_classes=[permissions.IsAdminUser], parser_classes=[JSONParser, MultiPartParser])
+    def bulk_import(self, request):
+        """Importación masiva del catálogo por nombre (solo administradores)"""
+        return run_import(request, import_plants)
+    
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """Conteos por faceta de la búsqueda actual (q opcional), en una consulta"""
+        plants = Plant.objects.all()
+        query = request.query_params.get('q', '').strip()
+        if query:
+            plants = search_plants(plants, query[:100])
+        return Response(facet_counts(plants, selected_facets(request.query_params)))
+    
+    @action(detail=False, methods=['get'])
+    def suggest(self, request):
+        """Sugerencias tolerantes a errores de tipeo, sin consultar la BD"""
+        query = request.query_params.get('q', '').strip()
+        if len(query) < 2:
+            return Response(
+                {'error': 'La búsqueda debe tener al menos 2 caracteres'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(suggest_plants(query[:100]))
+
+@method_decorator(ratelimit(key='user', rate='50/h', method='POST'), name='create')
+class CultivationPlanViewSet(viewsets.ModelViewSet):
+    serializer_class = CultivationPlanSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = RecentCursorPagination
+    
+    def get_queryset(self):
+        # Solo planes de jardines del usuario autenticado; el serializer lee jardín y planta
+        return CultivationPlan.objects.filter(garden__owner=self.request.user).select_related('garden', 'plant')
+    
+    def list(self, request, *args, **kwargs):
+        """Con ?mode=fast arma el JSON desde values(), sin instancias ni serializer"""
+        if request.query_params.get('mode') != 'fast':
+            return super().list(request, *args, **kwargs)
+        
+        rows = self.filter_queryset(self.get_queryset()).values(*PLAN_FAST_LOOKUPS)
+        page = self.paginate_queryset(rows)
+        return self.get_paginated_response([cultivation_plan_row(row) for row in page])
+    
+    def perform_create(self, serializer):
+        garden = serializer.validated_data['garden']
+        # Verificar que el jardín pertenece al usuario (control de acceso)
+        if garden.owner != self.request.user:
+            raise permissions.PermissionDenied("No tienes permiso para este jardín")
+        serializer.save()
+        logger.info(f"Cultivation plan created by user {self.request.user.id}")
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Exportación completa en streaming (?fmt=ndjson|csv)"""
+        return stream_export(request, self.get_queryset(), PLAN_EXPORT_FIELDS, 'planes')
+    
+    @action(detail=True, methods=['post'])
+    def update_status(self, request, pk=None):
+        """Actualizar estado del plan de cultivo"""
+        plan = self.get_object()
+        new_status = request.data.get('status')
+        
+        # Validación de estado
+        valid_statuses = ['planned', 'active', 'completed', 'failed']
+        if new_status not in valid_statuses:
+            return Response(
+                {'error': 'Estado inválido'}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        plan.status = new_status
+        plan.save()
+        
+        serializer = self.get_serializer(plan)
         return Response(serializer.data)
\ No newline at end of file
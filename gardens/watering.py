@@ -0,0 +1,127 @@
+from datetime import date, datetime
+from itertools import groupby
+from operator import itemgetter
+import numpy as np
+from django.utils import timezone
+from core import dashboard
+from core.weather_service import WeatherService
+from .models import CultivationPlan, WateringSchedule
+
+# Iconos y palabras del pronóstico que cuentan como lluvia
+RAIN_ICONS = {'rainy', 'stormy'}
+RAIN_WORDS = ('lluvia', 'rain', 'chubasco', 'tormenta')
+
+
+def rain_days(forecast, today: date) -> np.ndarray:
+    """
+    Máscara por día desde hoy (0 = hoy) de los días con lluvia pronosticada
+    """
+    horizon = 0
+    rainy = []
+    for day in forecast:
+        offset = (datetime.strptime(day['date'], '%Y-%m-%d').date() - today).days
+        if offset < 0:
+            continue
+        description = day.get('description', '').lower()
+        if day.get('icon') in RAIN_ICONS or any(word in description for word in RAIN_WORDS):
+            rainy.append(offset)
+        horizon = max(horizon, offset + 1)
+
+    mask = np.zeros(horizon, dtype=bool)
+    mask[rainy] = True
+    return mask
+
+
+def next_watering_offsets(days_since_planting: np.ndarray, frequency: np.ndarray,
+                          rain: np.ndarray, irrigated: np.ndarray = None):
+    """
+    Días hasta el próximo riego de cada plan (vectorizado sobre todos los planes).
+    Los riegos siguen el ciclo de `frequency` días desde la siembra; un día de
+    lluvia cuenta como riego y reinicia el ciclo de los planes que aún no se regaron.
+    Los planes de jardines con riego automático (`irrigated`) siguen su programa
+    fijo y no se postergan por lluvia.
+    Devuelve (días hasta el riego, días de postergación por lluvia).
+    """
+    frequency = np.maximum(frequency, 1)
+    # Planes que aún no se siembran: primer riego el día de siembra
+    planting_offset = np.maximum(-days_since_planting, 0)
+    due = np.where(days_since_planting < 0, planting_offset, (-days_since_planting) % frequency)
+    base = due.copy()
+    rain_fed = True if irrigated is None else ~irrigated
+
+    for day in np.flatnonzero(rain):
+        watered = rain_fed & (due >= day) & (planting_offset <= day)
+        due = np.where(watered, day + frequency, due)
+
+    return due, due - base
+
+
+def _schedule_region(rows, forecast, today: date, now):
+    """
+    Calcula los riegos de todos los planes activos de una región en una pasada
+    """
+    plan_ids, planting_dates, frequencies, irrigation = zip(*(row[:4] for row in rows))
+    planting = np.array(planting_dates, dtype='datetime64[D]')
+    days_since = (np.datetime64(today, 'D') - planting).astype(np.int64)
+
+    due, delay = next_watering_offsets(
+        days_since, np.array(frequencies, dtype=np.int64), rain_days(forecast, today),
+        np.array(irrigation, dtype=bool),
+    )
+    next_dates = (np.datetime64(today, 'D') + due).tolist()
+
+    return [
+        WateringSchedule(
+            plan_id=plan_id,
+            next_watering_date=next_date,
+            method='irrigation' if has_irrigation else 'manual',
+            rain_delay_days=int(rain_delay),
+            location_key=rows[0][4],
+            computed_at=now,
+        )
+        for plan_id, next_date, has_irrigation, rain_delay in zip(plan_ids, next_dates, irrigation, delay)
+    ]
+
+
+def update_watering_schedules(location_keys=None, today: date = None, batch_size: int = 2000,
+                              service: WeatherService = None) -> int:
+    """
+    Recalcula el próximo riego de los planes activos, región por región
+    (una consulta de pronóstico por región). Con `location_keys` solo esas regiones,
+    por ejemplo tras actualizarse su pronóstico.
+    """
+    service = service or WeatherService()
+    today = today or timezone.localdate()
+    now = timezone.now()
+
+    plans = CultivationPlan.objects.filter(status='active')
+    if location_keys is not None:
+        plans = plans.filter(garden__location_key__in=list(location_keys))
+    else:
+        # Los planes que dejaron de estar activos ya no tienen riego programado
+        WateringSchedule.objects.exclude(plan__status='active').delete()
+
+    rows = (
+        plans
+        .order_by('garden__location_key', 'id')
+        .values_list('id', 'planting_date', 'plant__water_frequency', 'garden__has_irrigation',
+                     'garden__location_key', 'garden__location', 'garden__owner_id')
+        .iterator(chunk_size=batch_size)
+    )
+
+    total = 0
+    for location_key, region_rows in groupby(rows, key=itemgetter(4)):
+        region_rows = list(region_rows)
+        forecast = service.get_weekly_forecast(region_rows[0][5], location_key or None)
+        schedules = _schedule_region(region_rows, forecast, today, now)
+        WateringSchedule.objects.bulk_create(
+            schedules,
+            batch_size=batch_size,
+            update_conflicts=True,
+            unique_fields=['plan'],
+            update_fields=['next_watering_date', 'method', 'rain_delay_days', 'location_key', 'computed_at'],
+        )
+        total += len(schedules)
+        # Los dashboards de estos usuarios muestran los riegos recién calculados
+        dashboard.invalidate_waterings({row[6] for row in region_rows})
+    return total
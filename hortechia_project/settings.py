@@ -1,159 +1,236 @@
-from pathlib import Path
-import os
-from decouple import config
-
-BASE_DIR = Path(__file__).resolve().parent.parent
-
-SECRET_KEY = config('SECRET_KEY', default='django-insecure-dev-key-change-in-production')
-DEBUG = config('DEBUG', default=True, cast=bool)
-
-ALLOWED_HOSTS = ['localhost', '127.0.0.1', '*.pythonanywhere.com']
-
-# Application definition
-INSTALLED_APPS = [
-    'django.contrib.admin',
-    'django.contrib.auth',
-    'django.contrib.contenttypes',
-    'django.contrib.sessions',
-    'django.contrib.messages',
-    'django.contrib.staticfiles',
-    'rest_framework',
-    'corsheaders',
-    'core',
-    'gardens',
-    'ai_recommendations',
-]
-
-MIDDLEWARE = [
-    'corsheaders.middleware.CorsMiddleware',
-    'django.middleware.security.SecurityMiddleware',
-    'django.contrib.sessions.middleware.SessionMiddleware',
-    'django.middleware.common.CommonMiddleware',
-    'django.middleware.csrf.CsrfViewMiddleware',
-    'django.contrib.auth.middleware.AuthenticationMiddleware',
-    'django.contrib.messages.middleware.MessageMiddleware',
-    'django.middleware.clickjacking.XFrameOptionsMiddleware',
-]
-
-ROOT_URLCONF = 'hortechia_project.urls'
-
-TEMPLATES = [
-    {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [BASE_DIR / 'templates'],
-        'APP_DIRS': True,
-        'OPTIONS': {
-            'context_processors': [
-                'django.template.context_processors.debug',
-                'django.template.context_processors.request',
-                'django.contrib.auth.context_processors.auth',
-                'django.contrib.messages.context_processors.messages',
-            ],
-        },
-    },
-]
-
-WSGI_APPLICATION = 'hortechia_project.wsgi.application'
-
-# Database - CORREGIDO: Usar SQLite para desarrollo
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
-
-# Custom user model
-AUTH_USER_MODEL = 'core.CustomUser'
-
-# Password validation
-AUTH_PASSWORD_VALIDATORS = [
-    {
-        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
-    },
-    {
-        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
-    },
-]
-
-# Authentication backends
-AUTHENTICATION_BACKENDS = [
-    'core.backends.EmailBackend',  # Nuestro backend personalizado
-    'django.contrib.auth.backends.ModelBackend',  # Backend por defecto como fallback
-]
-
-# REST Framework configuration
-REST_FRAMEWORK = {
-    'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.SessionAuthentication',
-    ],
-    'DEFAULT_PERMISSION_CLASSES': [
-        'rest_framework.permissions.IsAuthenticated',
-    ],
-    'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
-    ]
-}
-
-# CORS settings
-CORS_ALLOWED_ORIGINS = [
-    "http://localhost:3000",
-    "http://127.0.0.1:3000",
-]
-
-CORS_ALLOW_ALL_ORIGINS = DEBUG
-
-# Security settings (OWASP compliance)
-SECURE_BROWSER_XSS_FILTER = True
-SECURE_CONTENT_TYPE_NOSNIFF = True
-X_FRAME_OPTIONS = 'DENY'
-CSRF_COOKIE_SECURE = not DEBUG
-SESSION_COOKIE_SECURE = not DEBUG
-SECURE_HSTS_SECONDS = 31536000 if not DEBUG else 0
-
-# Internationalization
-LANGUAGE_CODE = 'es-es'
-TIME_ZONE = 'America/Santiago'
-USE_I18N = True
-USE_TZ = True
-
-# Static files (CSS, JavaScript, Images)
-STATIC_URL = '/static/'
-STATIC_ROOT = BASE_DIR / 'staticfiles'
-STATICFILES_DIRS = [BASE_DIR / 'static']
-
-# Media files
-MEDIA_URL = '/media/'
-MEDIA_ROOT = BASE_DIR / 'media'
-
-DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
-
-# Logging configuration
-LOGGING = {
-    'version': 1,
-    'disable_existing_loggers': False,
-    'handlers': {
-        'file': {
-            'level': 'INFO',
-            'class': 'logging.FileHandler',
-            'filename': 'django.log',
-        },
-    },
-    'loggers': {
-        'django': {
-            'handlers': ['file'],
-            'level': 'INFO',
-            'propagate': True,
-        },
-    },
-}
-
-# API del Clima
-OPENWEATHER_API_KEY = config('OPENWEATHER_API_KEY', default='')
\ No newline at end of file
+from pathlib import Path
+import os
+from decouple import config
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+SECRET_KEY = config('SECRET_KEY', default='django-insecure-dev-key-change-in-production')
+DEBUG = config('DEBUG', default=True, cast=bool)
+
+ALLOWED_HOSTS = ['localhost', '127.0.0.1', '*.pythonanywhere.com']
+
+# Application definition
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'rest_framework',
+    'corsheaders',
+    'core',
+    'gardens',
+    'ai_recommendations',
+]
+
+MIDDLEWARE = [
+    'corsheaders.middleware.CorsMiddleware',
+    'django.middleware.security.SecurityMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'hortechia_project.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.debug',
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'hortechia_project.wsgi.application'
+
+# Database - CORREGIDO: Usar SQLite para desarrollo
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+    }
+}
+
+# Cachés en archivos: compartidas entre workers y comandos de gestión
+CACHE_DIR = config('CACHE_DIR', default=str(BASE_DIR / 'var' / 'cache'))
+
+# Cache
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # Resultados del recomendador: TTL de 1 hora y expulsión LRU al superar MAX_ENTRIES
+    'recommendations': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'recommendations',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # Partes del dashboard por usuario; se invalidan por señales y desde comandos
+    # (core.dashboard), así que la caché tiene que ser visible para todos los procesos
+    'dashboard': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(CACHE_DIR, 'dashboard'),
+        'TIMEOUT': 24 * 60 * 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 20000,
+        },
+    },
+    # Clima por ubicación normalizada: el TTL lo fija core.weather_cache por entrada.
+    # En archivos para que lo que precalienta prefetch_weather llegue a los workers;
+    # al llenarse borra entradas al azar, así que delante va 'weather_local'
+    'weather': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.path.join(CACHE_DIR, 'weather'),
+        'TIMEOUT': None,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+    # Nivel por proceso de la caché de clima: expulsa de a una la entrada menos
+    # usada (CULL_FREQUENCY = MAX_ENTRIES), es decir, LRU estricto
+    'weather_local': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'weather',
+        'OPTIONS': {
+            'MAX_ENTRIES': 1000,
+            'CULL_FREQUENCY': 1000,
+        },
+    },
+}
+
+# Custom user model
+AUTH_USER_MODEL = 'core.CustomUser'
+
+# Password validation
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+# Authentication backends
+AUTHENTICATION_BACKENDS = [
+    'core.backends.EmailBackend',  # Nuestro backend personalizado
+    'django.contrib.auth.backends.ModelBackend',  # Backend por defecto como fallback
+]
+
+# REST Framework configuration
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        'rest_framework.authentication.SessionAuthentication',
+    ],
+    'DEFAULT_PERMISSION_CLASSES': [
+        'rest_framework.permissions.IsAuthenticated',
+    ],
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ]
+}
+
+# CORS settings
+CORS_ALLOWED_ORIGINS = [
+    "http://localhost:3000",
+    "http://127.0.0.1:3000",
+]
+
+CORS_ALLOW_ALL_ORIGINS = DEBUG
+
+# Security settings (OWASP compliance)
+SECURE_BROWSER_XSS_FILTER = True
+SECURE_CONTENT_TYPE_NOSNIFF = True
+X_FRAME_OPTIONS = 'DENY'
+CSRF_COOKIE_SECURE = not DEBUG
+SESSION_COOKIE_SECURE = not DEBUG
+SECURE_HSTS_SECONDS = 31536000 if not DEBUG else 0
+
+# Internationalization
+LANGUAGE_CODE = 'es-es'
+TIME_ZONE = 'America/Santiago'
+USE_I18N = True
+USE_TZ = True
+
+# Static files (CSS, JavaScript, Images)
+STATIC_URL = '/static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+STATICFILES_DIRS = [BASE_DIR / 'static']
+
+# Media files
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Logging configuration
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'file': {
+            'level': 'INFO',
+            'class': 'logging.FileHandler',
+            'filename': 'django.log',
+        },
+    },
+    'loggers': {
+        'django': {
+            'handlers': ['file'],
+            'level': 'INFO',
+            'propagate': True,
+        },
+    },
+}
+
+# API del Clima
+OPENWEATHER_API_KEY = config('OPENWEATHER_API_KEY', default='')
+# 'simulated' (datos de prototipo) u 'openweathermap' (API real)
+WEATHER_PROVIDER = config('WEATHER_PROVIDER', default='simulated')
+OPENWEATHER_BASE_URL = config('OPENWEATHER_BASE_URL', default='https://api.openweathermap.org/data/2.5')
+
+# Cliente HTTP del clima: timeouts (s), reintentos y circuit breaker
+WEATHER_CONNECT_TIMEOUT = config('WEATHER_CONNECT_TIMEOUT', default=3.05, cast=float)
+WEATHER_READ_TIMEOUT = config('WEATHER_READ_TIMEOUT', default=5.0, cast=float)
+WEATHER_MAX_RETRIES = config('WEATHER_MAX_RETRIES', default=2, cast=int)
+WEATHER_RETRY_BACKOFF = config('WEATHER_RETRY_BACKOFF', default=0.5, cast=float)
+WEATHER_POOL_SIZE = config('WEATHER_POOL_SIZE', default=10, cast=int)
+WEATHER_BREAKER_THRESHOLD = config('WEATHER_BREAKER_THRESHOLD', default=5, cast=int)
+WEATHER_BREAKER_RESET_SECONDS = config('WEATHER_BREAKER_RESET_SECONDS', default=60, cast=int)
+
+# Vigencia en caché del clima actual y del pronóstico, y tiempo extra en que un
+# valor vencido se sigue sirviendo mientras se refresca en segundo plano
+WEATHER_CURRENT_TTL = config('WEATHER_CURRENT_TTL', default=10 * 60, cast=int)
+WEATHER_FORECAST_TTL = config('WEATHER_FORECAST_TTL', default=3 * 60 * 60, cast=int)
+WEATHER_STALE_SECONDS = config('WEATHER_STALE_SECONDS', default=60 * 60, cast=int)
+
+# Pesos aprendidos del feedback de usuarios (comando update_recommendation_weights)
+AI_WEIGHTS_PATH = config('AI_WEIGHTS_PATH', default=str(BASE_DIR / 'var' / 'ai_weights.bin'))
+
+# Snapshot compacto de Plant compartido por los workers vía mmap
+PLANT_SNAPSHOT_DIR = config('PLANT_SNAPSHOT_DIR', default=str(BASE_DIR / 'var' / 'plant_snapshot'))
+
+# Las pruebas escriben snapshot, pesos y cachés en un directorio temporal
+TEST_RUNNER = 'hortechia_project.test_runner.IsolatedTestRunner'
\ No newline at end of file
@@ -0,0 +1,36 @@
+import copy
+import os
+import shutil
+import tempfile
+from django.conf import settings
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class IsolatedTestRunner(DiscoverRunner):
+    """
+    Runner de pruebas que lleva a un directorio temporal todo lo que la app
+    escribe en disco (snapshot de plantas, pesos del recomendador y cachés en
+    archivos), para que `manage.py test` no deje archivos en var/
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.tmp_dir = tempfile.mkdtemp(prefix='hortechia-tests-')
+
+        caches = copy.deepcopy(settings.CACHES)
+        for alias, config in caches.items():
+            if config['BACKEND'].endswith('FileBasedCache'):
+                config['LOCATION'] = os.path.join(self.tmp_dir, 'cache', alias)
+
+        self.isolated_settings = override_settings(
+            PLANT_SNAPSHOT_DIR=os.path.join(self.tmp_dir, 'plant_snapshot'),
+            AI_WEIGHTS_PATH=os.path.join(self.tmp_dir, 'ai_weights.bin'),
+            CACHES=caches,
+        )
+        self.isolated_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.isolated_settings.disable()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        super().teardown_test_environment(**kwargs)